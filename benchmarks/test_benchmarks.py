@@ -0,0 +1,204 @@
+# Hot-path benchmarks, kept out of the regular test run (testpaths only covers tests/).
+#
+#   pytest benchmarks                                   # just run them
+#   pytest benchmarks --benchmark-storage=benchmarks/.baselines --benchmark-save=baseline
+#   pytest benchmarks --benchmark-storage=benchmarks/.baselines --benchmark-compare --benchmark-compare-fail=median:25%
+#
+# The tests are synchronous so pytest-benchmark can time them; coroutines are driven with hass.loop.run_until_complete.
+import logging
+from datetime import date, datetime
+
+import pytest
+import time_machine
+from homeassistant.components import sun
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_mock_service
+
+from custom_components.automated_cover_control.calculation import (
+    SunPosition,
+    calculate_sun_tracking_vertical_cover_position,
+)
+from custom_components.automated_cover_control.config import (
+    AutomationConfiguration,
+    BlindSpotConfiguration,
+    SensorConfiguration,
+    WindowConfiguration,
+)
+from custom_components.automated_cover_control.const import (
+    CONF_DEFAULT_COVER_POSITION,
+    CONF_DISTANCE_FROM_WINDOW,
+    CONF_ENTITIES,
+    CONF_MANUAL_OVERRIDE_DURATION,
+    CONF_MINIMUM_CHANGE_TIME,
+    CONF_WINDOW_AZIMUTH,
+    CONF_WINDOW_HEIGHT,
+    DOMAIN,
+)
+from custom_components.automated_cover_control.log_context_adapter import LogContextAdapter
+from custom_components.automated_cover_control.simulation import SimulationLocation, build_solar_track, simulate
+from custom_components.automated_cover_control.sun import SolarTimeCalculator
+from tests.test_calculation import FakeHass
+
+# San Francisco, sun in front of an east-facing window.
+NOW = datetime.fromisoformat("2025-10-26T17:04:00Z")
+
+
+def options(covers: list[str]) -> dict:
+    return {
+        CONF_DEFAULT_COVER_POSITION: 100.0,
+        CONF_DISTANCE_FROM_WINDOW: 0.1,
+        CONF_ENTITIES: covers,
+        CONF_MANUAL_OVERRIDE_DURATION: {"minutes": 15},
+        CONF_MINIMUM_CHANGE_TIME: {},
+        CONF_WINDOW_AZIMUTH: 90.0,
+        CONF_WINDOW_HEIGHT: 1.0,
+    }
+
+
+@pytest.fixture
+def frozen_time():
+    with time_machine.travel(NOW):
+        yield
+
+
+def set_up_home_assistant(hass: HomeAssistant, covers: list[str]) -> None:
+    hass.config.latitude = 37.7620405311152
+    hass.config.longitude = -122.4349247380084
+    hass.config.elevation = 0
+    hass.config.time_zone = "US/Pacific"
+    hass.loop.run_until_complete(async_setup_component(hass, sun.DOMAIN, {sun.DOMAIN: {}}))
+    hass.states.async_set("sun.sun", "above_horizon", {"azimuth": 130.0, "elevation": 25.0})
+    for cover in covers:
+        hass.states.async_set(cover, "open", {"current_position": 0})
+    # Commands are recorded but never move the covers, so every refresh goes through the full command path.
+    async_mock_service(hass, "cover", "set_cover_position")
+
+
+def set_up_entry(hass: HomeAssistant, name: str, covers: list[str]) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": name}, options=options(covers))
+    entry.add_to_hass(hass)
+    hass.loop.run_until_complete(hass.config_entries.async_setup(entry.entry_id))
+    return entry
+
+
+def test_calculation(benchmark):
+    hass = FakeHass()
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    window_config = WindowConfiguration()
+    window_config.window_azimuth = 86
+    window_config.window_height = 1.67
+    window_config.distance_from_window = 0.3
+
+    def calculate():
+        sun = SunPosition(
+            solar_azimuth=142.5,
+            solar_elevation=29.28,
+            sunrise=datetime.fromisoformat("2025-10-31T08:00:00-08:00"),
+            sunset=datetime.fromisoformat("2025-10-31T19:00:00-08:00"),
+            now=datetime.fromisoformat("2025-10-31T10:40:00-08:00"),
+        )
+        return calculate_sun_tracking_vertical_cover_position(
+            hass.states,
+            logger,
+            sun,
+            AutomationConfiguration(),
+            BlindSpotConfiguration(),
+            SensorConfiguration(),
+            window_config,
+        )
+
+    assert benchmark(calculate).target_position == 18
+
+
+def test_solar_times(benchmark):
+    window_config = WindowConfiguration()
+    window_config.window_azimuth = 86
+    calc = SolarTimeCalculator(FakeHass(), window_config)
+
+    start, end = benchmark(calc.get_solar_start_and_end_times)
+    assert end > start
+
+
+@pytest.mark.parametrize("cover_count", [1, 10, 50])
+def test_update_data(hass: HomeAssistant, frozen_time, benchmark, cover_count):
+    covers = [f"cover.window_{i}" for i in range(cover_count)]
+    set_up_home_assistant(hass, covers)
+    entry = set_up_entry(hass, "foo", covers)
+    hass.loop.run_until_complete(hass.async_block_till_done())
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    data = benchmark(lambda: hass.loop.run_until_complete(coordinator._async_update_data()))
+    assert len(data.covers) == cover_count
+
+    hass.loop.run_until_complete(hass.config_entries.async_unload(entry.entry_id))
+
+
+def test_sensor_state_writes(hass: HomeAssistant, frozen_time, benchmark):
+    # What every refresh that changes the published data costs on the sensor platform.
+    covers = ["cover.window"]
+    set_up_home_assistant(hass, covers)
+    set_up_entry(hass, "foo", covers)
+    hass.loop.run_until_complete(hass.async_block_till_done())
+    sensors = [
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        if platform.domain == "sensor"
+        for entity in platform.entities.values()
+    ]
+
+    def write_states():
+        for entity in sensors:
+            entity.async_write_ha_state()
+
+    benchmark(write_states)
+    assert len(sensors) == 4
+
+
+def test_installation_with_1000_entries(hass: HomeAssistant, frozen_time, benchmark):
+    # A sun.sun update fans out to a refresh of every entry, which is what a large installation sees every minute.
+    entry_count = 1000
+    covers = [f"cover.window_{i}" for i in range(entry_count)]
+    set_up_home_assistant(hass, covers)
+    entries = [set_up_entry(hass, f"entry_{i}", [cover]) for i, cover in enumerate(covers)]
+    hass.loop.run_until_complete(hass.async_block_till_done())
+
+    azimuth = iter(range(100, 100_000))
+    moves = 0
+
+    def sun_moves():
+        nonlocal moves
+        moves += 1
+        hass.states.async_set("sun.sun", "above_horizon", {"azimuth": next(azimuth) / 1000 + 130, "elevation": 25.0})
+        hass.loop.run_until_complete(hass.async_block_till_done())
+
+    # However many rounds actually ran (just the one with --benchmark-disable), each refreshed every entry.
+    benchmark.pedantic(sun_moves, rounds=5, warmup_rounds=1)
+    refreshes = sum(hass.data[DOMAIN][entry.entry_id].refresh_stats.triggers["dependent_entity"] for entry in entries)
+    assert refreshes >= moves * entry_count
+
+    for entry in entries:
+        hass.loop.run_until_complete(hass.config_entries.async_unload(entry.entry_id))
+
+
+@pytest.mark.parametrize("position_table_resolution", [None, 0.5])
+def test_simulate_year_for_50_windows(benchmark, position_table_resolution):
+    # The sun track is shared; each window is a separate entry facing a different way.
+    def simulate_year():
+        track = build_solar_track(
+            SimulationLocation(FakeHass.config.latitude, FakeHass.config.longitude, FakeHass.config.time_zone),
+            date(2025, 1, 1),
+            date(2025, 12, 31),
+        )
+        return [
+            simulate(
+                {**options([f"cover.window_{i}"]), CONF_WINDOW_AZIMUTH: 90 + 3 * i},
+                track,
+                position_table_resolution=position_table_resolution,
+            )
+            for i in range(50)
+        ]
+
+    results = benchmark.pedantic(simulate_year, rounds=1)
+    assert all(len(result.command_steps) > 0 for result in results)
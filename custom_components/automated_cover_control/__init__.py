@@ -5,16 +5,26 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.event import (
     async_track_state_change_event,
 )
+from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
 from .coordinator import AutomatedCoverControlDataUpdateCoordinator
 from .log_context_adapter import LogContextAdapter
+from .services import async_setup_services
 
 PLATFORMS = [Platform.SENSOR, Platform.SWITCH, Platform.BINARY_SENSOR, Platform.BUTTON]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
+
 
 async def async_initialize_integration(
     hass: HomeAssistant,
@@ -35,6 +45,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     logger.info("Dependencies: %s", dependencies)
     logger.info("Covers: %s", cover_entities)
 
+    # Registered first, so a changed end-time entity has invalidated the control window before it triggers a refresh.
+    entry.async_on_unload(
+        async_track_state_change_event(
+            hass,
+            coordinator.get_control_window_entities(),
+            coordinator.async_control_window_entity_state_change,
+        )
+    )
+
     entry.async_on_unload(
         async_track_state_change_event(
             hass,
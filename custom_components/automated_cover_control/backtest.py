@@ -0,0 +1,153 @@
+"""Evaluates (proposed) options against the recorder's history of an entry's sensors.
+
+Backs the automated_cover_control.backtest service: the history of every entry is read in a single recorder query,
+the sun track is computed once, and each entry is then replayed by the simulator.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from .config import AutomationConfiguration, SensorConfiguration
+from .const import CONF_ENTITIES, DEFAULT_BACKTEST_DAYS
+from .simulation import (
+    HistorySample,
+    SimulationLocation,
+    SimulationResult,
+    build_solar_track,
+    simulate,
+    utc_datetime64,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BacktestSummary:
+    covers: int
+    # Summed over all covers; travel is in percentage points of cover position.
+    commands: int
+    motor_travel: int
+    sun_in_window: timedelta
+    # Time the sun was in front of the window while the covers were open further than the sun-tracking position.
+    sun_unblocked: timedelta
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "covers": self.covers,
+            "commands": self.commands,
+            "motor_travel": self.motor_travel,
+            "sun_in_window_minutes": round(self.sun_in_window.total_seconds() / 60, 1),
+            "sun_unblocked_minutes": round(self.sun_unblocked.total_seconds() / 60, 1),
+        }
+
+
+def summarize(
+    result: SimulationResult, start: datetime, end: datetime, initial_position: int | None = None
+) -> BacktestSummary:
+    """Totals for the part of the simulation between start and end."""
+    times = result.track.times
+    in_period = (times >= utc_datetime64(start)) & (times < utc_datetime64(end))
+    positions = result.positions(initial_position)
+
+    steps = result.command_steps[in_period[result.command_steps]]
+    before = np.where(
+        steps > 0, positions[np.maximum(steps - 1, 0)], -1 if initial_position is None else initial_position
+    )
+    after = positions[steps]
+    # The first move from an unknown position can't be measured.
+    travel = int(np.abs(after - before)[before >= 0].sum())
+
+    sun_in_window = (
+        result.calculated.is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk & in_period
+    )
+    uninverted = np.where(positions >= 0, 100 - positions, -1) if result.inverted else positions
+    unblocked = sun_in_window & ((uninverted < 0) | (uninverted > result.calculated.calculated_percentage))
+
+    covers = len(result.entities)
+    return BacktestSummary(
+        covers=covers,
+        commands=len(steps) * covers,
+        motor_travel=travel * covers,
+        sun_in_window=result.track.step * int(sun_in_window.sum()),
+        sun_unblocked=result.track.step * int(unblocked.sum()),
+    )
+
+
+def _history_entities(options: Mapping[str, Any]) -> set[str]:
+    options = MappingProxyType(dict(options))
+    automation_config = AutomationConfiguration()
+    automation_config.read(options)
+    sensor_config = SensorConfiguration()
+    sensor_config.read(options)
+    sensors = (
+        sensor_config.window_sensor_entity,
+        sensor_config.presence_entity,
+        sensor_config.lux_entity,
+        sensor_config.weather_entity,
+    )
+    # Covers are read for their position at the start of the period.
+    return {entity_id for entity_id in sensors if entity_id is not None} | set(automation_config.entities)
+
+
+def _initial_position(covers: Iterable[str], states: Mapping[str, list[State]]) -> int | None:
+    for entity_id in covers:
+        if states.get(entity_id):
+            position = states[entity_id][0].attributes.get("current_position")
+            return None if position is None else int(position)
+    return None
+
+
+async def async_backtest(
+    hass: HomeAssistant,
+    entries: list[ConfigEntry],
+    days: int = DEFAULT_BACKTEST_DAYS,
+    proposed_options: Mapping[str, Any] | None = None,
+) -> dict[str, BacktestSummary]:
+    """Replays the last days of history for each entry, with proposed_options applied on top of its own options."""
+    # The recorder is optional for the rest of the integration.
+    from homeassistant.components.recorder import get_instance, history
+
+    end = dt_util.utcnow()
+    start = end - timedelta(days=days)
+    options = {entry.entry_id: {**entry.options, **(proposed_options or {})} for entry in entries}
+    entity_ids = sorted(set().union(*(_history_entities(entry_options) for entry_options in options.values())))
+
+    states: dict[str, list[State]] = {}
+    if entity_ids:
+        states = await get_instance(hass).async_add_executor_job(
+            partial(
+                history.get_significant_states,
+                hass,
+                start,
+                end,
+                entity_ids,
+                significant_changes_only=False,
+            )
+        )
+    histories: dict[str, list[HistorySample]] = {
+        entity_id: [(state.last_changed, state.state) for state in entity_states]
+        for entity_id, entity_states in states.items()
+    }
+
+    def _replay() -> dict[str, BacktestSummary]:
+        zone = dt_util.get_time_zone(hass.config.time_zone)
+        track = build_solar_track(
+            SimulationLocation(hass.config.latitude, hass.config.longitude, hass.config.time_zone),
+            start.astimezone(zone).date(),
+            end.astimezone(zone).date(),
+        )
+        summaries = {}
+        for entry_id, entry_options in options.items():
+            initial_position = _initial_position(entry_options.get(CONF_ENTITIES, []), states)
+            result = simulate(entry_options, track, histories, initial_position)
+            summaries[entry_id] = summarize(result, start, end, initial_position)
+        return summaries
+
+    return await hass.async_add_executor_job(_replay)
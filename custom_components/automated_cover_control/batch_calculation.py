@@ -0,0 +1,215 @@
+"""Array version of calculate_sun_tracking_vertical_cover_position, for evaluating many points in time at once.
+
+Every element gets exactly the target, reason and tweaks the scalar calculation would produce for the same inputs;
+test_batch_calculation.py checks the two against each other. Sensor predicates are passed in already evaluated,
+since there's no hass to read them from.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import numpy as np
+
+from .config import AutomationConfiguration, BlindSpotConfiguration, WindowConfiguration
+from .position_table import PositionTable
+from .tilt import open_tilt_percentage, slat_tilt_percentages
+from .why import CoverControlReason, CoverControlTweaks
+
+# Reason codes in the result index into this tuple.
+REASONS = tuple(CoverControlReason)
+_REASON_CODES = {reason: code for code, reason in enumerate(REASONS)}
+
+
+@dataclass
+class SunPositions:
+    solar_azimuth: np.ndarray
+    solar_elevation: np.ndarray
+    # datetime64, broadcastable against the positions (typically one sunrise/sunset per day, repeated per step).
+    sunrise: np.ndarray
+    sunset: np.ndarray
+    now: np.ndarray
+
+
+@dataclass
+class SensorPredicates:
+    # None means the sensor isn't configured (or has no history), in which case it doesn't affect the outcome.
+    window_open: np.ndarray | None = None
+    presence_detected: np.ndarray | None = None
+    lux_above_threshold: np.ndarray | None = None
+    sunny: np.ndarray | None = None
+
+
+@dataclass
+class SunTrackingVerticalCoverPositions:
+    is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk: np.ndarray
+    target_position: np.ndarray
+    reason_code: np.ndarray
+    # The sun-tracking position at every step, whether or not it was used (NaN for a window without height).
+    calculated_percentage: np.ndarray
+    tweaks: dict[CoverControlTweaks, np.ndarray] = field(default_factory=dict)
+    # Slat tilt at every step, if slat tilt is enabled.
+    target_tilt: np.ndarray | None = None
+
+    def reason(self, index: int) -> CoverControlReason:
+        return REASONS[self.reason_code[index]]
+
+    def tweaks_at(self, index: int) -> list[CoverControlTweaks]:
+        # In the order the scalar calculation appends them.
+        return [tweak for tweak, mask in self.tweaks.items() if mask[index]]
+
+
+def _as_timedelta64(offset: timedelta | None) -> np.timedelta64:
+    return np.timedelta64(offset or timedelta(0), "us")
+
+
+def calculate_sun_tracking_vertical_cover_positions(
+    sun_positions: SunPositions,
+    automation_config: AutomationConfiguration,
+    blind_spot_config: BlindSpotConfiguration,
+    window_config: WindowConfiguration,
+    sensor_predicates: SensorPredicates | None = None,
+    position_table: PositionTable | None = None,
+) -> SunTrackingVerticalCoverPositions:
+    if sensor_predicates is None:
+        sensor_predicates = SensorPredicates()
+    azimuth = np.asarray(sun_positions.solar_azimuth, dtype=np.float64)
+    elevation = np.asarray(sun_positions.solar_elevation, dtype=np.float64)
+    shape = np.broadcast(azimuth, elevation).shape
+
+    gamma = (window_config.window_azimuth - azimuth + 180) % 360 - 180
+
+    in_blind_spot = np.broadcast_to(
+        blind_spot_config.index.contains_array(np.where(gamma < 0, 90 - gamma, gamma), elevation), shape
+    )
+
+    if window_config.horizon is not None:
+        behind_horizon = elevation < window_config.horizon.minimum_elevations(azimuth)
+    else:
+        behind_horizon = np.zeros(shape, dtype=bool)
+
+    min_elevation, max_elevation = window_config.min_solar_elevation, window_config.max_solar_elevation
+    if min_elevation is None and max_elevation is None:
+        within_range = elevation >= 0
+    elif min_elevation is None:
+        within_range = elevation <= (max_elevation or 0)
+    elif max_elevation is None:
+        within_range = elevation >= (min_elevation or 0)
+    else:
+        within_range = (elevation >= min_elevation) & (elevation <= max_elevation)
+
+    in_front_of_window = (gamma < window_config.fov_left) & (gamma > -window_config.fov_right) & within_range
+    after_sunset_or_before_sunrise = (
+        sun_positions.now > sun_positions.sunset + _as_timedelta64(automation_config.sunset_offset)
+    ) | (sun_positions.now < sun_positions.sunrise - _as_timedelta64(automation_config.sunrise_offset))
+    after_sunset_or_before_sunrise = np.broadcast_to(after_sunset_or_before_sunrise, shape)
+    sun_in_window = in_front_of_window & ~after_sunset_or_before_sunrise & ~in_blind_spot & ~behind_horizon
+
+    default_position = np.where(
+        after_sunset_or_before_sunrise,
+        automation_config.before_sunrise_or_after_sunset_cover_position,
+        automation_config.default_cover_position,
+    )
+    if position_table is not None:
+        percentage = np.round(
+            position_table.percentages(gamma, elevation), automation_config.cover_calculation_rounding
+        )
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            blind_height = np.clip(
+                window_config.distance_from_window / np.cos(np.radians(gamma)) * np.tan(np.radians(elevation)),
+                0,
+                window_config.window_height,
+            )
+            percentage = blind_height / window_config.window_height * 100
+        if window_config.shading is not None:
+            percentage = window_config.shading.percentages(gamma, elevation, percentage)
+        percentage = np.round(percentage, automation_config.cover_calculation_rounding)
+
+    # The same cascade as _get_target_position_unclipped(): the first matching condition wins.
+    never = np.zeros(shape, dtype=bool)
+
+    def _matches(predicate: np.ndarray | None) -> np.ndarray:
+        return never if predicate is None else np.broadcast_to(predicate, shape)
+
+    def _fails(predicate: np.ndarray | None) -> np.ndarray:
+        return never if predicate is None else ~np.broadcast_to(predicate, shape)
+
+    conditions = [
+        _matches(sensor_predicates.window_open),
+        _fails(sensor_predicates.presence_detected),
+        _fails(sensor_predicates.lux_above_threshold),
+        _fails(sensor_predicates.sunny),
+        sun_in_window,
+    ]
+    result = np.select(
+        conditions,
+        [default_position, default_position, default_position, default_position, percentage],
+        default_position,
+    )
+    reason_code = np.select(
+        conditions,
+        [
+            _REASON_CODES[CoverControlReason.WINDOW_OPEN],
+            _REASON_CODES[CoverControlReason.PRESENCE_NOT_DETECTED],
+            _REASON_CODES[CoverControlReason.LUX_BELOW_THRESHOLD],
+            _REASON_CODES[CoverControlReason.WEATHER_CONDITIONS_NOT_MATCHED],
+            _REASON_CODES[CoverControlReason.SUN_IN_FRONT_OF_WINDOW],
+        ],
+        _REASON_CODES[CoverControlReason.SUN_NOT_IN_FRONT_OF_WINDOW],
+    ).astype(np.int8)
+    # NaN only when the window has no height and the sun is in it; the scalar calculation fails there too.
+    result = np.nan_to_num(np.round(result)).astype(np.int64)
+
+    tweaks = {
+        CoverControlTweaks.SUN_IN_BLIND_SPOT: in_blind_spot,
+        CoverControlTweaks.SUN_BEHIND_HORIZON: behind_horizon,
+        CoverControlTweaks.SOLAR_ELEVATION_OUT_OF_RANGE: ~within_range,
+        CoverControlTweaks.AFTER_SUNSET_OR_BEFORE_SUNRISE: after_sunset_or_before_sunrise,
+    }
+
+    maximum = automation_config.maximum_cover_position
+    if maximum is not None and maximum != 100:
+        clip_to_max = result > maximum
+        if automation_config.only_force_maximum_when_sun_in_front_of_window:
+            clip_to_max &= sun_in_window
+        result = np.where(clip_to_max, round(maximum), result)
+        tweaks[CoverControlTweaks.CLIPPED_TO_MAX] = clip_to_max
+
+    minimum = automation_config.minimum_cover_position
+    if minimum is not None and minimum != 0:
+        clip_to_min = result < minimum
+        if automation_config.only_force_minimum_when_sun_in_front_of_window:
+            clip_to_min &= sun_in_window
+        result = np.where(clip_to_min, round(minimum), result)
+        tweaks[CoverControlTweaks.CLIPPED_TO_MIN] = clip_to_min
+
+    out_of_range = (result < 0) | (result > 100)
+    if out_of_range.any():
+        result = np.clip(result, 0, 100)
+        tweaks[CoverControlTweaks.CLIPPED_TO_0_100_RANGE] = out_of_range
+
+    target_tilt = None
+    if automation_config.slat_tilt:
+        tilt = np.round(
+            slat_tilt_percentages(
+                gamma,
+                elevation,
+                automation_config.slat_depth,
+                automation_config.slat_spacing,
+                automation_config.tilt_range,
+            ),
+            automation_config.cover_calculation_rounding,
+        )
+        tracked = reason_code == _REASON_CODES[CoverControlReason.SUN_IN_FRONT_OF_WINDOW]
+        target_tilt = np.round(
+            np.where(tracked, tilt, round(open_tilt_percentage(automation_config.tilt_range)))
+        ).astype(np.int64)
+
+    return SunTrackingVerticalCoverPositions(
+        is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk=sun_in_window,
+        target_position=result,
+        reason_code=reason_code,
+        calculated_percentage=percentage,
+        tweaks=tweaks,
+        target_tilt=target_tilt,
+    )
@@ -0,0 +1,86 @@
+"""Blind spots: parts of the view from a window where the sun is hidden, e.g. by a balcony, pillar or wing.
+
+Each region is a range of angles (0 to 180, anchored on the plane of the window, as in BlindSpotConfiguration) plus an
+optional elevation it extends up to. Any number of them are folded into one sorted index, so a lookup is a binary search
+however many there are.
+"""
+
+import bisect
+import functools
+import itertools
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class BlindSpot:
+    left: float
+    right: float
+    # Highest elevation the region hides the sun up to, or None for all of them.
+    elevation: float | None = None
+
+    def covers(self, angle: float) -> bool:
+        return self.left <= angle <= self.right
+
+    @property
+    def ceiling(self) -> float:
+        return math.inf if self.elevation is None else self.elevation
+
+
+class BlindSpotIndex:
+    """Highest blind-spot elevation at every angle, as a sorted list of breakpoints.
+
+    At a breakpoint the regions that start or end there still count (ranges are inclusive); between two breakpoints the
+    same set of regions covers every angle. The sun is in a blind spot when its elevation is at most the value there.
+    """
+
+    __slots__ = ("_at_breakpoint", "_between", "_breakpoints", "regions")
+
+    def __init__(self, regions: Iterable[BlindSpot]) -> None:
+        self.regions = tuple(regions)
+        self._breakpoints = sorted({bound for region in self.regions for bound in (region.left, region.right)})
+        self._at_breakpoint = [self._ceiling(angle) for angle in self._breakpoints]
+        # _between[i] is the stretch just before _breakpoints[i]; the last one runs past the final breakpoint.
+        edges = [-math.inf, *self._breakpoints, math.inf]
+        self._between = [
+            self._ceiling((low + high) / 2) if math.isfinite(low) and math.isfinite(high) else -math.inf
+            for low, high in itertools.pairwise(edges)
+        ]
+
+    def __bool__(self) -> bool:
+        return bool(self.regions)
+
+    def _ceiling(self, angle: float) -> float:
+        return max((region.ceiling for region in self.regions if region.covers(angle)), default=-math.inf)
+
+    def ceiling(self, angle: float) -> float:
+        index = bisect.bisect_left(self._breakpoints, angle)
+        if index < len(self._breakpoints) and self._breakpoints[index] == angle:
+            return self._at_breakpoint[index]
+        return self._between[index]
+
+    def contains(self, angle: float, elevation: float) -> bool:
+        return elevation <= self.ceiling(angle)
+
+    def contains_array(self, angle: Any, elevation: Any) -> Any:
+        """Array version of contains(), for the batch calculation and the daily solar-times scan."""
+        # numpy isn't needed by the live calculation; keep it out of the integration's import.
+        import numpy as np
+
+        angle = np.asarray(angle, dtype=np.float64)
+        if not self.regions:
+            return np.zeros(np.broadcast(angle, elevation).shape, dtype=bool)
+        breakpoints = np.array(self._breakpoints)
+        index = np.searchsorted(breakpoints, angle, side="left")
+        clipped = np.minimum(index, len(breakpoints) - 1)
+        at_breakpoint = breakpoints[clipped] == angle
+        ceiling = np.where(at_breakpoint, np.array(self._at_breakpoint)[clipped], np.array(self._between)[index])
+        return elevation <= ceiling
+
+
+@functools.lru_cache(maxsize=32)
+def blind_spot_index(regions: tuple[BlindSpot, ...]) -> BlindSpotIndex:
+    # Configurations are re-read on every refresh; only build an index when the regions actually change.
+    return BlindSpotIndex(regions)
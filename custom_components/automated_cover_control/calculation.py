@@ -1,8 +1,10 @@
+import math
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
-from homeassistant.core import HomeAssistant, split_entity_id
-from numpy import clip, cos, radians, tan
+from homeassistant.core import State, split_entity_id
 
 from .config import (
     AutomationConfiguration,
@@ -10,8 +12,9 @@ from .config import (
     SensorConfiguration,
     WindowConfiguration,
 )
-from .log_context_adapter import LogContextAdapter
-from .util import get_state_or_none_if_unknown
+from .log_context_adapter import LazyLogArg, LogContextAdapter
+from .tilt import open_tilt_percentage, slat_tilt_percentage
+from .util import known_state_or_none
 from .why import CoverControlReason, CoverControlTweaks
 
 
@@ -30,10 +33,110 @@ class SunTrackingVerticalCoverPosition:
     target_position: float = 0.0
     reason: CoverControlReason = CoverControlReason.UNKNOWN
     tweaks: list[CoverControlTweaks] = field(default_factory=list)
+    # Outcome of each predicate that was evaluated, in evaluation order (for decision traces).
+    predicates: dict[str, Any] = field(default_factory=dict)
+    # Slat tilt, for venetian blinds (None unless slat tilt is enabled).
+    target_tilt: int | None = None
+
+
+def _clip(value: float, lower: float, upper: float) -> float:
+    return min(max(value, lower), upper)
+
+
+# Interpretation of sensor states, shared with the batch calculation so histories are read the same way as live states.
+# Each takes a state that's known (i.e. not None/unknown/unavailable), except where noted.
+
+
+def is_window_state_open(state: str) -> bool:
+    return state == "on"
+
+
+def is_presence_state_detected(entity_id: str, state: str) -> bool:
+    domain, _ = split_entity_id(entity_id)
+    if domain == "device_tracker":
+        return state == "home"
+    if domain == "zone":
+        return int(state) > 0
+    if domain in ["binary_sensor", "input_boolean"]:
+        return state == "on"
+    # Don't know what to do with this domain.
+    return True
+
+
+def is_lux_state_above_threshold(state: str | None, threshold: float) -> bool:
+    # Unknown or non-numeric lux values don't block the sun.
+    if state is None:
+        return True
+    try:
+        return float(state) > threshold
+    except (TypeError, ValueError):
+        return True
+
+
+def is_weather_state_matched(state: str | None, conditions: list[str]) -> bool:
+    return state in conditions
+
+
+def is_after_sunset_or_before_sunrise(sun_position: SunPosition, automation_config: AutomationConfiguration) -> bool:
+    sunset_offset = automation_config.sunset_offset
+    if sunset_offset is None:
+        sunset_offset = timedelta(seconds=0)
+    sunrise_offset = automation_config.sunrise_offset
+    if sunrise_offset is None:
+        sunrise_offset = timedelta(seconds=0)
+
+    if sun_position.now is None:
+        raise Exception("now unknown")
+
+    after_sunset = sun_position.now > (sun_position.sunset + sunset_offset)
+    before_sunrise = sun_position.now < (sun_position.sunrise - sunrise_offset)
+    return after_sunset or before_sunrise
+
+
+def is_window_open(states: Mapping[str, State], sensor_config: SensorConfiguration) -> bool:
+    if sensor_config.window_sensor_entity is None:
+        return False
+    state = known_state_or_none(states.get(sensor_config.window_sensor_entity))
+    return state is not None and is_window_state_open(state)
+
+
+def is_presence_detected(states: Mapping[str, State], sensor_config: SensorConfiguration) -> bool:
+    if sensor_config.presence_entity is None:
+        return True
+    state = known_state_or_none(states.get(sensor_config.presence_entity))
+    return state is None or is_presence_state_detected(sensor_config.presence_entity, state)
+
+
+def is_lux_above_threshold(states: Mapping[str, State], sensor_config: SensorConfiguration) -> bool:
+    if sensor_config.lux_entity is None or sensor_config.lux_threshold is None:
+        return True
+    return is_lux_state_above_threshold(
+        known_state_or_none(states.get(sensor_config.lux_entity)), sensor_config.lux_threshold
+    )
+
+
+def is_sunny(states: Mapping[str, State], sensor_config: SensorConfiguration) -> bool:
+    if sensor_config.weather_entity is None or sensor_config.weather_condition is None:
+        return True
+    return is_weather_state_matched(
+        known_state_or_none(states.get(sensor_config.weather_entity)), sensor_config.weather_condition
+    )
+
+
+def evaluate_sensor_predicates(
+    states: Mapping[str, State], sensor_config: SensorConfiguration
+) -> tuple[bool, bool, bool, bool]:
+    """(window open, presence detected, lux above threshold, sunny), as the calculation below decides them."""
+    return (
+        is_window_open(states, sensor_config),
+        is_presence_detected(states, sensor_config),
+        is_lux_above_threshold(states, sensor_config),
+        is_sunny(states, sensor_config),
+    )
 
 
 def calculate_sun_tracking_vertical_cover_position(
-    hass: HomeAssistant,
+    states: Mapping[str, State],
     logger: LogContextAdapter,
     sun_position: SunPosition,
     automation_config: AutomationConfiguration,
@@ -41,28 +144,45 @@ def calculate_sun_tracking_vertical_cover_position(
     sensor_config: SensorConfiguration,
     window_config: WindowConfiguration,
 ) -> SunTrackingVerticalCoverPosition:
+    predicates: dict[str, Any] = {}
+
+    def _record(name: str, value: Any) -> Any:
+        predicates[name] = value
+        return value
+
     def _gamma() -> float:
         return (window_config.window_azimuth - sun_position.solar_azimuth + 180) % 360 - 180
 
     def _is_sun_in_blind_spot() -> bool:
-        if blind_spot_config.enabled and blind_spot_config.left is not None and blind_spot_config.right is not None:
-            gamma = _gamma()
-            gamma = 90 - gamma if gamma < 0 else gamma
-            in_blind_spot = gamma >= blind_spot_config.left and gamma <= blind_spot_config.right
-            if blind_spot_config.elevation is not None:
-                in_blind_spot = in_blind_spot and sun_position.solar_elevation <= blind_spot_config.elevation
-            logger.debug(
-                "[_is_sun_in_blind_spot] bs_left=%s, bs_right=%s, bs_elev=%s, gamma=%s, _gamma=%s, elev=%s == %s",
-                blind_spot_config.left,
-                blind_spot_config.right,
-                blind_spot_config.elevation,
-                gamma,
-                _gamma(),
-                sun_position.solar_elevation,
-                in_blind_spot,
-            )
-            return in_blind_spot
-        return False
+        index = blind_spot_config.index
+        if not index:
+            return False
+        gamma = _gamma()
+        gamma = 90 - gamma if gamma < 0 else gamma
+        in_blind_spot = index.contains(gamma, sun_position.solar_elevation)
+        logger.debug(
+            "[_is_sun_in_blind_spot] regions=%s, gamma=%s, _gamma=%s, elev=%s == %s",
+            index.regions,
+            gamma,
+            LazyLogArg(_gamma),
+            sun_position.solar_elevation,
+            in_blind_spot,
+        )
+        return in_blind_spot
+
+    def _is_sun_behind_horizon() -> bool:
+        horizon = window_config.horizon
+        if horizon is None:
+            return False
+        behind_horizon = horizon.is_sun_hidden(sun_position.solar_azimuth, sun_position.solar_elevation)
+        logger.debug(
+            "[_is_sun_behind_horizon] azimuth=%s, elev=%s, horizon=%s == %s",
+            sun_position.solar_azimuth,
+            sun_position.solar_elevation,
+            LazyLogArg(lambda: horizon.minimum_elevation(sun_position.solar_azimuth)),
+            behind_horizon,
+        )
+        return behind_horizon
 
     def _is_solar_elevation_within_range() -> bool:
         within_range = False
@@ -93,20 +213,9 @@ def calculate_sun_tracking_vertical_cover_position(
         return in_front_of_window
 
     def _is_after_sunset_or_before_sunrise() -> bool:
-        sunset_offset = automation_config.sunset_offset
-        if sunset_offset is None:
-            sunset_offset = timedelta(seconds=0)
-        sunrise_offset = automation_config.sunrise_offset
-        if sunrise_offset is None:
-            sunrise_offset = timedelta(seconds=0)
-
-        if sun_position.now is None:
-            raise Exception("now unknown")
-
-        after_sunset = sun_position.now > (sun_position.sunset + sunset_offset)
-        before_sunrise = sun_position.now < (sun_position.sunrise - sunrise_offset)
-        logger.debug("[_is_after_sunset_or_before_sunrise] %s", (after_sunset or before_sunrise))
-        return after_sunset or before_sunrise
+        after_sunset_or_before_sunrise = is_after_sunset_or_before_sunrise(sun_position, automation_config)
+        logger.debug("[_is_after_sunset_or_before_sunrise] %s", after_sunset_or_before_sunrise)
+        return after_sunset_or_before_sunrise
 
     def _default_position() -> float:
         default = automation_config.default_cover_position
@@ -128,87 +237,51 @@ def calculate_sun_tracking_vertical_cover_position(
             return True
         return False
 
-    def _is_window_open():
-        if sensor_config.window_sensor_entity is None:
-            logger.debug("[_is_window_open] No window sensor entity defined")
-            return False
-        is_open = get_state_or_none_if_unknown(hass, sensor_config.window_sensor_entity)
-        if is_open is None:
-            logger.debug("[_is_window_open] No open state")
-            return False
-        logger.debug(
-            "[_is_window_open] State for %s is %s",
-            sensor_config.window_sensor_entity,
-            is_open,
-        )
-        return is_open == "on"
+    # The sensor predicates are shared with the coordinator, which uses them to skip refreshes that can't change the
+    # outcome; these only add logging.
+    def _is_window_open() -> bool:
+        is_open = is_window_open(states, sensor_config)
+        logger.debug("[_is_window_open] %s: %s", sensor_config.window_sensor_entity, is_open)
+        return is_open
 
-    def _is_presence_detected():
-        if sensor_config.presence_entity is None:
-            logger.debug("[_is_presence_detected] No presence entity defined")
-            return True
-        presence = get_state_or_none_if_unknown(hass, sensor_config.presence_entity)
-        if presence is None:
-            logger.debug("[_is_presence_detected] No presence state")
-            return True
-        domain, _ = split_entity_id(sensor_config.presence_entity)
-        if domain == "device_tracker":
-            return presence == "home"
-        if domain == "zone":
-            return int(presence) > 0
-        if domain in ["binary_sensor", "input_boolean"]:
-            return presence == "on"
-        logger.debug("[_is_presence_detected] Don't know what to do with domain %s", domain)
-        return True
+    def _is_presence_detected() -> bool:
+        detected = is_presence_detected(states, sensor_config)
+        logger.debug("[_is_presence_detected] %s: %s", sensor_config.presence_entity, detected)
+        return detected
 
     def _is_sunny() -> bool:
-        if sensor_config.weather_entity is None:
-            logger.debug("[_is_sunny] No weather entity defined")
-            return True
-        if sensor_config.weather_condition is None:
-            logger.debug("[_is_sunny] No weather conditions defined")
-            return True
-        weather_state = get_state_or_none_if_unknown(hass, sensor_config.weather_entity)
-        matches = weather_state in sensor_config.weather_condition
-        logger.debug("[_is_sunny] Weather: %s = %s", weather_state, matches)
+        matches = is_sunny(states, sensor_config)
+        logger.debug("[_is_sunny] %s in %s: %s", sensor_config.weather_entity, sensor_config.weather_condition, matches)
         return matches
 
     def _is_lux_above_threshold() -> bool:
-        if sensor_config.lux_entity is None:
-            logger.debug("[_is_lux_above_threshold] No lux entity defined")
-            return True
-        if sensor_config.lux_threshold is None:
-            logger.debug("[_is_lux_above_threshold] No lux threshold defined")
-            return True
-        lux = get_state_or_none_if_unknown(hass, sensor_config.lux_entity)
-        if lux is None:
-            logger.debug(
-                "[_is_lux_above_threshold] value for %s is None",
-                sensor_config.lux_entity,
-            )
-            return True
-        try:
-            lux = float(lux)
-        except Exception as e:
-            logger.debug(
-                "[_is_lux_above_threshold] value for %s is not a float (%s): %s",
-                sensor_config.lux_entity,
-                lux,
-                e,
-            )
-            return True
-        return float(lux) > sensor_config.lux_threshold
+        above_threshold = is_lux_above_threshold(states, sensor_config)
+        logger.debug(
+            "[_is_lux_above_threshold] %s above %s: %s",
+            sensor_config.lux_entity,
+            sensor_config.lux_threshold,
+            above_threshold,
+        )
+        return above_threshold
 
     def _calculate_percentage() -> float:
-        blind_height = clip(
-            (window_config.distance_from_window / cos(radians(_gamma()))) * tan(radians(sun_position.solar_elevation)),
+        blind_height = _clip(
+            (window_config.distance_from_window / math.cos(math.radians(_gamma())))
+            * math.tan(math.radians(sun_position.solar_elevation)),
             0,
             window_config.window_height,
         )
-        percentage = round(
-            blind_height / window_config.window_height * 100,
-            automation_config.cover_calculation_rounding,
-        )
+        percentage = blind_height / window_config.window_height * 100
+        if window_config.shading is not None:
+            shaded = window_config.shading.percentage(_gamma(), sun_position.solar_elevation, percentage)
+            logger.debug(
+                "[_calculate_percentage] %s sunlit: %s -> %s",
+                window_config.shading.sunlit_fraction(_gamma(), sun_position.solar_elevation),
+                percentage,
+                shaded,
+            )
+            percentage = shaded
+        percentage = round(percentage, automation_config.cover_calculation_rounding)
         logger.debug(
             "[_calculate_percentage] %s / %s * 100 = %s",
             blind_height,
@@ -217,34 +290,50 @@ def calculate_sun_tracking_vertical_cover_position(
         )
         return percentage
 
+    def _calculate_tilt() -> float:
+        tilt = round(
+            slat_tilt_percentage(
+                _gamma(),
+                sun_position.solar_elevation,
+                automation_config.slat_depth,
+                automation_config.slat_spacing,
+                automation_config.tilt_range,
+            ),
+            automation_config.cover_calculation_rounding,
+        )
+        logger.debug("[_calculate_tilt] %s", tilt)
+        return tilt
+
     def _get_target_position_unclipped() -> tuple[float, CoverControlReason]:
-        if _is_window_open():
+        if _record("window_open", _is_window_open()):
             logger.debug("[_get_target_position_unclipped] Window open, using default")
             return _default_position(), CoverControlReason.WINDOW_OPEN
 
-        if not _is_presence_detected():
+        if not _record("presence_detected", _is_presence_detected()):
             logger.debug("[_get_target_position_unclipped] No one present, using default")
             # TODO(tarick): configuration option: no presence = full light, no presence = no light, no presence = default
             return _default_position(), CoverControlReason.PRESENCE_NOT_DETECTED
 
-        if not _is_lux_above_threshold():
+        if not _record("lux_above_threshold", _is_lux_above_threshold()):
             logger.debug("[_get_target_position_unclipped] Lux below threshold, using default")
             return _default_position(), CoverControlReason.LUX_BELOW_THRESHOLD
 
-        if not _is_sunny():
+        if not _record("sunny", _is_sunny()):
             logger.debug("[_get_target_position_unclipped] Not sunny, using default")
             return (
                 _default_position(),
                 CoverControlReason.WEATHER_CONDITIONS_NOT_MATCHED,
             )
 
-        in_front_of_window = _is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk()
+        in_front_of_window = _record(
+            "sun_in_front_of_window", _is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk()
+        )
         logger.debug(
             "[_get_target_position_unclipped] Sun directly in front of window & before sunset + offset? %s",
             in_front_of_window,
         )
         if in_front_of_window:
-            target = _calculate_percentage()
+            target = _record("calculated_percentage", _calculate_percentage())
             logger.debug(
                 "[_get_target_position_unclipped] Yes sun in window: using calculated percentage (%s)",
                 target,
@@ -256,7 +345,10 @@ def calculate_sun_tracking_vertical_cover_position(
 
     def _is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk() -> bool:
         return (
-            (_is_sun_in_front_of_window()) & (not _is_after_sunset_or_before_sunrise()) & (not _is_sun_in_blind_spot())
+            (_is_sun_in_front_of_window())
+            & (not _is_after_sunset_or_before_sunrise())
+            & (not _is_sun_in_blind_spot())
+            & (not _is_sun_behind_horizon())
         )
 
     if sun_position.now is None:
@@ -274,11 +366,14 @@ def calculate_sun_tracking_vertical_cover_position(
     tweaks = []
     logger.debug("[get_target_position] unclipped result: %s", result)
 
-    if _is_sun_in_blind_spot():
+    _record("gamma", _gamma())
+    if _record("sun_in_blind_spot", _is_sun_in_blind_spot()):
         tweaks.append(CoverControlTweaks.SUN_IN_BLIND_SPOT)
-    if not _is_solar_elevation_within_range():
+    if _record("sun_behind_horizon", _is_sun_behind_horizon()):
+        tweaks.append(CoverControlTweaks.SUN_BEHIND_HORIZON)
+    if not _record("solar_elevation_within_range", _is_solar_elevation_within_range()):
         tweaks.append(CoverControlTweaks.SOLAR_ELEVATION_OUT_OF_RANGE)
-    if _is_after_sunset_or_before_sunrise():
+    if _record("after_sunset_or_before_sunrise", _is_after_sunset_or_before_sunrise()):
         tweaks.append(CoverControlTweaks.AFTER_SUNSET_OR_BEFORE_SUNRISE)
 
     if _should_apply_max_position() and result > (automation_config.maximum_cover_position or 0):
@@ -296,13 +391,23 @@ def calculate_sun_tracking_vertical_cover_position(
         result = round(automation_config.minimum_cover_position or 0)
         tweaks.append(CoverControlTweaks.CLIPPED_TO_MIN)
 
-    if clip(result, 0, 100) != result:
-        result = clip(result, 0, 100)
+    if _clip(result, 0, 100) != result:
+        result = _clip(result, 0, 100)
         tweaks.append(CoverControlTweaks.CLIPPED_TO_0_100_RANGE)
 
+    tilt = None
+    if automation_config.slat_tilt:
+        # The slats only need to follow the sun when the cover does; otherwise they're left open.
+        if reason == CoverControlReason.SUN_IN_FRONT_OF_WINDOW:
+            tilt = round(_record("calculated_tilt", _calculate_tilt()))
+        else:
+            tilt = round(open_tilt_percentage(automation_config.tilt_range))
+
     return SunTrackingVerticalCoverPosition(
         is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk=_is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk(),
         target_position=result,
+        target_tilt=tilt,
         reason=reason,
         tweaks=tweaks,
+        predicates=predicates,
     )
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import replace
+from typing import Any
+
+from .calculation import SunTrackingVerticalCoverPosition
+
+# Number of distinct inputs remembered; the sun moves on, so only recent positions are worth keeping.
+DEFAULT_CALCULATION_CACHE_SIZE = 64
+# Solar positions closer than this (in degrees) are treated as the same position.
+DEFAULT_SOLAR_RESOLUTION = 0.1
+
+
+class CalculationCache:
+    """Bounded LRU of calculation results, keyed on quantized solar position plus everything else they depend on."""
+
+    __slots__ = ("_entries", "hits", "max_size", "misses", "resolution")
+
+    def __init__(
+        self, max_size: int = DEFAULT_CALCULATION_CACHE_SIZE, resolution: float = DEFAULT_SOLAR_RESOLUTION
+    ) -> None:
+        self.max_size = max_size
+        self.resolution = resolution
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, SunTrackingVerticalCoverPosition] = OrderedDict()
+
+    def key(self, solar_azimuth: float, solar_elevation: float, *rest: Hashable) -> tuple:
+        return (round(solar_azimuth / self.resolution), round(solar_elevation / self.resolution), *rest)
+
+    def get(self, key: Hashable) -> SunTrackingVerticalCoverPosition | None:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return _copy(result)
+
+    def put(self, key: Hashable, result: SunTrackingVerticalCoverPosition) -> None:
+        self._entries[key] = _copy(result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
+
+
+def _copy(result: SunTrackingVerticalCoverPosition) -> SunTrackingVerticalCoverPosition:
+    # Callers adjust results in place (inverting, say), which mustn't leak into the cached copy.
+    return replace(result, tweaks=list(result.tweaks), predicates=dict(result.predicates))
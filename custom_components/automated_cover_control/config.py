@@ -5,20 +5,24 @@ from datetime import time, timedelta
 from types import MappingProxyType
 from typing import Any
 
+from .blind_spots import BlindSpot, BlindSpotIndex, blind_spot_index
 from .const import (
     CONF_BEFORE_SUNRISE_OR_AFTER_SUNSET_COVER_POSITION,
     CONF_BLIND_SPOT_ELEVATION,
     CONF_BLIND_SPOT_ENABLED,
     CONF_BLIND_SPOT_LEFT,
     CONF_BLIND_SPOT_RIGHT,
+    CONF_BLIND_SPOTS,
     CONF_CALC_ROUNDING,
     CONF_DEFAULT_COVER_POSITION,
     CONF_DISTANCE_FROM_WINDOW,
     CONF_END_TIME,
     CONF_END_TIME_ENTITY,
     CONF_ENTITIES,
+    CONF_FIN_DEPTH,
     CONF_FOV_LEFT,
     CONF_FOV_RIGHT,
+    CONF_HORIZON,
     CONF_INVERT,
     CONF_LUX_ENTITY,
     CONF_LUX_THRESHOLD,
@@ -35,18 +39,29 @@ from .const import (
     CONF_MINIMUM_COVER_POSITION,
     CONF_ONLY_FORCE_MAXIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW,
     CONF_ONLY_FORCE_MINIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW,
+    CONF_OVERHANG_DEPTH,
+    CONF_OVERHANG_OFFSET,
     CONF_PRESENCE_ENTITY,
     CONF_RETURN_TO_DEFAULT_AT_END_TIME,
+    CONF_REVEAL_DEPTH,
+    CONF_SLAT_DEPTH,
+    CONF_SLAT_SPACING,
+    CONF_SLAT_TILT,
     CONF_START_TIME,
     CONF_START_TIME_ENTITY,
     CONF_SUNRISE_OFFSET,
     CONF_SUNSET_OFFSET,
+    CONF_TILT_RANGE,
     CONF_WEATHER_ENTITY,
     CONF_WEATHER_STATE,
     CONF_WINDOW_AZIMUTH,
     CONF_WINDOW_HEIGHT,
     CONF_WINDOW_SENSOR_ENTITY,
+    CONF_WINDOW_WIDTH,
 )
+from .horizon import HorizonProfile
+from .shading import WindowShading
+from .tilt import DEFAULT_SLAT_DEPTH, DEFAULT_SLAT_SPACING, DEFAULT_TILT_RANGE
 
 
 def _config_option_or_default(config: MappingProxyType[str, Any], key: str, default: Any) -> Any:
@@ -56,7 +71,7 @@ def _config_option_or_default(config: MappingProxyType[str, Any], key: str, defa
     return value
 
 
-@dataclass
+@dataclass(slots=True)
 class ManualOverrideConfiguration:
     reset_timer_at_each_adjustment: bool = False
     override_duration: timedelta | None = None
@@ -78,7 +93,7 @@ class ManualOverrideConfiguration:
             self.detection_threshold = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class AutomationConfiguration:
     entities: list[str] = field(default_factory=list)
 
@@ -106,6 +121,12 @@ class AutomationConfiguration:
 
     cover_calculation_rounding: int = 0
 
+    # Venetian blinds: also tilt the slats to keep direct sun out. Slat depth and spacing only matter as a ratio.
+    slat_tilt: bool = False
+    slat_depth: float = DEFAULT_SLAT_DEPTH
+    slat_spacing: float = DEFAULT_SLAT_SPACING
+    tilt_range: int = DEFAULT_TILT_RANGE
+
     def read(self, config: MappingProxyType[str, Any]) -> None:
         self.entities = config.get(CONF_ENTITIES, [])
 
@@ -139,23 +160,46 @@ class AutomationConfiguration:
 
         self.cover_calculation_rounding = config.get(CONF_CALC_ROUNDING, 0)
 
+        self.slat_tilt = bool(config.get(CONF_SLAT_TILT))
+        self.slat_depth = config.get(CONF_SLAT_DEPTH) or DEFAULT_SLAT_DEPTH
+        self.slat_spacing = config.get(CONF_SLAT_SPACING) or DEFAULT_SLAT_SPACING
+        self.tilt_range = int(config.get(CONF_TILT_RANGE) or DEFAULT_TILT_RANGE)
+
 
-@dataclass
+@dataclass(slots=True)
 class BlindSpotConfiguration:
     enabled: bool = False
     # Left, right specified as angles between 0 and 180, anchored on the plane of the window.
     left: int | None = None
     right: int | None = None
     elevation: int | None = None
+    # Any further regions, in the same terms as the one above.
+    additional: list[BlindSpot] = field(default_factory=list)
 
     def read(self, config: MappingProxyType[str, Any]) -> None:
         self.enabled = config.get(CONF_BLIND_SPOT_ENABLED, False)
         self.left = config.get(CONF_BLIND_SPOT_LEFT)
         self.right = config.get(CONF_BLIND_SPOT_RIGHT)
         self.elevation = config.get(CONF_BLIND_SPOT_ELEVATION)
+        self.additional = [
+            BlindSpot(spot["left"], spot["right"], spot.get("elevation")) for spot in config.get(CONF_BLIND_SPOTS) or []
+        ]
+
+    @property
+    def regions(self) -> tuple[BlindSpot, ...]:
+        if not self.enabled:
+            return ()
+        regions = list(self.additional)
+        if self.left is not None and self.right is not None:
+            regions.insert(0, BlindSpot(self.left, self.right, self.elevation))
+        return tuple(regions)
 
+    @property
+    def index(self) -> BlindSpotIndex:
+        return blind_spot_index(self.regions)
 
-@dataclass
+
+@dataclass(slots=True)
 class SensorConfiguration:
     presence_entity: str | None = None
     window_sensor_entity: str | None = None
@@ -173,7 +217,7 @@ class SensorConfiguration:
         self.lux_threshold = config.get(CONF_LUX_THRESHOLD)
 
 
-@dataclass
+@dataclass(slots=True)
 class WindowConfiguration:
     window_azimuth: int = 0
     window_height: float = 0.0
@@ -182,6 +226,9 @@ class WindowConfiguration:
     fov_right: int = 90
     min_solar_elevation: int | None = None
     max_solar_elevation: int | None = None
+    horizon: HorizonProfile | None = None
+    # Overhang, fins and reveal, if any of them were configured.
+    shading: WindowShading | None = None
 
     def read(self, config: MappingProxyType[str, Any]) -> None:
         self.window_azimuth = config.get(CONF_WINDOW_AZIMUTH, 0)
@@ -191,3 +238,20 @@ class WindowConfiguration:
         self.fov_right = min(config.get(CONF_FOV_RIGHT, 90), 90)
         self.min_solar_elevation = config.get(CONF_MIN_SOLAR_ELEVATION, None)
         self.max_solar_elevation = config.get(CONF_MAX_SOLAR_ELEVATION, None)
+        horizon = config.get(CONF_HORIZON)
+        if not horizon:
+            self.horizon = None
+        elif self.horizon is None or self.horizon.source is not horizon:
+            self.horizon = HorizonProfile(horizon)
+        shading = (
+            self.window_height,
+            config.get(CONF_WINDOW_WIDTH) or 0.0,
+            config.get(CONF_OVERHANG_DEPTH) or 0.0,
+            config.get(CONF_OVERHANG_OFFSET) or 0.0,
+            config.get(CONF_FIN_DEPTH) or 0.0,
+            config.get(CONF_REVEAL_DEPTH) or 0.0,
+        )
+        if not any(shading[2:]) or self.window_height <= 0:
+            self.shading = None
+        elif self.shading is None or self.shading.source != shading:
+            self.shading = WindowShading(*shading)
@@ -8,7 +8,7 @@ from homeassistant.config_entries import (
     ConfigFlowResult,
     OptionsFlowWithReload,
 )
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
 
 from .const import (
@@ -17,13 +17,17 @@ from .const import (
     CONF_BLIND_SPOT_ENABLED,
     CONF_BLIND_SPOT_LEFT,
     CONF_BLIND_SPOT_RIGHT,
+    CONF_BLIND_SPOTS,
     CONF_DEFAULT_COVER_POSITION,
     CONF_DISTANCE_FROM_WINDOW,
     CONF_END_TIME,
     CONF_END_TIME_ENTITY,
     CONF_ENTITIES,
+    CONF_FIN_DEPTH,
     CONF_FOV_LEFT,
     CONF_FOV_RIGHT,
+    CONF_HORIZON,
+    CONF_HORIZON_FILE,
     CONF_INVERT,
     CONF_LUX_ENTITY,
     CONF_LUX_THRESHOLD,
@@ -40,19 +44,28 @@ from .const import (
     CONF_MINIMUM_COVER_POSITION,
     CONF_ONLY_FORCE_MAXIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW,
     CONF_ONLY_FORCE_MINIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW,
+    CONF_OVERHANG_DEPTH,
+    CONF_OVERHANG_OFFSET,
     CONF_PRESENCE_ENTITY,
     CONF_RETURN_TO_DEFAULT_AT_END_TIME,
+    CONF_REVEAL_DEPTH,
+    CONF_SLAT_DEPTH,
+    CONF_SLAT_SPACING,
+    CONF_SLAT_TILT,
     CONF_START_TIME,
     CONF_START_TIME_ENTITY,
     CONF_SUNRISE_OFFSET,
     CONF_SUNSET_OFFSET,
+    CONF_TILT_RANGE,
     CONF_WEATHER_ENTITY,
     CONF_WEATHER_STATE,
     CONF_WINDOW_AZIMUTH,
     CONF_WINDOW_HEIGHT,
     CONF_WINDOW_SENSOR_ENTITY,
+    CONF_WINDOW_WIDTH,
     DOMAIN,
 )
+from .horizon import read_horizon_file
 
 BASE_SCHEMA = vol.Schema(
     {
@@ -90,6 +103,34 @@ WINDOW_SCHEMA = vol.Schema(
             )
         ),
         vol.Optional(CONF_BLIND_SPOT_ENABLED, default=False): bool,
+        # Fixed shading: depths measured from the glass, the overhang's offset from the top of the window up.
+        vol.Optional(CONF_WINDOW_WIDTH): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0.1, max=10, step=0.01, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="m"
+            )
+        ),
+        vol.Optional(CONF_OVERHANG_DEPTH): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, max=5, step=0.01, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="m"
+            )
+        ),
+        vol.Optional(CONF_OVERHANG_OFFSET): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, max=5, step=0.01, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="m"
+            )
+        ),
+        vol.Optional(CONF_FIN_DEPTH): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, max=5, step=0.01, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="m"
+            )
+        ),
+        vol.Optional(CONF_REVEAL_DEPTH): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, max=1, step=0.01, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="m"
+            )
+        ),
+        # CSV or PVGIS horizon file, relative to the config directory; read into CONF_HORIZON when submitted.
+        vol.Optional(CONF_HORIZON_FILE): selector.TextSelector(),
     }
 )
 
@@ -106,6 +147,16 @@ BLIND_SPOT_SCHEMA = vol.Schema(
             )
         ),
         vol.Optional(CONF_BLIND_SPOT_ELEVATION): vol.All(vol.Coerce(int), vol.Range(min=0, max=90)),
+        # Further regions, as a list of {left, right, elevation (optional)}, in the same terms as the one above.
+        vol.Optional(CONF_BLIND_SPOTS): selector.ObjectSelector(),
+    }
+)
+
+BLIND_SPOT_REGION_SCHEMA = vol.Schema(
+    {
+        vol.Required("left"): vol.All(vol.Coerce(float), vol.Range(min=0, max=180)),
+        vol.Required("right"): vol.All(vol.Coerce(float), vol.Range(min=0, max=180)),
+        vol.Optional("elevation"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=90))),
     }
 )
 
@@ -135,6 +186,20 @@ COVER_POSITION_SCHEMA = vol.Schema(
         vol.Optional(CONF_MINIMUM_COVER_POSITION): vol.All(vol.Coerce(int), vol.Range(min=0, max=99)),
         vol.Optional(CONF_ONLY_FORCE_MINIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW, default=False): bool,
         vol.Optional(CONF_INVERT, default=False): bool,
+        # Venetian blinds: tilt the slats to keep direct sun out as well.
+        vol.Optional(CONF_SLAT_TILT, default=False): bool,
+        vol.Optional(CONF_SLAT_DEPTH): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=5, max=200, step=1, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="mm"
+            )
+        ),
+        vol.Optional(CONF_SLAT_SPACING): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=5, max=200, step=1, mode=selector.NumberSelectorMode.BOX, unit_of_measurement="mm"
+            )
+        ),
+        # Degrees the slats turn through from closed at tilt position 0 to tilt position 100.
+        vol.Optional(CONF_TILT_RANGE): vol.All(vol.Coerce(int), vol.In([90, 180])),
     }
 )
 
@@ -223,6 +288,19 @@ def _validate_window_params(user_input: dict[str, Any]) -> dict[str, str] | None
     return None
 
 
+async def _async_read_horizon(hass: HomeAssistant, user_input: dict[str, Any]) -> dict[str, str] | None:
+    path = user_input.get(CONF_HORIZON_FILE)
+    if not path:
+        user_input[CONF_HORIZON] = None
+        return None
+    try:
+        points = await hass.async_add_executor_job(read_horizon_file, hass.config.path(path))
+    except (OSError, ValueError):
+        return {CONF_HORIZON_FILE: "invalid_horizon_file"}
+    user_input[CONF_HORIZON] = [list(point) for point in points]
+    return None
+
+
 def _validate_blind_spot_params(user_input: dict[str, Any]) -> dict[str, str] | None:
     if (
         user_input.get(CONF_BLIND_SPOT_LEFT) is not None
@@ -230,6 +308,14 @@ def _validate_blind_spot_params(user_input: dict[str, Any]) -> dict[str, str] |
         and user_input[CONF_BLIND_SPOT_LEFT] >= user_input[CONF_BLIND_SPOT_RIGHT]
     ):
         return {CONF_BLIND_SPOT_RIGHT: "blind_spot_right_less_than_left"}
+    if user_input.get(CONF_BLIND_SPOTS) is not None:
+        try:
+            regions = [BLIND_SPOT_REGION_SCHEMA(region) for region in user_input[CONF_BLIND_SPOTS]]
+        except (TypeError, vol.Invalid):
+            return {CONF_BLIND_SPOTS: "invalid_blind_spots"}
+        if any(region["left"] >= region["right"] for region in regions):
+            return {CONF_BLIND_SPOTS: "blind_spot_right_less_than_left"}
+        user_input[CONF_BLIND_SPOTS] = regions
     return None
 
 
@@ -254,6 +340,8 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
 
     async def async_step_window(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         errors = _validate_window_params(user_input) if user_input else None
+        if user_input and not errors:
+            errors = await _async_read_horizon(self.hass, user_input)
         if errors or not user_input:
             return self.async_show_form(
                 step_id="window",
@@ -326,6 +414,7 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
                 CONF_BLIND_SPOT_ENABLED: self.config.get(CONF_BLIND_SPOT_ENABLED),
                 CONF_BLIND_SPOT_LEFT: self.config.get(CONF_BLIND_SPOT_LEFT, None),
                 CONF_BLIND_SPOT_RIGHT: self.config.get(CONF_BLIND_SPOT_RIGHT, None),
+                CONF_BLIND_SPOTS: self.config.get(CONF_BLIND_SPOTS, None),
                 CONF_DEFAULT_COVER_POSITION: self.config.get(CONF_DEFAULT_COVER_POSITION),
                 CONF_DISTANCE_FROM_WINDOW: self.config.get(CONF_DISTANCE_FROM_WINDOW),
                 CONF_END_TIME: self.config.get(CONF_END_TIME),
@@ -333,7 +422,18 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
                 CONF_ENTITIES: self.config.get(CONF_ENTITIES),
                 CONF_FOV_LEFT: self.config.get(CONF_FOV_LEFT),
                 CONF_FOV_RIGHT: self.config.get(CONF_FOV_RIGHT),
+                CONF_HORIZON: self.config.get(CONF_HORIZON),
+                CONF_WINDOW_WIDTH: self.config.get(CONF_WINDOW_WIDTH),
+                CONF_OVERHANG_DEPTH: self.config.get(CONF_OVERHANG_DEPTH),
+                CONF_OVERHANG_OFFSET: self.config.get(CONF_OVERHANG_OFFSET),
+                CONF_FIN_DEPTH: self.config.get(CONF_FIN_DEPTH),
+                CONF_REVEAL_DEPTH: self.config.get(CONF_REVEAL_DEPTH),
+                CONF_HORIZON_FILE: self.config.get(CONF_HORIZON_FILE),
                 CONF_INVERT: self.config.get(CONF_INVERT),
+                CONF_SLAT_TILT: self.config.get(CONF_SLAT_TILT),
+                CONF_SLAT_DEPTH: self.config.get(CONF_SLAT_DEPTH),
+                CONF_SLAT_SPACING: self.config.get(CONF_SLAT_SPACING),
+                CONF_TILT_RANGE: self.config.get(CONF_TILT_RANGE),
                 CONF_LUX_ENTITY: self.config.get(CONF_LUX_ENTITY),
                 CONF_LUX_THRESHOLD: self.config.get(CONF_LUX_THRESHOLD),
                 CONF_MANUAL_OVERRIDE_DETECTION_THRESHOLD: self.config.get(CONF_MANUAL_OVERRIDE_DETECTION_THRESHOLD),
@@ -391,6 +491,8 @@ class OptionsFlowHandler(OptionsFlowWithReload):
 
     async def async_step_window(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         errors = _validate_window_params(user_input) if user_input else None
+        if user_input and not errors:
+            errors = await _async_read_horizon(self.hass, user_input)
         if errors or not user_input:
             return self.async_show_form(
                 step_id="window",
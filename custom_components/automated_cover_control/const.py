@@ -5,14 +5,18 @@ CONF_BLIND_SPOT_ELEVATION = "blind_spot_elevation"
 CONF_BLIND_SPOT_ENABLED = "blind_spot_enabled"
 CONF_BLIND_SPOT_LEFT = "blind_spot_left"
 CONF_BLIND_SPOT_RIGHT = "blind_spot_right"
+CONF_BLIND_SPOTS = "blind_spots"
 CONF_CALC_ROUNDING = "calc_rounding"
 CONF_DEFAULT_COVER_POSITION = "default_cover_position"
 CONF_DISTANCE_FROM_WINDOW = "distance_from_window"
 CONF_END_TIME = "end_time"
 CONF_END_TIME_ENTITY = "end_time_entity"
 CONF_ENTITIES = "entities"
+CONF_FIN_DEPTH = "fin_depth"
 CONF_FOV_LEFT = "fov_left"
 CONF_FOV_RIGHT = "fov_right"
+CONF_HORIZON = "horizon"
+CONF_HORIZON_FILE = "horizon_file"
 CONF_INVERT = "invert"
 CONF_LUX_ENTITY = "lux_entity"
 CONF_LUX_THRESHOLD = "lux_threshold"
@@ -29,14 +33,30 @@ CONF_MINIMUM_COVER_POSITION = "minimum_cover_position"
 CONF_MIN_SOLAR_ELEVATION = "min_solar_elevation"
 CONF_ONLY_FORCE_MAXIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW = "only_force_maximum_when_sun_in_front_of_window"
 CONF_ONLY_FORCE_MINIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW = "only_force_minimum_when_sun_in_front_of_window"
+CONF_OVERHANG_DEPTH = "overhang_depth"
+CONF_OVERHANG_OFFSET = "overhang_offset"
 CONF_PRESENCE_ENTITY = "presence_entity"
 CONF_RETURN_TO_DEFAULT_AT_END_TIME = "return_to_default_at_end_time"
+CONF_REVEAL_DEPTH = "reveal_depth"
+CONF_SLAT_DEPTH = "slat_depth"
+CONF_SLAT_SPACING = "slat_spacing"
+CONF_SLAT_TILT = "slat_tilt"
 CONF_START_TIME = "start_time"
 CONF_START_TIME_ENTITY = "start_time_entity"
 CONF_SUNRISE_OFFSET = "sunrise_offset"
 CONF_SUNSET_OFFSET = "sunset_offset"
+CONF_TILT_RANGE = "tilt_range"
 CONF_WEATHER_ENTITY = "weather_entity"
 CONF_WEATHER_STATE = "weather_state"
 CONF_WINDOW_AZIMUTH = "window_azimuth"
 CONF_WINDOW_HEIGHT = "window_height"
 CONF_WINDOW_SENSOR_ENTITY = "window_sensor_entity"
+CONF_WINDOW_WIDTH = "window_width"
+
+SERVICE_BACKTEST = "backtest"
+DEFAULT_BACKTEST_DAYS = 7
+MAX_BACKTEST_DAYS = 30
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DAYS = "days"
+ATTR_OPTIONS = "options"
@@ -2,27 +2,29 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, fields, replace
 from datetime import UTC, date, datetime, time, timedelta
 
-from dateutil import parser, tz
-from homeassistant.components.cover import ATTR_POSITION
+from dateutil import parser
+from homeassistant.components.cover import ATTR_POSITION, ATTR_TILT_POSITION
 from homeassistant.components.cover import DOMAIN as COVER_DOMAIN
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     SERVICE_SET_COVER_POSITION,
+    SERVICE_SET_COVER_TILT_POSITION,
 )
 from homeassistant.core import (
     Event,
     EventStateChangedData,
     HomeAssistant,
     State,
+    callback,
 )
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.sun import get_astral_location
-from homeassistant.helpers.template import state_attr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util.dt import get_time_zone
 
@@ -30,7 +32,14 @@ from .calculation import (
     SunPosition,
     SunTrackingVerticalCoverPosition,
     calculate_sun_tracking_vertical_cover_position,
+    evaluate_sensor_predicates,
+    is_after_sunset_or_before_sunrise,
+    is_lux_above_threshold,
+    is_presence_detected,
+    is_sunny,
+    is_window_open,
 )
+from .calculation_cache import CalculationCache
 from .config import (
     AutomationConfiguration,
     BlindSpotConfiguration,
@@ -38,34 +47,87 @@ from .config import (
     WindowConfiguration,
 )
 from .const import DOMAIN
-from .log_context_adapter import LogContextAdapter
+from .cover_motion_tracker import CoverMotionTracker
+from .decision_trace import COMMANDED, DecisionTrace, DecisionTraceBuffer
+from .log_context_adapter import LazyLogArg, LogContextAdapter
 from .manual_override_manager import ManualOverrideManager
+from .predicate_graph import PredicateGraph
+from .refresh_inputs import SUN_ENTITY, RefreshInputs, capture_refresh_inputs
+from .refresh_stats import SERVICE_CALLS_STAGE, RefreshStats, RefreshTrigger, StageTimer
 from .sun import SolarTimeCalculator
-from .util import get_state_or_none_if_unknown, midnight_to_end_of_day, to_json_safe_dict
+from .tilt import open_tilt_percentage
+from .util import known_state_or_none, midnight_to_end_of_day, to_json_safe_dict
 from .why import CoverControlReason, CoverControlTweaks
 
 
-@dataclass
-class CoverStateChangeData:
+@dataclass(frozen=True, slots=True)
+class CoverResult:
     entity_id: str
-    new_state: State
+    # Why the cover was left alone, or None if it was sent to the target.
+    reason: CoverControlReason | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AutomatedCoverControlData:
-    states: dict
-    attributes: dict
+    sun_in_window_start: datetime | None = None
+    sun_in_window_end: datetime | None = None
+    manual_override: bool | None = None
+    covers_under_manual_control: tuple[str, ...] = ()
+    target_position: int | None = None
+    target_tilt: int | None = None
+    sun_in_front_of_window: bool | None = None
+    reason: CoverControlReason | None = None
+    tweaks: tuple[CoverControlTweaks, ...] = ()
+    covers: tuple[CoverResult, ...] = ()
+
+    @property
+    def per_cover_reasons(self) -> dict[str, CoverControlReason]:
+        return {cover.entity_id: cover.reason for cover in self.covers if cover.reason is not None}
+
+
+@dataclass(frozen=True, slots=True)
+class ControlWindow:
+    # Local day and start/end options the bounds were resolved for; None bounds are open.
+    day: date
+    options: tuple
+    start: datetime | None = None
+    end: datetime | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CoverChecks:
+    # What a refresh's per-cover checks were decided from, so an identical refresh can reuse their results.
+    config_version: int
+    target_position: int
+    target_tilt: int | None
+    cover_states: tuple[State | None, ...]
+    manual_covers: frozenset[str]
+    covers: tuple[CoverResult, ...]
+
+
+# Per-cover outcomes that stay the same for as long as the cover's state, the target and the overrides do. (Time
+# threshold outcomes expire, and commanded covers need commanding again.)
+STABLE_COVER_REASONS = frozenset({CoverControlReason.UNDER_MANUAL_CONTROL, CoverControlReason.ALREADY_AT_TARGET})
+
+DATA_FIELDS = tuple(field.name for field in fields(AutomatedCoverControlData))
+
+
+def get_changed_keys(old: AutomatedCoverControlData, new: AutomatedCoverControlData) -> set[str]:
+    # Dataclass equality is a tuple compare, so the common nothing-changed case is cheap.
+    if old == new:
+        return set()
+    return {key for key in DATA_FIELDS if getattr(old, key) != getattr(new, key)}
 
 
 class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[AutomatedCoverControlData]):
-    @dataclass
+    @dataclass(slots=True)
     class _AsyncRefreshRequest:
-        cover_state_change: bool = False
         end_time: bool = False
+        trigger: RefreshTrigger = RefreshTrigger.OTHER
 
         def reset(self) -> None:
-            self.cover_state_change = False
             self.end_time = False
+            self.trigger = RefreshTrigger.OTHER
 
     config_entry: ConfigEntry
 
@@ -76,6 +138,13 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         self._logger = LogContextAdapter(logging.getLogger(__name__))
         self._logger.set_config_name(self.config_entry.data.get("name"))
 
+        # Shared by every entity of this entry, rather than each building (and holding) its own copy.
+        self.device_info = DeviceInfo(
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, self.config_entry.entry_id)},
+            name=f"{self.config_entry.data['name']} Automated Cover Control",
+        )
+
         self._automation_config = AutomationConfiguration()
         self._blind_spot_config = BlindSpotConfiguration()
         self._sensor_config = SensorConfiguration()
@@ -83,8 +152,22 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
 
         self._async_refresh_requests = AutomatedCoverControlDataUpdateCoordinator._AsyncRefreshRequest()
 
-        self._cover_entities_in_motion: dict[str, int] = {}
-        self._cover_state_change_data: CoverStateChangeData | None = None
+        self._covers_in_motion = CoverMotionTracker(self._logger)
+        self._motion_sweep_listener: Callable[[], None] | None = None
+        # Cover states waiting to be checked for manual overrides, keyed by entity_id.
+        self._pending_cover_states: dict[str, State] = {}
+        self._cover_state_drain_scheduled = False
+        # Refresh for when covers held back by the time threshold may move again. Dependent entity changes that can't
+        # change the outcome don't refresh, so nothing else is guaranteed to come along and re-check them.
+        self._time_threshold_listener: Callable[[], None] | None = None
+        self._time_threshold_refresh_at: datetime | None = None
+        # Target published by the most recent refresh, if any; manual overrides are detected against it.
+        self._last_target_position: int | None = None
+        self._last_target_tilt: int | None = None
+
+        # Resolved start/end of today's control window; reset by a new day, new options or a change of the start/end
+        # entities.
+        self._control_window: ControlWindow | None = None
 
         self._end_time_event_listener: Callable[[], None] | None = None
         self._end_time_last_scheduled = datetime.now(tz=UTC)
@@ -94,12 +177,53 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         self._enable_automation: bool | None = None
         self._manual_overrides: ManualOverrideManager = ManualOverrideManager(self._logger)
 
+        # Change tracking for published data, so entities can skip redundant state writes.
+        self._last_published_data: AutomatedCoverControlData | None = None
+        self._last_published_success: bool = True
+        self._changed_keys: set[str] | None = None
+        self.suppressed_state_writes: int = 0
+
+        # Structured record of recent decisions, for diagnostics.
+        self.decision_traces = DecisionTraceBuffer()
+        self.refresh_stats = RefreshStats()
+
         self._sun_end_time: datetime | None = None
         self._sun_start_time: datetime | None = None
         self._next_sun_time_recompute: datetime | None = None
 
+        # Memoized calculation results; keys include the config version, bumped whenever the options change.
+        self.calculation_cache = CalculationCache()
+        self._config_options = None
+        self._config_version = 0
+        self._last_cover_checks: CoverChecks | None = None
+        # What each dependent entity feeds into, so changes that can't affect the outcome don't refresh.
+        self.predicates = PredicateGraph()
+
         self._update_config()
 
+        self.config_entry.async_on_unload(self._cancel_motion_sweep)
+        self.config_entry.async_on_unload(self._cancel_time_threshold_refresh)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        # None means everything changed (first publication, or availability flipped).
+        self._changed_keys = None
+        if (
+            self._last_published_data is not None
+            and self.data is not None
+            and self._last_published_success == self.last_update_success
+        ):
+            self._changed_keys = get_changed_keys(self._last_published_data, self.data)
+        self._last_published_data = self.data
+        self._last_published_success = self.last_update_success
+        self._logger.debug("[async_update_listeners] changed keys: %s", self._changed_keys)
+        super().async_update_listeners()
+
+    def has_changed(self, keys: tuple[str, ...]) -> bool:
+        if self._changed_keys is None:
+            return True
+        return not self._changed_keys.isdisjoint(keys)
+
     def _update_config(self) -> None:
         self._automation_config.read(self.config_entry.options)
         self._blind_spot_config.read(self.config_entry.options)
@@ -107,36 +231,89 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         self._window_config.read(self.config_entry.options)
 
         self._manual_overrides.update_config(self.config_entry.options)
+        self._covers_in_motion.retain(self._automation_config.entities)
+
+        if self.config_entry.options is not self._config_options:
+            self._config_options = self.config_entry.options
+            self._config_version += 1
+            self.predicates = self._build_predicate_graph()
+            self.refresh_stats.retain(self.get_refresh_input_entities(), self.get_cover_entities())
+
+    def _build_predicate_graph(self) -> PredicateGraph:
+        sensor_config = self._sensor_config
+        end_time_entity = self._automation_config.end_time_entity
+
+        def _sun_position(states: Mapping[str, State]) -> tuple | None:
+            sun = states.get(SUN_ENTITY)
+            return None if sun is None else (sun.attributes.get("azimuth"), sun.attributes.get("elevation"))
+
+        def _end_time(states: Mapping[str, State]) -> str | None:
+            state = states.get(end_time_entity)
+            return None if state is None else state.state
+
+        graph = PredicateGraph()
+        graph.add("sun_position", [SUN_ENTITY], _sun_position)
+        graph.add(
+            "window_open", [sensor_config.window_sensor_entity], lambda states: is_window_open(states, sensor_config)
+        )
+        graph.add(
+            "presence_detected",
+            [sensor_config.presence_entity],
+            lambda states: is_presence_detected(states, sensor_config),
+        )
+        graph.add(
+            "lux_above_threshold",
+            [sensor_config.lux_entity],
+            lambda states: is_lux_above_threshold(states, sensor_config),
+        )
+        graph.add("sunny", [sensor_config.weather_entity], lambda states: is_sunny(states, sensor_config))
+        graph.add("end_time", [end_time_entity], _end_time)
+        return graph
 
     def _combine_local_time_with_date(self, date, time) -> datetime:
         local_time_zone = get_time_zone(self.hass.config.time_zone)
         return datetime.combine(date.astimezone(local_time_zone), time, local_time_zone)
 
-    def _get_start_time(self) -> datetime | None:
+    def _get_start_time(self, inputs: RefreshInputs) -> datetime | None:
         start_time = None
         if self._automation_config.start_time_entity is not None:
-            start_time = get_state_or_none_if_unknown(self.hass, self._automation_config.start_time_entity)
+            start_time = known_state_or_none(inputs.states.get(self._automation_config.start_time_entity))
         else:
             start_time = self._automation_config.start_time
         if start_time is None:
             return None
         start_time = parser.parse(str(start_time), ignoretz=True).time()
-        return self._combine_local_time_with_date(datetime.now(tz.UTC), start_time)
+        return self._combine_local_time_with_date(inputs.now, start_time)
 
-    def _get_end_time(self) -> datetime | None:
+    def _get_end_time(self, inputs: RefreshInputs) -> datetime | None:
         end_time = None
         if self._automation_config.end_time_entity is not None:
-            end_time = get_state_or_none_if_unknown(self.hass, self._automation_config.end_time_entity)
+            end_time = known_state_or_none(inputs.states.get(self._automation_config.end_time_entity))
         else:
             end_time = self._automation_config.end_time
         if end_time is None:
             return None
         end_time = parser.parse(str(end_time), ignoretz=True).time()
         end_time = midnight_to_end_of_day(end_time)
-        return self._combine_local_time_with_date(datetime.now(tz.UTC), end_time)
+        return self._combine_local_time_with_date(inputs.now, end_time)
+
+    def _get_control_window(self, inputs: RefreshInputs) -> ControlWindow:
+        today = inputs.now.astimezone(get_time_zone(self.hass.config.time_zone)).date()
+        options = (
+            self._automation_config.start_time,
+            self._automation_config.start_time_entity,
+            self._automation_config.end_time,
+            self._automation_config.end_time_entity,
+        )
+        window = self._control_window
+        if window is None or window.day != today or window.options != options:
+            self._control_window = ControlWindow(
+                today, options, self._get_start_time(inputs), self._get_end_time(inputs)
+            )
+            self._logger.debug("[_get_control_window] resolved %s", self._control_window)
+        return self._control_window
 
-    def _register_end_time_trigger(self) -> None:
-        end_time = self._get_end_time()
+    def _register_end_time_trigger(self, end_time: datetime | None) -> None:
         if self._end_time_event_listener:
             self._end_time_event_listener()
             self._end_time_event_listener = None
@@ -152,8 +329,10 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         self._end_time_last_scheduled = end_time
 
     async def _async_end_time_trigger(self, event) -> None:
-        now = datetime.now(tz=UTC)
-        end_time = self._get_end_time()
+        # Not part of a refresh; resolve the window from the start/end entities as they are now.
+        inputs = capture_refresh_inputs(self.hass, self.get_control_window_entities())
+        now = inputs.now
+        end_time = self._get_control_window(inputs).end
         if end_time is None:
             self._logger.debug("[_async_end_time_trigger] End time is not set!")
             return
@@ -167,6 +346,7 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         # One minute because the unit tests tick the clock at minute granularity...
         if delta <= timedelta(minutes=1):
             self._async_refresh_requests.end_time = True
+            self._async_refresh_requests.trigger = RefreshTrigger.END_TIME
             self._logger.debug("[_async_end_time_trigger] End-time refresh triggered")
             await self.async_refresh()
         else:
@@ -174,45 +354,211 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
                 "[_async_end_time_trigger] End-time refresh, but not equal to end time"
             )  # pragma: no cover
 
-    def _generate_data(self, state_updates: dict = {}) -> AutomatedCoverControlData:
+    def _cancel_motion_sweep(self) -> None:
+        if self._motion_sweep_listener:
+            self._motion_sweep_listener()
+            self._motion_sweep_listener = None
+
+    def _schedule_motion_sweep(self) -> None:
+        self._cancel_motion_sweep()
+        next_deadline = self._covers_in_motion.next_deadline()
+        if next_deadline is None:
+            return
+        self._logger.debug("[_schedule_motion_sweep] next sweep at %s", next_deadline)
+        self._motion_sweep_listener = async_track_point_in_utc_time(
+            self.hass, self._async_motion_sweep, next_deadline + timedelta(seconds=1)
+        )
+
+    async def _async_motion_sweep(self, now: datetime) -> None:
+        self._motion_sweep_listener = None
+        expired = self._covers_in_motion.expire(now)
+        self._schedule_motion_sweep()
+        if not expired:
+            return
+        # Covers that never settled had their state changes swallowed while in motion, so check them for overrides now.
+        for entity_id, (target_position, target_tilt) in expired.items():
+            state = self.hass.states.get(entity_id)
+            if state is None or state.state in ["opening", "closing"]:
+                continue
+            if self._covers_in_motion.is_settled(state, target_position, target_tilt):
+                continue
+            self._logger.debug(
+                "[_async_motion_sweep] %s did not settle at %s (tilt %s), checking for manual override",
+                entity_id,
+                target_position,
+                target_tilt,
+            )
+            self._queue_cover_state(entity_id, state)
+
+    def _cancel_time_threshold_refresh(self) -> None:
+        if self._time_threshold_listener:
+            self._time_threshold_listener()
+            self._time_threshold_listener = None
+        self._time_threshold_refresh_at = None
+
+    def _schedule_time_threshold_refresh(self, when: datetime) -> None:
+        if self._time_threshold_refresh_at is not None and self._time_threshold_refresh_at <= when:
+            return
+        self._cancel_time_threshold_refresh()
+        self._logger.debug("[_schedule_time_threshold_refresh] refresh at %s", when)
+        self._time_threshold_refresh_at = when
+        self._time_threshold_listener = async_track_point_in_utc_time(
+            self.hass, self._async_time_threshold_refresh, when + timedelta(seconds=1)
+        )
+
+    async def _async_time_threshold_refresh(self, now: datetime) -> None:
+        self._time_threshold_listener = None
+        self._time_threshold_refresh_at = None
+        self._async_refresh_requests.trigger = RefreshTrigger.TIME_THRESHOLD
+        await self.async_refresh()
+
+    @callback
+    def _queue_cover_state(self, entity_id: str, new_state: State) -> None:
+        # Covers that move together report together; queueing their states lets one pass check all of them and
+        # publish (at most) once. Only the latest state of each cover matters.
+        self._pending_cover_states[entity_id] = new_state
+        if not self._cover_state_drain_scheduled:
+            self._cover_state_drain_scheduled = True
+            # Not eager, so the rest of the states reported in this loop iteration are queued before it runs.
+            self.config_entry.async_create_task(self.hass, self._async_drain_cover_states(), eager_start=False)
+
+    async def _async_drain_cover_states(self) -> None:
+        try:
+            # States reported while this pass awaits its cover commands are picked up by the next one.
+            while self._pending_cover_states:
+                states, self._pending_cover_states = self._pending_cover_states, {}
+                await self._async_handle_cover_states(states)
+        finally:
+            self._cover_state_drain_scheduled = False
+
+    async def _async_handle_cover_states(self, states: dict[str, State]) -> None:
+        # Lightweight alternative to a full refresh: checks covers against the last published target.
+        if not self._enable_automation or self.data is None:
+            return
+        if self._last_target_position is None:
+            self._logger.debug("[_async_handle_cover_states] no previous target for %s", list(states))
+            return
+        for entity_id in list(states):
+            if self._manual_overrides.should_ignore_state_change(states[entity_id]):
+                self._logger.debug("[_async_handle_cover_states] Ignoring state change for %s", entity_id)
+                del states[entity_id]
+        if not states:
+            return
+        timer = StageTimer()
+        try:
+            await self._async_handle_cover_overrides(states, timer)
+        finally:
+            self.refresh_stats.record(RefreshTrigger.COVER_EVENT, timer)
+
+    async def _async_handle_cover_overrides(self, states: dict[str, State], timer: StageTimer) -> None:
+        # The reported states are what the covers are checked against.
+        inputs = RefreshInputs(datetime.now(tz=UTC), states)
+        new_overrides: dict[str, CoverResult] = {}
+        restore = []
+        for entity_id, new_state in states.items():
+            was_manual = self._manual_overrides.is_cover_manual(entity_id)
+            self._manual_overrides.handle_state_change(
+                entity_id, new_state, self._last_target_position, self._last_target_tilt
+            )
+            if not self._manual_overrides.is_cover_manual(entity_id):
+                # Not an override, so put the cover back where it belongs.
+                restore.append(entity_id)
+            elif not was_manual:
+                new_overrides[entity_id] = CoverResult(entity_id, CoverControlReason.UNDER_MANUAL_CONTROL)
+        if restore:
+            await self._async_apply_target_to_covers(
+                restore, self._last_target_position, self._last_target_tilt, False, timer, inputs
+            )
+        if not new_overrides:
+            return
+        # Publish the new overrides; everything else stays as computed by the last refresh.
+        covers = tuple(new_overrides.get(cover.entity_id, cover) for cover in self.data.covers)
+        covers += tuple(manual for manual in new_overrides.values() if manual not in covers)
+        data = replace(
+            self.data,
+            manual_override=self._manual_overrides.is_any_cover_under_manual_control(),
+            covers_under_manual_control=tuple(self._manual_overrides.covers_under_manual_control()),
+            covers=covers,
+        )
+        if set(data.per_cover_reasons.values()) == {CoverControlReason.UNDER_MANUAL_CONTROL}:
+            data = replace(data, reason=CoverControlReason.UNDER_MANUAL_CONTROL)
+        self.decision_traces.record(
+            DecisionTrace(
+                started=inputs.now,
+                trigger=RefreshTrigger.COVER_EVENT,
+                # The reported position of each newly overridden cover.
+                inputs={entity_id: states[entity_id].attributes.get("current_position") for entity_id in new_overrides},
+                reason=data.reason,
+                target_position=data.target_position,
+                tweaks=list(data.tweaks),
+                covers={entity_id: manual.reason for entity_id, manual in new_overrides.items()},
+                duration_ms=round(timer.elapsed_ms(), 3),
+            )
+        )
+        self.async_set_updated_data(data)
+
+    def _generate_data(self, **results) -> AutomatedCoverControlData:
         data = AutomatedCoverControlData(
-            states=dict(
-                {
-                    "sun_in_window_start": self._sun_start_time,
-                    "sun_in_window_end": self._sun_end_time,
-                    "manual_override": self._manual_overrides.is_any_cover_under_manual_control(),
-                    "covers_under_manual_control": self._manual_overrides.covers_under_manual_control(),
-                },
-                **state_updates,
-            ),
-            attributes={
-                "automation": to_json_safe_dict(self._automation_config),
-                "blind_spot": to_json_safe_dict(self._blind_spot_config),
-                "sensor": to_json_safe_dict(self._sensor_config),
-                "window": to_json_safe_dict(self._window_config),
-                "manual_override": to_json_safe_dict(self._manual_overrides.get_config()),
-            },
+            sun_in_window_start=self._sun_start_time,
+            sun_in_window_end=self._sun_end_time,
+            manual_override=self._manual_overrides.is_any_cover_under_manual_control(),
+            covers_under_manual_control=tuple(self._manual_overrides.covers_under_manual_control()),
+            **results,
         )
+        self._last_target_position = data.target_position
+        self._last_target_tilt = data.target_tilt
         self._logger.debug("[_generate_data] data: %s", data)
         return data
 
     async def _async_update_data(self) -> AutomatedCoverControlData:
-        now = datetime.now(tz=UTC)
+        trigger = self._async_refresh_requests.trigger
+        self._async_refresh_requests.trigger = RefreshTrigger.OTHER
+        # Everything below decides from this one snapshot, rather than reading hass (and the clock) as it goes.
+        inputs = capture_refresh_inputs(self.hass, self.get_refresh_input_entities())
+        trace = DecisionTrace(started=inputs.now, trigger=trigger)
+        timer = StageTimer()
+        try:
+            data = await self._async_calculate_data(inputs, trace, timer)
+        except Exception as err:
+            trace.error = repr(err)
+            raise
+        else:
+            trace.reason = data.reason
+            trace.target_position = data.target_position
+            trace.tweaks = list(data.tweaks)
+            trace.covers = {cover.entity_id: cover.reason or COMMANDED for cover in data.covers}
+            if SERVICE_CALLS_STAGE not in timer.durations_ms:
+                self.refresh_stats.record_without_command()
+        finally:
+            trace.duration_ms = round(timer.elapsed_ms(), 3)
+            trace.stages_ms = {stage: round(duration, 3) for stage, duration in timer.durations_ms.items()}
+            self.decision_traces.record(trace)
+            self.refresh_stats.record(trigger, timer)
+        return data
+
+    async def _async_calculate_data(
+        self, inputs: RefreshInputs, trace: DecisionTrace, timer: StageTimer
+    ) -> AutomatedCoverControlData:
+        now = inputs.now
         self._logger.debug(
             "[_async_update_data] called at %s (%s local), updating config",
-            now.isoformat(),
-            now.astimezone(get_time_zone(self.hass.config.time_zone)).isoformat(),
+            LazyLogArg(now.isoformat),
+            LazyLogArg(lambda: now.astimezone(get_time_zone(self.hass.config.time_zone)).isoformat()),
         )
-        self._update_config()
+        with timer.stage("config"):
+            self._update_config()
+        # Later dependent-entity changes are compared against what this refresh decided from.
+        self.predicates.evaluate_all(inputs.states)
 
         # Generate sun start, end times (purely informational).
         if self._sun_start_time is None or self._next_sun_time_recompute is None or now > self._next_sun_time_recompute:
             self._logger.debug("[_async_update_data] Recalculating solar times")
-            solar_calc = SolarTimeCalculator(self.hass, self._window_config)
+            solar_calc = SolarTimeCalculator(self.hass, self._window_config, self._blind_spot_config)
             loop = asyncio.get_event_loop()
-            self._sun_start_time, self._sun_end_time = await loop.run_in_executor(
-                None, solar_calc.get_solar_start_and_end_times
-            )
+            with timer.stage("solar_times"):
+                self._sun_start_time, self._sun_end_time = await loop.run_in_executor(
+                    None, solar_calc.get_solar_start_and_end_times
+                )
             # Set next-recompute time to just past midnight on the next day.
             self._next_sun_time_recompute = self._combine_local_time_with_date(
                 self._sun_start_time + timedelta(days=1), time.min
@@ -227,31 +573,20 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         # Bail early; automation is disabled.
         if not self._enable_automation:
             self._logger.debug("[_async_update_data] automation disabled; exiting")
-            return self._generate_data({"reason": CoverControlReason.AUTOMATION_DISABLED})
+            return self._generate_data(reason=CoverControlReason.AUTOMATION_DISABLED)
 
         calculated_target: SunTrackingVerticalCoverPosition | None = None
+        cache_hit = False
         force_set_position: bool = False
 
         # Handle async event-triggered refresh requests first.
-        if self._async_refresh_requests.cover_state_change:
-            self._logger.debug("[_async_update_data] async refresh request: cover state change")
-            if self._cover_state_change_data is not None:
-                if "target_position" in self.data.states:
-                    self._manual_overrides.handle_state_change(
-                        self._cover_state_change_data.entity_id,
-                        self._cover_state_change_data.new_state,
-                        self.data.states["target_position"],
-                    )
-                else:
-                    self._logger.warning(
-                        "[_async_update_data] cover state change but no previous data?"
-                    )  # pragma: no cover
-            else:
-                self._logger.warning("[_async_update_data] cover state change but no event data?")  # pragma: no cover
         if self._async_refresh_requests.end_time:
+            trace.inputs["end_time_reached"] = True
             calculated_target = SunTrackingVerticalCoverPosition()
             calculated_target.target_position = self._automation_config.before_sunrise_or_after_sunset_cover_position
             calculated_target.reason = CoverControlReason.END_TIME_REACHED
+            if self._automation_config.slat_tilt:
+                calculated_target.target_tilt = round(open_tilt_percentage(self._automation_config.tilt_range))
             force_set_position = True
             self._logger.debug(
                 "[_async_update_data] async refresh request: end time, setting target to %s",
@@ -261,48 +596,67 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         self._async_refresh_requests.reset()
 
         # Reset manual overrides if they've expired.
-        self._manual_overrides.reset_expired_overrides()
+        self._manual_overrides.reset_expired_overrides(now)
 
         # Schedule end-time trigger.
-        maybe_end_time = self._get_end_time()
+        control_window = self._get_control_window(inputs)
+        maybe_end_time = control_window.end
         if (
             maybe_end_time is not None
             and self._automation_config.return_to_default_at_end_time
             and maybe_end_time > self._end_time_last_scheduled
         ):
-            self._register_end_time_trigger()
+            self._register_end_time_trigger(maybe_end_time)
 
         # Bail early if we're outside the control time range.
-        if not force_set_position and not self._is_within_control_time_range():
+        if not force_set_position and not self._is_within_control_time_range(control_window, now):
             self._logger.debug("[_async_update_data] outside control time range")
             # This hack allows us to continue returning END_TIME_REACHED for the rest of the day, to simplify debugging.
             if (
-                self.data.states.get("reason", CoverControlReason.UNKNOWN) == CoverControlReason.END_TIME_REACHED
-                and self.data.states.get("sun_in_window_start", datetime.min) == self._sun_start_time
+                self.data.reason == CoverControlReason.END_TIME_REACHED
+                and self.data.sun_in_window_start == self._sun_start_time
             ):
                 return self.data
-            return self._generate_data({"reason": CoverControlReason.OUTSIDE_CONTROL_TIME_RANGE})
+            return self._generate_data(reason=CoverControlReason.OUTSIDE_CONTROL_TIME_RANGE)
 
         if not calculated_target:
             # Get sun position and calculate cover target.
+            today = now.astimezone(get_time_zone(self.hass.config.time_zone)).date()
             sun_pos = SunPosition(
-                solar_azimuth=state_attr(self.hass, "sun.sun", "azimuth"),
-                solar_elevation=state_attr(self.hass, "sun.sun", "elevation"),
-                sunrise=self._astral_location.sunrise(date.today(), local=False),
-                sunset=self._astral_location.sunset(date.today(), local=False),
+                solar_azimuth=inputs.solar_azimuth,
+                solar_elevation=inputs.solar_elevation,
+                sunrise=self._astral_location.sunrise(today, local=False),
+                sunset=self._astral_location.sunset(today, local=False),
+                now=now,
             )
             self._logger.debug("[_async_update_data] sun position: %s", sun_pos)
-
-            calculated_target = calculate_sun_tracking_vertical_cover_position(
-                self.hass,
-                self._logger,
-                sun_pos,
-                self._automation_config,
-                self._blind_spot_config,
-                self._sensor_config,
-                self._window_config,
+            trace.inputs.update(
+                solar_azimuth=sun_pos.solar_azimuth,
+                solar_elevation=sun_pos.solar_elevation,
+                sunrise=sun_pos.sunrise,
+                sunset=sun_pos.sunset,
             )
+
+            cache_key = self._get_calculation_cache_key(inputs, sun_pos)
+            if cache_key is not None:
+                calculated_target = self.calculation_cache.get(cache_key)
+                cache_hit = calculated_target is not None
+                trace.inputs["cache_hit"] = cache_hit
+            if calculated_target is None:
+                with timer.stage("calculation"):
+                    calculated_target = calculate_sun_tracking_vertical_cover_position(
+                        inputs.states,
+                        self._logger,
+                        sun_pos,
+                        self._automation_config,
+                        self._blind_spot_config,
+                        self._sensor_config,
+                        self._window_config,
+                    )
+                if cache_key is not None:
+                    self.calculation_cache.put(cache_key, calculated_target)
             self._logger.debug("[_async_update_data] calculated target: %s", calculated_target)
+            trace.predicates = calculated_target.predicates
 
         # Invert the target if necessary.
         if self._automation_config.invert:
@@ -314,83 +668,179 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
             )
 
         # Set cover positions and record reason.
-        per_cover_control_reasons = {}
-        for cover in self._automation_config.entities:
-            if self._manual_overrides.is_cover_manual(cover):
-                self._logger.debug("[_async_update_data] cover %s under manual control", cover)
-                per_cover_control_reasons[cover] = CoverControlReason.UNDER_MANUAL_CONTROL
-                continue
-            if not force_set_position and not self._is_update_allowed_by_time_threshold(cover):
-                self._logger.debug(
-                    "[_async_update_data] update to %s not allowed by time threshold",
-                    cover,
-                )
-                per_cover_control_reasons[cover] = CoverControlReason.TIME_THRESHOLD_DISALLOWED
-                continue
-            if self._is_already_at_position(cover, calculated_target.target_position):
-                self._logger.debug("[_async_update_data] cover %s already at position", cover)
-                per_cover_control_reasons[cover] = CoverControlReason.ALREADY_AT_TARGET
-                continue
-            # Okay now actually set the position.
-            await self._async_set_cover_position(cover, calculated_target.target_position)
+        cover_checks = CoverChecks(
+            config_version=self._config_version,
+            target_position=calculated_target.target_position,
+            target_tilt=calculated_target.target_tilt,
+            cover_states=tuple(inputs.states.get(cover) for cover in self._automation_config.entities),
+            manual_covers=frozenset(self._manual_overrides.covers_under_manual_control()),
+            covers=(),
+        )
+        last_checks = self._last_cover_checks
+        if (
+            cache_hit
+            and not force_set_position
+            and last_checks is not None
+            and replace(last_checks, covers=()) == cover_checks
+            and all(cover.reason in STABLE_COVER_REASONS for cover in last_checks.covers)
+        ):
+            self._logger.debug("[_async_update_data] nothing changed since the last refresh; skipping cover checks")
+            covers = list(last_checks.covers)
+        else:
+            covers = await self._async_apply_target_to_covers(
+                self._automation_config.entities,
+                calculated_target.target_position,
+                calculated_target.target_tilt,
+                force_set_position,
+                timer,
+                inputs,
+            )
+        self._last_cover_checks = replace(cover_checks, covers=tuple(covers))
 
         # If all the covers are under manual control, report that as the reason.
-        if set(per_cover_control_reasons.values()) == {CoverControlReason.UNDER_MANUAL_CONTROL}:
+        if {cover.reason for cover in covers if cover.reason is not None} == {CoverControlReason.UNDER_MANUAL_CONTROL}:
             calculated_target.reason = CoverControlReason.UNDER_MANUAL_CONTROL
 
         # Return updated data.
-        return self._generate_data(
-            {
-                "target_position": calculated_target.target_position,
-                "sun_in_front_of_window": calculated_target.is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk,
-                "reason": calculated_target.reason,
-                "tweaks": calculated_target.tweaks,
-                "per_cover_reasons": per_cover_control_reasons,
-            }
+        with timer.stage("data_generation"):
+            return self._generate_data(
+                target_position=calculated_target.target_position,
+                target_tilt=calculated_target.target_tilt,
+                sun_in_front_of_window=calculated_target.is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk,
+                reason=calculated_target.reason,
+                tweaks=tuple(calculated_target.tweaks),
+                covers=tuple(covers),
+            )
+
+    def _get_calculation_cache_key(self, inputs: RefreshInputs, sun_position: SunPosition) -> tuple | None:
+        if sun_position.solar_azimuth is None or sun_position.solar_elevation is None:
+            return None
+        return self.calculation_cache.key(
+            sun_position.solar_azimuth,
+            sun_position.solar_elevation,
+            is_after_sunset_or_before_sunrise(sun_position, self._automation_config),
+            evaluate_sensor_predicates(inputs.states, self._sensor_config),
+            self._config_version,
         )
 
-    async def _async_set_cover_position(self, entity, target_position):
+    async def _async_apply_target_to_covers(
+        self,
+        covers: list[str],
+        target_position: int,
+        target_tilt: int | None,
+        force_set_position: bool,
+        timer: StageTimer,
+        inputs: RefreshInputs,
+    ) -> list[CoverResult]:
+        # Checks every cover first, then sends all of them their position and tilt in one call each.
+        results = []
+        position_covers = []
+        tilt_covers = []
+        held_since = []
+        with timer.stage("cover_checks"):
+            for cover in covers:
+                reason = self._get_reason_to_leave_cover_alone(
+                    cover, target_position, target_tilt, force_set_position, inputs
+                )
+                results.append(CoverResult(cover, reason))
+                if reason == CoverControlReason.TIME_THRESHOLD_DISALLOWED:
+                    held_since.append(inputs.states[cover].last_updated)
+                if reason is not None:
+                    continue
+                if not self._is_already_at_position(cover, target_position, inputs):
+                    position_covers.append(cover)
+                if target_tilt is not None and not self._is_already_at_tilt(cover, target_tilt, inputs):
+                    tilt_covers.append(cover)
+        if held_since:
+            self._schedule_time_threshold_refresh(min(held_since) + self._automation_config.minimum_change_time)
+        # Okay now actually set the positions.
+        commanded = list(dict.fromkeys([*position_covers, *tilt_covers]))
+        if commanded:
+            for cover in commanded:
+                # One command per cover, whether it's sent its position, its tilt or both.
+                self.refresh_stats.record_command(cover)
+                # Covers only sent a tilt are close enough to the target position already; they stay where they are.
+                position = inputs.attribute(cover, "current_position") if cover not in position_covers else None
+                self._covers_in_motion.start(
+                    cover,
+                    target_position if position is None else position,
+                    target_tilt=target_tilt if cover in tilt_covers else None,
+                )
+            self._schedule_motion_sweep()
+            with timer.stage(SERVICE_CALLS_STAGE):
+                if position_covers:
+                    # Many venetian blind drivers reset the slats whenever the cover moves, so the tilt has to come
+                    # after the position has been handled.
+                    await self._async_set_cover_position(position_covers, target_position, blocking=bool(tilt_covers))
+                if tilt_covers:
+                    await self._async_set_cover_tilt_position(tilt_covers, target_tilt)
+        return results
+
+    def _get_reason_to_leave_cover_alone(
+        self, cover: str, target_position: int, target_tilt: int | None, force_set_position: bool, inputs: RefreshInputs
+    ) -> CoverControlReason | None:
+        if self._manual_overrides.is_cover_manual(cover):
+            self._logger.debug("[_async_apply_target_to_cover] cover %s under manual control", cover)
+            return CoverControlReason.UNDER_MANUAL_CONTROL
+        if not force_set_position and not self._is_update_allowed_by_time_threshold(cover, inputs):
+            self._logger.debug(
+                "[_async_apply_target_to_cover] update to %s not allowed by time threshold",
+                cover,
+            )
+            return CoverControlReason.TIME_THRESHOLD_DISALLOWED
+        if self._is_already_at_position(cover, target_position, inputs) and (
+            target_tilt is None or self._is_already_at_tilt(cover, target_tilt, inputs)
+        ):
+            self._logger.debug("[_async_apply_target_to_cover] cover %s already at position", cover)
+            return CoverControlReason.ALREADY_AT_TARGET
+        return None
+
+    async def _async_set_cover_position(self, entities: list[str], target_position: int, blocking: bool = False):
         service = SERVICE_SET_COVER_POSITION
         service_data = {}
-        service_data[ATTR_ENTITY_ID] = entity
+        service_data[ATTR_ENTITY_ID] = entities
         service_data[ATTR_POSITION] = target_position
 
-        self._cover_entities_in_motion[entity] = target_position
-        self._logger.debug(
-            "[_async_set_cover_position] cover entities in motion: %s",
-            self._cover_entities_in_motion,
-        )
         self._logger.debug("[_async_set_cover_position] Run %s with data %s", service, service_data)
+        await self.hass.services.async_call(COVER_DOMAIN, service, service_data, blocking=blocking)
+
+    async def _async_set_cover_tilt_position(self, entities: list[str], target_tilt: int):
+        service = SERVICE_SET_COVER_TILT_POSITION
+        service_data = {}
+        service_data[ATTR_ENTITY_ID] = entities
+        service_data[ATTR_TILT_POSITION] = target_tilt
+
+        self._logger.debug("[_async_set_cover_tilt_position] Run %s with data %s", service, service_data)
         await self.hass.services.async_call(COVER_DOMAIN, service, service_data)
 
-    def _is_after_start_time(self):
-        if self._get_start_time() is None:
+    def _is_after_start_time(self, control_window: ControlWindow, now: datetime) -> bool:
+        start_time = control_window.start
+        if start_time is None:
             return True
-        now = datetime.now(tz=UTC)
         self._logger.debug(
             "[_is_after_start_time] Start time: %s, now: %s, now >= time: %s",
-            self._get_start_time(),
+            start_time,
             now,
-            now >= self._get_start_time(),
+            now >= start_time,
         )
-        return now >= self._get_start_time()
+        return now >= start_time
 
-    def _is_before_end_time(self):
-        if self._get_end_time() is None:
+    def _is_before_end_time(self, control_window: ControlWindow, now: datetime) -> bool:
+        end_time = control_window.end
+        if end_time is None:
             return True
-        now = datetime.now(tz=UTC)
         self._logger.debug(
             "[_is_before_end_time] End time: %s, now: %s, now < time: %s",
-            self._get_end_time(),
+            end_time,
             now,
-            now < self._get_end_time(),
+            now < end_time,
         )
-        return now < self._get_end_time()
+        return now < end_time
 
-    def _is_within_control_time_range(self):
-        return self._is_before_end_time() and self._is_after_start_time()
+    def _is_within_control_time_range(self, control_window: ControlWindow, now: datetime) -> bool:
+        return self._is_before_end_time(control_window, now) and self._is_after_start_time(control_window, now)
 
-    def _is_already_at_position(self, entity, target_position):
+    def _is_already_at_position(self, entity, target_position, inputs: RefreshInputs):
         OVERRIDE_POSITIONS = [0, 100]
 
         if self._automation_config.invert:
@@ -408,7 +858,7 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
                 ]
             )
 
-        position = state_attr(self.hass, entity, "current_position")
+        position = inputs.attribute(entity, "current_position")
 
         if position is None:
             self._logger.debug("[_is_already_at_position] No position for cover %s", entity)
@@ -441,8 +891,16 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         )
         return diff < self._automation_config.minimum_change_percentage
 
-    def _is_update_allowed_by_time_threshold(self, entity):
-        state = self.hass.states.get(entity)
+    def _is_already_at_tilt(self, entity, target_tilt, inputs: RefreshInputs):
+        tilt = inputs.attribute(entity, "current_tilt_position")
+        if tilt is None:
+            # Not a cover that tilts (or not one that reports it); there's nothing to send it.
+            self._logger.debug("[_is_already_at_tilt] No tilt for cover %s", entity)
+            return True
+        return tilt == target_tilt or abs(tilt - target_tilt) < self._automation_config.minimum_change_percentage
+
+    def _is_update_allowed_by_time_threshold(self, entity, inputs: RefreshInputs):
+        state = inputs.states.get(entity)
         if state is None:
             self._logger.debug(
                 "[_is_update_allowed_by_time_threshold] state not available for %s",
@@ -455,8 +913,7 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
                 entity,
             )  # pragma: no cover
             return True  # pragma: no cover
-        now = datetime.now(tz=UTC)
-        delta = now - state.last_updated
+        delta = inputs.now - state.last_updated
         result = delta >= self._automation_config.minimum_change_time
         self._logger.debug(
             "[_is_update_allowed_by_time_threshold] entity=%s, time delta=%s, threshold=%s, result=%s",
@@ -472,6 +929,15 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
             "[async_dependent_entity_state_change] dependent entity state change: %s",
             event,
         )
+        entity_id = event.data["entity_id"]
+        self.refresh_stats.record_source(entity_id)
+        new_state = event.data["new_state"]
+        if not self.predicates.update(entity_id, {entity_id: new_state} if new_state is not None else {}):
+            self._logger.debug(
+                "[async_dependent_entity_state_change] nothing depending on %s changed; skipping refresh", entity_id
+            )
+            return
+        self._async_refresh_requests.trigger = RefreshTrigger.DEPENDENT_ENTITY
         await self.async_refresh()
 
     async def async_cover_entity_state_change(self, event: Event[EventStateChangedData]) -> None:
@@ -491,55 +957,36 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
                 event.data["entity_id"],
             )  # pragma: no cover
             return  # pragma: no cover
+        self.refresh_stats.record_source(event.data["entity_id"])
         new_state = event.data["new_state"] or State("", "")
-        in_motion_target = self._cover_entities_in_motion.get(event.data["entity_id"], None)
-        if in_motion_target is not None:
-            position = new_state.attributes.get("current_position")
-            if position == in_motion_target:
-                del self._cover_entities_in_motion[event.data["entity_id"]]
-                self._logger.debug(
-                    "[async_cover_entity_state_change] Position %s reached for %s",
-                    position,
-                    event.data["entity_id"],
-                )
-            else:
-                self._logger.debug(
-                    "[async_cover_entity_state_change] Waiting for %s to reach %s, currently at %s",
-                    event.data["entity_id"],
-                    in_motion_target,
-                    position,
-                )
+        if self._covers_in_motion.handle_state_change(event.data["entity_id"], new_state):
             # Nothing to do here.
             return
-        if self._manual_overrides.should_ignore_state_change(new_state):
-            self._logger.debug(
-                "[async_cover_entity_state_change] Ignoring state change for %s",
-                event.data["entity_id"],
-            )
-            return
         self._logger.debug(
             "[async_cover_entity_state_change] Not expecting cover %s to be in motion",
             event.data["entity_id"],
         )
-        self._cover_state_change_data = CoverStateChangeData(event.data["entity_id"], new_state)
-        self._async_refresh_requests.cover_state_change = True
-        await self.async_refresh()
+        self._queue_cover_state(event.data["entity_id"], new_state)
 
     async def async_reset_manual_override(self):
         self._manual_overrides.clear_all()
+        self._async_refresh_requests.trigger = RefreshTrigger.BUTTON
         await self.async_refresh()
 
     async def async_enable_detection_of_manual_override(self, on_newly_added_to_hass: bool) -> bool:
         self._manual_overrides.enable_detection()
+        self._async_refresh_requests.trigger = RefreshTrigger.SWITCH
         return True
 
     async def async_disable_detection_of_manual_override(self, on_newly_added_to_hass: bool) -> bool:
         self._manual_overrides.disable_detection()
         self._manual_overrides.clear_all()
+        self._async_refresh_requests.trigger = RefreshTrigger.SWITCH
         return True
 
     async def async_enable_automated_control(self, on_newly_added_to_hass: bool) -> bool:
         self._enable_automation = True
+        self._async_refresh_requests.trigger = RefreshTrigger.SWITCH
         # Trigger a call to async_refresh().
         return True
 
@@ -547,9 +994,19 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
         self._enable_automation = False
         if not on_newly_added_to_hass:
             self._manual_overrides.clear_all()
+        self._async_refresh_requests.trigger = RefreshTrigger.SWITCH
         # Trigger a call to async_refresh().
         return True
 
+    def get_config_diagnostics(self) -> dict:
+        return {
+            "automation": to_json_safe_dict(self._automation_config),
+            "blind_spot": to_json_safe_dict(self._blind_spot_config),
+            "sensor": to_json_safe_dict(self._sensor_config),
+            "window": to_json_safe_dict(self._window_config),
+            "manual_override": to_json_safe_dict(self._manual_overrides.get_config()),
+        }
+
     def get_dependencies(self) -> list[str]:
         return [
             e
@@ -564,5 +1021,22 @@ class AutomatedCoverControlDataUpdateCoordinator(DataUpdateCoordinator[Automated
             if e is not None
         ]
 
+    @callback
+    def async_control_window_entity_state_change(self, event: Event[EventStateChangedData]) -> None:
+        self._logger.debug("[async_control_window_entity_state_change] %s changed", event.data["entity_id"])
+        self._control_window = None
+
+    def get_control_window_entities(self) -> list[str]:
+        return [
+            e
+            for e in [self._automation_config.start_time_entity, self._automation_config.end_time_entity]
+            if e is not None
+        ]
+
+    def get_refresh_input_entities(self) -> list[str]:
+        return list(
+            dict.fromkeys([*self.get_dependencies(), *self.get_control_window_entities(), *self.get_cover_entities()])
+        )
+
     def get_cover_entities(self) -> list[str]:
         return self._automation_config.entities
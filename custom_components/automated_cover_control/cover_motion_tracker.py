@@ -0,0 +1,153 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from homeassistant.core import State
+
+from .log_context_adapter import LogContextAdapter
+
+# Covers frequently report a position one step off from what was commanded (e.g. 49 instead of 50).
+DEFAULT_POSITION_TOLERANCE = 1
+# How long we wait for a commanded cover to make progress before giving up on it.
+DEFAULT_MOTION_TIMEOUT = timedelta(minutes=3)
+
+
+@dataclass(slots=True)
+class _CoverInMotion:
+    target_position: int
+    deadline: datetime
+    last_position: int | None = None
+    # Only for covers whose slats were commanded too.
+    target_tilt: int | None = None
+    last_tilt: int | None = None
+
+
+class CoverMotionTracker:
+    __slots__ = ("_in_motion", "_logger", "_timeout", "_tolerance")
+
+    _logger: LogContextAdapter
+    _tolerance: int
+    _timeout: timedelta
+    _in_motion: dict[str, _CoverInMotion]
+
+    def __init__(
+        self,
+        logger: LogContextAdapter,
+        tolerance: int = DEFAULT_POSITION_TOLERANCE,
+        timeout: timedelta = DEFAULT_MOTION_TIMEOUT,
+    ) -> None:
+        self._logger = logger
+        self._tolerance = tolerance
+        self._timeout = timeout
+        self._in_motion = {}
+
+    def _is_within_tolerance(self, position: int | None, target_position: int) -> bool:
+        return position is not None and abs(position - target_position) <= self._tolerance
+
+    def _is_reached(self, state: State, attribute: str, target: int | None) -> bool:
+        if target is None:
+            return True
+        value = state.attributes.get(attribute)
+        return value == target or (
+            state.state not in ["opening", "closing"] and self._is_within_tolerance(value, target)
+        )
+
+    def start(
+        self, entity_id: str, target_position: int, now: datetime | None = None, target_tilt: int | None = None
+    ) -> None:
+        if now is None:
+            now = datetime.now(tz=UTC)
+        self._in_motion[entity_id] = _CoverInMotion(target_position, now + self._timeout, target_tilt=target_tilt)
+        self._logger.debug(
+            "[CoverMotionTracker.start] %s moving to %s (tilt %s), deadline %s",
+            entity_id,
+            target_position,
+            target_tilt,
+            self._in_motion[entity_id].deadline,
+        )
+
+    def target_position(self, entity_id: str) -> int | None:
+        entry = self._in_motion.get(entity_id)
+        return entry.target_position if entry is not None else None
+
+    def handle_state_change(self, entity_id: str, new_state: State, now: datetime | None = None) -> bool:
+        # True if the state change belongs to a commanded motion and shouldn't be inspected any further.
+        entry = self._in_motion.get(entity_id)
+        if entry is None:
+            return False
+        if now is None:
+            now = datetime.now(tz=UTC)
+        if now > entry.deadline:
+            del self._in_motion[entity_id]
+            self._logger.debug(
+                "[CoverMotionTracker.handle_state_change] %s missed deadline %s for %s",
+                entity_id,
+                entry.deadline,
+                entry.target_position,
+            )
+            return False
+        position = new_state.attributes.get("current_position")
+        tilt = new_state.attributes.get("current_tilt_position")
+        if self._is_reached(new_state, "current_position", entry.target_position) and self._is_reached(
+            new_state, "current_tilt_position", entry.target_tilt
+        ):
+            del self._in_motion[entity_id]
+            self._logger.debug(
+                "[CoverMotionTracker.handle_state_change] Position %s (tilt %s) reached for %s (target %s, tilt %s)",
+                position,
+                tilt,
+                entity_id,
+                entry.target_position,
+                entry.target_tilt,
+            )
+        else:
+            # Slow covers keep reporting intermediate positions; as long as they do, they haven't stalled.
+            if position != entry.last_position or tilt != entry.last_tilt:
+                entry.last_position = position
+                entry.last_tilt = tilt
+                entry.deadline = now + self._timeout
+            self._logger.debug(
+                "[CoverMotionTracker.handle_state_change] Waiting for %s to reach %s (tilt %s), currently at %s "
+                "(tilt %s), deadline %s",
+                entity_id,
+                entry.target_position,
+                entry.target_tilt,
+                position,
+                tilt,
+                entry.deadline,
+            )
+        return True
+
+    def expire(self, now: datetime | None = None) -> dict[str, tuple[int, int | None]]:
+        # Target position and tilt of each cover that was given up on.
+        if now is None:
+            now = datetime.now(tz=UTC)
+        expired = {
+            entity_id: (entry.target_position, entry.target_tilt)
+            for entity_id, entry in self._in_motion.items()
+            if now > entry.deadline
+        }
+        for entity_id, target in expired.items():
+            self._logger.debug(
+                "[CoverMotionTracker.expire] Giving up on %s reaching %s",
+                entity_id,
+                target,
+            )
+            del self._in_motion[entity_id]
+        return expired
+
+    def retain(self, entity_ids: Iterable[str]) -> None:
+        keep = set(entity_ids)
+        for entity_id in [e for e in self._in_motion if e not in keep]:
+            del self._in_motion[entity_id]
+
+    def next_deadline(self) -> datetime | None:
+        return min((entry.deadline for entry in self._in_motion.values()), default=None)
+
+    def is_settled(self, state: State, target_position: int, target_tilt: int | None = None) -> bool:
+        return self._is_within_tolerance(state.attributes.get("current_position"), target_position) and (
+            target_tilt is None or self._is_within_tolerance(state.attributes.get("current_tilt_position"), target_tilt)
+        )
+
+    def __len__(self) -> int:
+        return len(self._in_motion)
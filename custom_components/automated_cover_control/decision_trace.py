@@ -0,0 +1,78 @@
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from .why import CoverControlReason, CoverControlTweaks
+
+# Enough to cover the last few hours at the default refresh cadence.
+DEFAULT_DECISION_TRACE_SIZE = 50
+
+# Per-cover decision recorded when the cover was sent to the target.
+COMMANDED = "commanded"
+
+
+@dataclass(slots=True)
+class DecisionTrace:
+    started: datetime
+    trigger: str
+    inputs: dict[str, Any] = field(default_factory=dict)
+    predicates: dict[str, Any] = field(default_factory=dict)
+    reason: CoverControlReason | None = None
+    target_position: int | None = None
+    tweaks: list[CoverControlTweaks] = field(default_factory=list)
+    covers: dict[str, str] = field(default_factory=dict)
+    duration_ms: float | None = None
+    stages_ms: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "started": self.started.isoformat(),
+            "trigger": self.trigger,
+            "inputs": {key: _json_safe(value) for key, value in self.inputs.items()},
+            "predicates": {key: _json_safe(value) for key, value in self.predicates.items()},
+            "reason": self.reason,
+            "target_position": self.target_position,
+            "tweaks": list(self.tweaks),
+            "covers": dict(self.covers),
+            "duration_ms": self.duration_ms,
+            "stages_ms": dict(self.stages_ms),
+            "error": self.error,
+        }
+
+
+def _json_safe(value: Any) -> Any:
+    if hasattr(value, "item"):
+        # numpy scalar.
+        value = value.item()
+    if value is None or isinstance(value, bool | int | str):
+        return value
+    if isinstance(value, float):
+        return round(value, 3)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class DecisionTraceBuffer:
+    __slots__ = ("_traces",)
+
+    _traces: deque[DecisionTrace]
+
+    def __init__(self, size: int = DEFAULT_DECISION_TRACE_SIZE) -> None:
+        self._traces = deque(maxlen=size)
+
+    def record(self, trace: DecisionTrace) -> None:
+        self._traces.append(trace)
+
+    def as_diagnostics(self) -> list[dict[str, Any]]:
+        # Most recent first, which is what you want when reading a dump.
+        return [trace.as_dict() for trace in reversed(self._traces)]
+
+    def __iter__(self) -> Iterator[DecisionTrace]:
+        return iter(self._traces)
+
+    def __len__(self) -> int:
+        return len(self._traces)
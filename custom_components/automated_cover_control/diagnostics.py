@@ -1,12 +1,25 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
+from .const import DOMAIN
+
 
 async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: ConfigEntry):
+    coordinator = hass.data.get(DOMAIN, {}).get(config_entry.entry_id)
     return {
         "title": "Automated Cover Control",
         "type": "config_entry",
         "identifier": config_entry.entry_id,
         "config_data": dict(config_entry.data),
         "config_options": dict(config_entry.options),
+        "config": coordinator.get_config_diagnostics() if coordinator is not None else None,
+        "coordinator": {
+            "suppressed_state_writes": coordinator.suppressed_state_writes,
+            "refresh_stats": coordinator.refresh_stats.as_diagnostics(),
+            "decision_trace": coordinator.decision_traces.as_diagnostics(),
+            "calculation_cache": coordinator.calculation_cache.as_diagnostics(),
+            "predicates": coordinator.predicates.as_diagnostics(),
+        }
+        if coordinator is not None
+        else None,
     }
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import AutomatedCoverControlDataUpdateCoordinator
+
+
+class AutomatedCoverControlEntity(CoordinatorEntity[AutomatedCoverControlDataUpdateCoordinator]):
+    # Fields of AutomatedCoverControlData this entity's state is derived from; None to write on every update.
+    _coordinator_keys: tuple[str, ...] | None = ()
+
+    def __init__(self, coordinator: AutomatedCoverControlDataUpdateCoordinator) -> None:
+        super().__init__(coordinator=coordinator)
+        self._attr_device_info = coordinator.device_info
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._coordinator_keys is not None and not self.coordinator.has_changed(self._coordinator_keys):
+            self.coordinator.suppressed_state_writes += 1
+            return
+        super()._handle_coordinator_update()
@@ -0,0 +1,109 @@
+"""Horizon profile of a window: the lowest elevation the sun is visible at, for each azimuth.
+
+Neighbouring buildings and trees hide the sun even when it's geometrically in front of the window. A profile is built
+from (azimuth, elevation) points, e.g. a CSV export or a PVGIS horizon file, and stored as one elevation per degree of
+azimuth, so checking it is a single index.
+"""
+
+import bisect
+import math
+import re
+from array import array
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+# One bin per degree of azimuth (clockwise from north); bin n covers [n, n + 1).
+HORIZON_BINS = 360
+
+
+class HorizonProfile:
+    __slots__ = ("_elevations", "points", "source")
+
+    def __init__(self, points: Iterable[Sequence[float]]) -> None:
+        # What the profile was built from, so the configuration only rebuilds it when that changes.
+        self.source = points
+        self.points = tuple(sorted((float(azimuth) % 360, float(elevation)) for azimuth, elevation in points))
+        if not self.points:
+            raise ValueError("horizon profile has no points")
+        azimuths = [azimuth for azimuth, _ in self.points]
+        self._elevations = array("f", (self._interpolate(azimuths, n + 0.5) for n in range(HORIZON_BINS)))
+
+    def __repr__(self) -> str:
+        return f"HorizonProfile({len(self.points)} points, max {max(self._elevations):.1f}°)"
+
+    def _interpolate(self, azimuths: list[float], azimuth: float) -> float:
+        # Linear between the neighbouring points, wrapping around north.
+        index = bisect.bisect_right(azimuths, azimuth)
+        before = self.points[index - 1] if index > 0 else (self.points[-1][0] - 360, self.points[-1][1])
+        after = self.points[index] if index < len(self.points) else (self.points[0][0] + 360, self.points[0][1])
+        if after[0] == before[0]:
+            return before[1]
+        return before[1] + (after[1] - before[1]) * (azimuth - before[0]) / (after[0] - before[0])
+
+    @property
+    def elevations(self) -> array:
+        return self._elevations
+
+    def minimum_elevation(self, azimuth: float) -> float:
+        return self._elevations[int(azimuth % 360) % HORIZON_BINS]
+
+    def is_sun_hidden(self, azimuth: float, elevation: float) -> bool:
+        return elevation < self.minimum_elevation(azimuth)
+
+    def minimum_elevations(self, azimuth: Any) -> Any:
+        """Array version of minimum_elevation(), for the batch calculation and the daily solar-times scan."""
+        # numpy isn't needed by the live calculation; keep it out of the integration's import.
+        import numpy as np
+
+        elevations = np.frombuffer(self._elevations, dtype=np.float32)
+        return elevations[(np.asarray(azimuth) % 360).astype(np.intp) % HORIZON_BINS]
+
+
+def _numbers(row: Sequence[str]) -> list[float] | None:
+    try:
+        return [float(value) for value in row if value.strip()]
+    except ValueError:
+        return None
+
+
+def _parse_pvgis(lines: list[str]) -> list[tuple[float, float]]:
+    # PVGIS "printhorizon" output: a tab-separated table headed "A  H_hor  ...", with A measured from south
+    # (east negative, west positive), followed by a legend.
+    header = next(index for index, line in enumerate(lines) if "H_hor" in line)
+    columns = lines[header].split()
+    azimuth_column, elevation_column = columns.index("A"), columns.index("H_hor")
+    points = []
+    for line in lines[header + 1 :]:
+        values = _numbers(line.split())
+        if not values or len(values) <= max(azimuth_column, elevation_column):
+            break
+        points.append(((values[azimuth_column] + 180) % 360, values[elevation_column]))
+    return points
+
+
+def parse_horizon(text: str) -> list[tuple[float, float]]:
+    """(azimuth, elevation) points from a horizon file, in degrees, azimuth clockwise from north.
+
+    Understands PVGIS "printhorizon" output, CSV with azimuth and elevation columns (any header row is skipped), and
+    PVGIS user horizon files: one elevation per line, equally spaced clockwise from north.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if any("H_hor" in line for line in lines):
+        points = _parse_pvgis(lines)
+    else:
+        rows = [values for values in (_numbers(re.split(r"[,;\s]+", line.strip())) for line in lines) if values]
+        if rows and all(len(values) == 1 for values in rows):
+            points = [(360 * index / len(rows), values[0]) for index, values in enumerate(rows)]
+        else:
+            points = [(values[0], values[1]) for values in rows if len(values) >= 2]
+    if not points:
+        raise ValueError("no horizon points found")
+    for azimuth, elevation in points:
+        if not (math.isfinite(azimuth) and -90 <= elevation <= 90):
+            raise ValueError(f"invalid horizon point ({azimuth}, {elevation})")
+    return points
+
+
+def read_horizon_file(path: str | Path) -> list[tuple[float, float]]:
+    return parse_horizon(Path(path).read_text(encoding="utf-8"))
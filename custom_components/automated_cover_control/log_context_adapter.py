@@ -1,15 +1,30 @@
 import logging
 
 
+class LazyLogArg:
+    """Defers an expensive log argument until the message is actually formatted."""
+
+    __slots__ = ("_func",)
+
+    def __init__(self, func):
+        self._func = func
+
+    def __str__(self):
+        return str(self._func())
+
+    def __repr__(self):
+        return repr(self._func())
+
+
 class LogContextAdapter(logging.LoggerAdapter):
     def __init__(self, logger, extra=None):
         super().__init__(logger, extra or {})
         self.config_name = None
+        self._prefix = "[unknown] "
 
     def set_config_name(self, config_name):
         self.config_name = config_name
+        self._prefix = f"[{config_name}] " if config_name else "[unknown] "
 
     def process(self, msg, kwargs):
-        if self.config_name:
-            return f"[{self.config_name}] {msg}", kwargs
-        return f"[unknown] {msg}", kwargs  # pragma: no cover
+        return f"{self._prefix}{msg}", kwargs
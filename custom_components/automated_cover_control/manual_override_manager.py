@@ -5,10 +5,12 @@ from typing import Any
 from homeassistant.core import State
 
 from .config import ManualOverrideConfiguration
-from .log_context_adapter import LogContextAdapter
+from .log_context_adapter import LazyLogArg, LogContextAdapter
 
 
 class ManualOverrideManager:
+    __slots__ = ("_config", "_enable_detection", "_logger", "_override_expiry")
+
     _logger: LogContextAdapter
     _config: ManualOverrideConfiguration
     _enable_detection: bool
@@ -53,7 +55,7 @@ class ManualOverrideManager:
         ]:
             return True
         self._logger.debug(
-            "[ManualOverrideManager.should_ignore_state_change] context: %s", new_state.context.as_dict()
+            "[ManualOverrideManager.should_ignore_state_change] context: %s", LazyLogArg(new_state.context.as_dict)
         )
         if self._config.ignore_non_user_triggered_changes and not new_state.context.user_id:
             self._logger.debug("[ManualOverrideManager.should_ignore_state_change] ignoring non-user-triggered change")
@@ -63,20 +65,29 @@ class ManualOverrideManager:
     def get_config(self) -> ManualOverrideConfiguration:
         return self._config
 
-    def handle_state_change(self, entity_id: str, new_state: State, target_position: int):
+    def handle_state_change(
+        self, entity_id: str, new_state: State, target_position: int, target_tilt: int | None = None
+    ):
         if not self._enable_detection:
             self._logger.debug("[ManualOverrideManager.handle_state_change] Detection disabled")
             return
         new_position = new_state.attributes.get("current_position") or 0
-        if new_position == target_position:
+        deviation = abs(target_position - new_position)
+        # Slats turned by hand are as much an override as a cover moved by hand; covers that don't report a tilt
+        # can't be checked for it.
+        new_tilt = new_state.attributes.get("current_tilt_position") if target_tilt is not None else None
+        if new_tilt is not None:
+            deviation = max(deviation, abs(target_tilt - new_tilt))
+        if deviation == 0:
             self._logger.debug(
-                "[ManualOverrideManager.handle_state_change] New position %s matches expected state for %s",
+                "[ManualOverrideManager.handle_state_change] New position %s (tilt %s) matches expected state for %s",
                 new_position,
+                new_tilt,
                 entity_id,
             )
             return
 
-        if abs(target_position - new_position) < (self._config.detection_threshold or 0):
+        if deviation < (self._config.detection_threshold or 0):
             self._logger.debug(
                 "[ManualOverrideManager.handle_state_change] Position change less than threshold %s for %s",
                 self._config.detection_threshold,
@@ -85,10 +96,12 @@ class ManualOverrideManager:
             return
 
         self._logger.debug(
-            "[ManualOverrideManager.handle_state_change] Manual change detected for %s. Our state: %s, new state: %s, manual threshold: %s",
+            "[ManualOverrideManager.handle_state_change] Manual change detected for %s. Our state: %s (tilt %s), new state: %s (tilt %s), manual threshold: %s",
             entity_id,
             target_position,
+            target_tilt,
             new_position,
+            new_tilt,
             self._config.detection_threshold,
         )
         self._logger.debug(
@@ -0,0 +1,57 @@
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any
+
+from homeassistant.core import State
+
+Evaluator = Callable[[Mapping[str, State]], Hashable]
+
+
+class PredicateGraph:
+    """Cached predicate values, each depending on a few input entities.
+
+    A change to an input re-evaluates only the predicates that depend on it; if none of their values change, whatever
+    is downstream of them can't change either.
+    """
+
+    __slots__ = ("_dependents", "_evaluators", "_values", "unchanged")
+
+    def __init__(self) -> None:
+        self._evaluators: dict[str, Evaluator] = {}
+        self._dependents: dict[str, list[str]] = {}
+        self._values: dict[str, Hashable] = {}
+        # Input changes that left every predicate as it was.
+        self.unchanged = 0
+
+    def add(self, name: str, inputs: Iterable[str | None], evaluate: Evaluator) -> None:
+        self._evaluators[name] = evaluate
+        for entity_id in inputs:
+            if entity_id is not None:
+                self._dependents.setdefault(entity_id, []).append(name)
+
+    def evaluate_all(self, states: Mapping[str, State]) -> None:
+        self._values = {name: evaluate(states) for name, evaluate in self._evaluators.items()}
+
+    def update(self, entity_id: str, states: Mapping[str, State]) -> bool:
+        """Re-evaluates the predicates that depend on entity_id; returns whether any of them changed.
+
+        An entity nothing depends on (or a predicate that's never been evaluated) counts as a change.
+        """
+        names = self._dependents.get(entity_id)
+        if not names:
+            return True
+        changed = False
+        for name in names:
+            value = self._evaluators[name](states)
+            if name not in self._values or self._values[name] != value:
+                self._values[name] = value
+                changed = True
+        if not changed:
+            self.unchanged += 1
+        return changed
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        return {
+            "inputs": {entity_id: list(names) for entity_id, names in self._dependents.items()},
+            "values": dict(self._values),
+            "unchanged": self.unchanged,
+        }
@@ -0,0 +1,45 @@
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant.core import HomeAssistant, State
+
+SUN_ENTITY = "sun.sun"
+
+
+@dataclass(frozen=True, slots=True)
+class RefreshInputs:
+    """Everything a refresh reads from Home Assistant, captured once at its start.
+
+    Decisions only depend on this (plus configuration), so the same inputs always lead to the same decisions.
+    """
+
+    now: datetime
+    # States of the entities the refresh reads, by entity_id; entities that don't exist are left out.
+    states: Mapping[str, State]
+
+    def attribute(self, entity_id: str, name: str) -> Any:
+        state = self.states.get(entity_id)
+        return None if state is None else state.attributes.get(name)
+
+    @property
+    def solar_azimuth(self) -> float | None:
+        return self.attribute(SUN_ENTITY, "azimuth")
+
+    @property
+    def solar_elevation(self) -> float | None:
+        return self.attribute(SUN_ENTITY, "elevation")
+
+
+def capture_refresh_inputs(
+    hass: HomeAssistant, entity_ids: Iterable[str], now: datetime | None = None
+) -> RefreshInputs:
+    states = {}
+    for entity_id in entity_ids:
+        # State objects are immutable; a later change replaces the object in the state machine rather than this one.
+        state = hass.states.get(entity_id)
+        if state is not None:
+            states[entity_id] = state
+    return RefreshInputs(now or datetime.now(tz=UTC), MappingProxyType(states))
@@ -0,0 +1,160 @@
+import enum
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from time import monotonic
+from typing import Any
+
+# Number of recent refreshes the percentiles are computed over.
+DEFAULT_TIMING_WINDOW = 200
+# Sliding windows (in minutes) that event rates are reported over.
+RATE_WINDOWS = {"5m": 5, "1h": 60}
+# Stage that issues cover commands; a refresh without it didn't move anything.
+SERVICE_CALLS_STAGE = "service_calls"
+
+
+class RefreshTrigger(enum.StrEnum):
+    OTHER = enum.auto()
+    DEPENDENT_ENTITY = enum.auto()
+    COVER_EVENT = enum.auto()
+    END_TIME = enum.auto()
+    SWITCH = enum.auto()
+    BUTTON = enum.auto()
+    TIME_THRESHOLD = enum.auto()
+
+
+class StageTimer:
+    """Accumulates wall-clock time per named stage of a single refresh."""
+
+    __slots__ = ("_started", "durations_ms")
+
+    def __init__(self) -> None:
+        self._started = monotonic()
+        self.durations_ms: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self.durations_ms[name] = self.durations_ms.get(name, 0.0) + (monotonic() - start) * 1000
+
+    def elapsed_ms(self) -> float:
+        return (monotonic() - self._started) * 1000
+
+
+class EventRate:
+    """Counts events in per-minute buckets, so rates over RATE_WINDOWS cost O(minutes) memory."""
+
+    __slots__ = ("_buckets", "total")
+
+    def __init__(self) -> None:
+        self.total = 0
+        self._buckets: deque[list[int]] = deque()
+
+    def add(self, now: float | None = None) -> None:
+        minute = int((monotonic() if now is None else now) // 60)
+        self.total += 1
+        if self._buckets and self._buckets[-1][0] == minute:
+            self._buckets[-1][1] += 1
+        else:
+            self._buckets.append([minute, 1])
+        self._prune(minute)
+
+    def _prune(self, minute: int) -> None:
+        oldest = minute - max(RATE_WINDOWS.values())
+        while self._buckets and self._buckets[0][0] <= oldest:
+            self._buckets.popleft()
+
+    def as_diagnostics(self, now: float | None = None) -> dict[str, Any]:
+        minute = int((monotonic() if now is None else now) // 60)
+        self._prune(minute)
+        result: dict[str, Any] = {"total": self.total}
+        for name, minutes in RATE_WINDOWS.items():
+            count = sum(n for bucket_minute, n in self._buckets if bucket_minute > minute - minutes)
+            result[f"last_{name}"] = count
+            result[f"per_minute_{name}"] = round(count / minutes, 3)
+        return result
+
+
+def _percentiles(values: deque[float]) -> dict[str, Any]:
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0, "p50": None, "p95": None, "max": None}
+
+    def nearest_rank(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {"count": len(ordered), "p50": nearest_rank(0.5), "p95": nearest_rank(0.95), "max": round(ordered[-1], 3)}
+
+
+class RefreshStats:
+    __slots__ = (
+        "_stages_ms",
+        "_total_ms",
+        "_window",
+        "commands",
+        "refreshes",
+        "refreshes_without_command",
+        "sources",
+        "triggers",
+    )
+
+    _window: int
+    _total_ms: deque[float]
+    _stages_ms: dict[str, deque[float]]
+
+    def __init__(self, window: int = DEFAULT_TIMING_WINDOW) -> None:
+        self._window = window
+        self._total_ms = deque(maxlen=window)
+        self._stages_ms = {}
+        self.triggers: Counter[RefreshTrigger] = Counter()
+        self.refreshes = EventRate()
+        self.refreshes_without_command = EventRate()
+        # Keyed by the entity_id whose state change came in, and by the cover that was commanded.
+        self.sources: dict[str, EventRate] = {}
+        self.commands: dict[str, EventRate] = {}
+
+    def record(self, trigger: RefreshTrigger, timer: StageTimer) -> None:
+        self.triggers[trigger] += 1
+        self.refreshes.add()
+        self._total_ms.append(timer.elapsed_ms())
+        for stage, duration in timer.durations_ms.items():
+            self._stages_ms.setdefault(stage, deque(maxlen=self._window)).append(duration)
+
+    def record_source(self, entity_id: str) -> None:
+        self.sources.setdefault(entity_id, EventRate()).add()
+
+    def record_command(self, entity_id: str) -> None:
+        self.commands.setdefault(entity_id, EventRate()).add()
+
+    def retain(self, sources: Iterable[str], commands: Iterable[str]) -> None:
+        """Drop the counters of entities that are no longer configured."""
+        keep = set(sources)
+        for entity_id in [e for e in self.sources if e not in keep]:
+            del self.sources[entity_id]
+        keep = set(commands)
+        for entity_id in [e for e in self.commands if e not in keep]:
+            del self.commands[entity_id]
+
+    def record_without_command(self) -> None:
+        self.refreshes_without_command.add()
+
+    def total(self) -> dict[str, Any]:
+        return _percentiles(self._total_ms)
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        return {
+            "refreshes_by_trigger": {str(trigger): count for trigger, count in self.triggers.items()},
+            "total_ms": self.total(),
+            "stages_ms": {stage: _percentiles(durations) for stage, durations in self._stages_ms.items()},
+            "refreshes": self.refreshes.as_diagnostics(),
+            "refreshes_without_command": self.refreshes_without_command.as_diagnostics(),
+            # Busiest first, which is what you want when looking for something to debounce.
+            "sources": {
+                entity_id: rate.as_diagnostics()
+                for entity_id, rate in sorted(self.sources.items(), key=lambda item: -item[1].total)
+            },
+            "commands": {entity_id: rate.as_diagnostics() for entity_id, rate in sorted(self.commands.items())},
+        }
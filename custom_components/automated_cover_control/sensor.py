@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -9,31 +9,27 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.device_registry import DeviceEntryType
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .coordinator import AutomatedCoverControlDataUpdateCoordinator
+from .entity import AutomatedCoverControlEntity
 from .why import CoverControlReason
 
+if TYPE_CHECKING:
+    from .coordinator import AutomatedCoverControlDataUpdateCoordinator
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    name = config_entry.data["name"]
     coordinator: AutomatedCoverControlDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     sun_in_window_start = TimeSensorEntity(
         unique_id=config_entry.entry_id,
-        hass=hass,
-        config_entry=config_entry,
-        name=name,
         sensor_name="Sun in Window Start",
         key="sun_in_window_start",
         icon="mdi:sun-clock-outline",
@@ -41,25 +37,23 @@ async def async_setup_entry(
     )
     sun_in_window_end = TimeSensorEntity(
         unique_id=config_entry.entry_id,
-        hass=hass,
-        config_entry=config_entry,
-        name=name,
         sensor_name="Sun in Window End",
         key="sun_in_window_end",
         icon="mdi:sun-clock",
         coordinator=coordinator,
     )
-    cover_position = CoverPositionSensorEntity(
-        unique_id=config_entry.entry_id, hass=hass, config_entry=config_entry, name=name, coordinator=coordinator
-    )
-    cover_state = CoverStateSensorEntity(
-        unique_id=config_entry.entry_id, hass=hass, config_entry=config_entry, name=name, coordinator=coordinator
-    )
+    cover_position = CoverPositionSensorEntity(unique_id=config_entry.entry_id, coordinator=coordinator)
+    cover_state = CoverStateSensorEntity(unique_id=config_entry.entry_id, coordinator=coordinator)
 
-    async_add_entities([sun_in_window_start, sun_in_window_end, cover_position, cover_state])
+    refresh_duration = RefreshDurationSensorEntity(unique_id=config_entry.entry_id, coordinator=coordinator)
+    refresh_count = RefreshCountSensorEntity(unique_id=config_entry.entry_id, coordinator=coordinator)
+
+    async_add_entities(
+        [sun_in_window_start, sun_in_window_end, cover_position, cover_state, refresh_duration, refresh_count]
+    )
 
 
-class TimeSensorEntity(CoordinatorEntity[AutomatedCoverControlDataUpdateCoordinator], SensorEntity):
+class TimeSensorEntity(AutomatedCoverControlEntity, SensorEntity):
     _attr_device_class = SensorDeviceClass.TIMESTAMP
     _attr_has_entity_name = True
     _attr_should_poll = False
@@ -68,9 +62,6 @@ class TimeSensorEntity(CoordinatorEntity[AutomatedCoverControlDataUpdateCoordina
     def __init__(
         self,
         unique_id: str,
-        hass,
-        config_entry,
-        name: str,
         sensor_name: str,
         key: str,
         icon: str,
@@ -80,39 +71,17 @@ class TimeSensorEntity(CoordinatorEntity[AutomatedCoverControlDataUpdateCoordina
 
         self._attr_icon = icon
         self.key = key
-        self.coordinator = coordinator
-        self.data = self.coordinator.data
+        self._coordinator_keys = (key,)
         self._attr_unique_id = f"{unique_id}_{key}"
-        self._device_id = unique_id
-        self.hass = hass
-        self.config_entry = config_entry
-        self._name = name
-        self._sensor_name = sensor_name
-        self._device_name = f"{self._name} Automated Cover Control"
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self.data = self.coordinator.data
-        self.async_write_ha_state()
-
-    @property
-    def name(self):
-        return f"{self._sensor_name}"
+        self._attr_name = sensor_name
 
     @property
     def native_value(self) -> str | None:
-        return self.data.states[self.key]
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            entry_type=DeviceEntryType.SERVICE,
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-        )
+        return getattr(self.coordinator.data, self.key)
 
 
-class CoverStateSensorEntity(CoordinatorEntity[AutomatedCoverControlDataUpdateCoordinator], SensorEntity):
+class CoverStateSensorEntity(AutomatedCoverControlEntity, SensorEntity):
+    _attr_name = "State"
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_state_class = None
     _attr_icon = "mdi:sun-compass"
@@ -120,102 +89,110 @@ class CoverStateSensorEntity(CoordinatorEntity[AutomatedCoverControlDataUpdateCo
     _attr_should_poll = False
     _attr_entity_registry_visible_default = False
     _attr_options = [e.value for e in CoverControlReason]
+    _coordinator_keys = ("reason", "tweaks", "covers")
 
     def __init__(
         self,
         unique_id: str,
-        hass,
-        config_entry,
-        name: str,
         coordinator: AutomatedCoverControlDataUpdateCoordinator,
     ) -> None:
         super().__init__(coordinator=coordinator)
 
-        self.coordinator = coordinator
-        self.data = self.coordinator.data
-        self._sensor_name = "State"
         self._attr_unique_id = f"{unique_id}_state"
-        self.hass = hass
-        self.config_entry = config_entry
-        self._name = name
-        self._device_name = f"{self._name} Automated Cover Control"
-        self._device_id = unique_id
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self.data = self.coordinator.data
-        self.async_write_ha_state()
-
-    @property
-    def name(self):
-        return f"{self._sensor_name}"
 
     @property
     def native_value(self) -> str | None:
-        return self.data.states["reason"]
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            entry_type=DeviceEntryType.SERVICE,
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-        )
+        return self.coordinator.data.reason
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        # Recorded with every state row, so only the small, frequently-changing bits live here; the (static)
+        # configuration is available through diagnostics instead. Sorted so equal content compares equal.
         return {
-            "config": self.data.attributes,
-            "tweaks": self.data.states.get("tweaks", []),
-            "per_cover_reasons": self.data.states.get("per_cover_reasons", {}),
+            "tweaks": sorted(self.coordinator.data.tweaks),
+            "per_cover_reasons": dict(sorted(self.coordinator.data.per_cover_reasons.items())),
         }
 
 
-class CoverPositionSensorEntity(CoordinatorEntity[AutomatedCoverControlDataUpdateCoordinator], SensorEntity):
+class CoverPositionSensorEntity(AutomatedCoverControlEntity, SensorEntity):
+    _attr_name = "Target Cover Position"
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_icon = "mdi:sun-compass"
     _attr_has_entity_name = True
     _attr_should_poll = False
     _attr_entity_registry_visible_default = False
+    _coordinator_keys = ("target_position",)
 
     def __init__(
         self,
         unique_id: str,
-        hass,
-        config_entry,
-        name: str,
         coordinator: AutomatedCoverControlDataUpdateCoordinator,
     ) -> None:
         super().__init__(coordinator=coordinator)
 
-        self.coordinator = coordinator
-        self.data = self.coordinator.data
-        self._sensor_name = "Target Cover Position"
         self._attr_unique_id = f"{unique_id}_target_cover_position"
-        self.hass = hass
-        self.config_entry = config_entry
-        self._name = name
-        self._device_name = f"{self._name} Automated Cover Control"
-        self._device_id = unique_id
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self.data = self.coordinator.data
-        self.async_write_ha_state()
+    @property
+    def native_value(self) -> str | None:
+        return self.coordinator.data.target_position
+
+
+class RefreshDurationSensorEntity(AutomatedCoverControlEntity, SensorEntity):
+    _attr_name = "Refresh Duration"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    # Timings change on every refresh, even when the data doesn't.
+    _coordinator_keys = None
+
+    def __init__(
+        self,
+        unique_id: str,
+        coordinator: AutomatedCoverControlDataUpdateCoordinator,
+    ) -> None:
+        super().__init__(coordinator=coordinator)
+
+        self._attr_unique_id = f"{unique_id}_refresh_duration"
 
     @property
-    def name(self):
-        return f"{self._sensor_name}"
+    def native_value(self) -> float | None:
+        return self.coordinator.refresh_stats.total()["p95"]
 
     @property
-    def native_value(self) -> str | None:
-        return self.data.states.get("target_position", None)
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        total = self.coordinator.refresh_stats.total()
+        return {"p50": total["p50"], "max": total["max"], "samples": total["count"]}
+
+
+class RefreshCountSensorEntity(AutomatedCoverControlEntity, SensorEntity):
+    _attr_name = "Refresh Count"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:counter"
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _coordinator_keys = None
+
+    def __init__(
+        self,
+        unique_id: str,
+        coordinator: AutomatedCoverControlDataUpdateCoordinator,
+    ) -> None:
+        super().__init__(coordinator=coordinator)
+
+        self._attr_unique_id = f"{unique_id}_refresh_count"
 
     @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            entry_type=DeviceEntryType.SERVICE,
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-        )
+    def native_value(self) -> int:
+        return self.coordinator.refresh_stats.triggers.total()
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        return {str(trigger): count for trigger, count in sorted(self.coordinator.refresh_stats.triggers.items())}
@@ -0,0 +1,57 @@
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DAYS,
+    ATTR_OPTIONS,
+    DEFAULT_BACKTEST_DAYS,
+    DOMAIN,
+    MAX_BACKTEST_DAYS,
+    SERVICE_BACKTEST,
+)
+
+BACKTEST_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DAYS, default=DEFAULT_BACKTEST_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_BACKTEST_DAYS)
+        ),
+        vol.Optional(ATTR_OPTIONS, default={}): dict,
+    }
+)
+
+
+async def _async_backtest(call: ServiceCall) -> ServiceResponse:
+    hass = call.hass
+    if "recorder" not in hass.config.components:
+        raise ServiceValidationError("Backtesting needs the recorder integration")
+
+    entries = hass.config_entries.async_entries(DOMAIN)
+    if ATTR_CONFIG_ENTRY_ID in call.data:
+        requested = call.data[ATTR_CONFIG_ENTRY_ID]
+        unknown = set(requested) - {entry.entry_id for entry in entries}
+        if unknown:
+            raise ServiceValidationError(f"Unknown config entries: {', '.join(sorted(unknown))}")
+        entries = [entry for entry in entries if entry.entry_id in requested]
+
+    # Pulls in numpy and the simulator, which nothing else needs; only pay for that when a backtest runs.
+    from .backtest import async_backtest
+
+    summaries = await async_backtest(hass, entries, call.data[ATTR_DAYS], call.data[ATTR_OPTIONS])
+    return {
+        "days": call.data[ATTR_DAYS],
+        "entries": {entry.entry_id: {"title": entry.title, **summaries[entry.entry_id].as_dict()} for entry in entries},
+    }
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKTEST,
+        _async_backtest,
+        schema=BACKTEST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,80 @@
+"""Fixed shading of a window: an overhang or balcony above it, fins beside it, and the depth of its reveal.
+
+The shadow of anything horizontal above the window (an overhang, or the top of the reveal) only depends on the sun's
+vertical shadow angle, and the shadow of anything vertical beside it (fins, or the sides of the reveal) only on its
+horizontal angle to the window (gamma); both grow linearly with the tangent of that angle. So a window's geometry is
+reduced to a few coefficients once, when its configuration is read, and checking it is a handful of multiplications.
+"""
+
+import math
+from typing import Any
+
+
+class WindowShading:
+    __slots__ = ("_offset", "_overhang", "_reveal", "_sides", "source")
+
+    def __init__(
+        self,
+        window_height: float,
+        window_width: float = 0.0,
+        overhang_depth: float = 0.0,
+        overhang_offset: float = 0.0,
+        fin_depth: float = 0.0,
+        reveal_depth: float = 0.0,
+    ) -> None:
+        """All in metres; depths are measured from the glass, the offset from the top of the window up.
+
+        Without a window width, fins (and the sides of the reveal) are ignored.
+        """
+        if window_height <= 0:
+            raise ValueError(f"window height ({window_height}) must be positive")
+        # What the shading was built from, so the configuration only rebuilds it when that changes.
+        self.source = (window_height, window_width, overhang_depth, overhang_offset, fin_depth, reveal_depth)
+        # Everything as a fraction of the window's height (or width, for the sides).
+        self._overhang = overhang_depth / window_height
+        self._offset = overhang_offset / window_height
+        self._reveal = reveal_depth / window_height
+        # The sun only ever comes from one side, so only the deeper of the fin and the reveal on that side counts.
+        self._sides = max(fin_depth, reveal_depth) / window_width if window_width > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return "WindowShading(height={}, width={}, overhang={}@{}, fins={}, reveal={})".format(*self.source)
+
+    def _lit_height(self, gamma: float, elevation: float) -> float:
+        # How far a shadow drops per metre of horizontal projection.
+        drop = math.tan(math.radians(elevation)) / math.cos(math.radians(gamma))
+        return 1 - min(max(self._overhang * drop - self._offset, self._reveal * drop, 0.0), 1.0)
+
+    def _lit_width(self, gamma: float) -> float:
+        return 1 - min(self._sides * abs(math.tan(math.radians(gamma))), 1.0)
+
+    def sunlit_fraction(self, gamma: float, elevation: float) -> float:
+        """Fraction of the window's area the sun shines on directly."""
+        if abs(gamma) >= 90:
+            return 0.0
+        return self._lit_height(gamma, elevation) * self._lit_width(gamma)
+
+    def percentage(self, gamma: float, elevation: float, percentage: float) -> float:
+        """Cover percentage, given the one for an unshaded window, once the shading is accounted for.
+
+        Only the sunlit part of the window lets the sun into the room; if that's all below where the cover would come
+        down to, the cover can stay open.
+        """
+        if abs(gamma) >= 90:
+            return percentage
+        if self._lit_width(gamma) <= 0 or self._lit_height(gamma, elevation) * 100 <= percentage:
+            return 100.0
+        return percentage
+
+    def percentages(self, gamma: Any, elevation: Any, percentage: Any) -> Any:
+        """Array version of percentage(), for the batch calculation and position tables."""
+        # numpy isn't needed by the live calculation; keep it out of the integration's import.
+        import numpy as np
+
+        gamma = np.radians(gamma)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drop = np.tan(np.radians(elevation)) / np.cos(gamma)
+            lit_height = 1 - np.clip(np.maximum(self._overhang * drop - self._offset, self._reveal * drop), 0, 1)
+            lit_width = 1 - np.minimum(self._sides * np.abs(np.tan(gamma)), 1)
+        in_front = np.abs(gamma) < math.pi / 2
+        return np.where(in_front & ((lit_width <= 0) | (lit_height * 100 <= percentage)), 100.0, percentage)
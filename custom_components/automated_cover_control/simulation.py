@@ -0,0 +1,452 @@
+"""Offline replay of the coordinator's decisions over a date range, without running Home Assistant.
+
+The sun track for a location is computed once (see build_solar_track) and can be shared by any number of config
+entries. simulate() evaluates every step of the track with the batch calculation, then walks the points where the
+target changes to apply the coordinator's per-cover rules (control time range, end-time return to default, time
+threshold, minimum change). Covers are assumed to reach their target immediately and are never adjusted by hand.
+
+Usage:
+
+    python -m custom_components.automated_cover_control.simulation --options options.json \\
+        --latitude 37.8 --longitude -122.46 --time-zone America/Los_Angeles \\
+        --start 2025-06-01 --end 2025-06-30 [--history history.csv ...]
+
+History files use the layout of Home Assistant's history CSV export (entity_id, state, last_changed). The resulting
+commands are written to stdout as CSV.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import astral.location
+import numpy as np
+from dateutil import parser
+
+from .batch_calculation import (
+    REASONS,
+    SensorPredicates,
+    SunPositions,
+    SunTrackingVerticalCoverPositions,
+    calculate_sun_tracking_vertical_cover_positions,
+)
+from .calculation import (
+    is_lux_state_above_threshold,
+    is_presence_state_detected,
+    is_weather_state_matched,
+    is_window_state_open,
+)
+from .config import AutomationConfiguration, BlindSpotConfiguration, SensorConfiguration, WindowConfiguration
+from .position_table import PositionTable
+from .solar_position import solar_azimuth_and_elevation
+from .tilt import open_tilt_percentage
+from .util import midnight_to_end_of_day
+from .why import CoverControlReason, CoverControlTweaks
+
+DEFAULT_SIMULATION_STEP = timedelta(minutes=1)
+
+# A state recorded at a point in time, e.g. a row of the recorder's history.
+HistorySample = tuple[datetime, str]
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationLocation:
+    latitude: float
+    longitude: float
+    time_zone: str
+
+
+@dataclass
+class SolarTrack:
+    location: SimulationLocation
+    step: timedelta
+    # Step times (UTC datetime64[s]) and the sun as sun.sun would have reported it at each of them.
+    times: np.ndarray
+    solar_azimuth: np.ndarray
+    solar_elevation: np.ndarray
+    # Local date of each step, as an index into days.
+    day_index: np.ndarray
+    days: list[date]
+    # Per day; NaT where the sun doesn't rise or set.
+    sunrise: np.ndarray
+    sunset: np.ndarray
+
+
+@dataclass(frozen=True, slots=True)
+class SimulatedCommand:
+    time: datetime
+    entity_id: str
+    position: int
+    reason: CoverControlReason
+    tweaks: tuple[CoverControlTweaks, ...] = ()
+    tilt: int | None = None
+
+
+@dataclass
+class SimulationResult:
+    track: SolarTrack
+    # Batch calculation output for every step, before inversion and regardless of the control time range.
+    calculated: SunTrackingVerticalCoverPositions
+    within_control_time_range: np.ndarray
+    entities: tuple[str, ...]
+    inverted: bool
+    # Every cover in the entry gets the same commands, so they're kept once, column-wise: the step each command was
+    # issued at, the position it sent, and whether it was the end-time return to default.
+    command_steps: np.ndarray
+    command_positions: np.ndarray
+    command_at_end_time: np.ndarray
+    # The slat tilt sent alongside each position, if slat tilt is enabled.
+    command_tilts: np.ndarray | None = None
+
+    @property
+    def command_times(self) -> np.ndarray:
+        return self.track.times[self.command_steps]
+
+    def commands(self) -> list[SimulatedCommand]:
+        steps = self.command_steps
+        reasons = [REASONS[code] for code in self.calculated.reason_code[steps].tolist()]
+        tweak_masks = [(tweak, mask[steps].tolist()) for tweak, mask in self.calculated.tweaks.items()]
+        inverted = (CoverControlTweaks.INVERTED,) if self.inverted else ()
+        tilts = self.command_tilts.tolist() if self.command_tilts is not None else [None] * len(steps)
+        commands = []
+        for index, (when, position, tilt, at_end_time) in enumerate(
+            zip(
+                self.command_times.tolist(),
+                self.command_positions.tolist(),
+                tilts,
+                self.command_at_end_time.tolist(),
+                strict=True,
+            )
+        ):
+            if at_end_time:
+                reason, tweaks = CoverControlReason.END_TIME_REACHED, inverted
+            else:
+                reason = reasons[index]
+                tweaks = (*(tweak for tweak, mask in tweak_masks if mask[index]), *inverted)
+            when = when.replace(tzinfo=UTC)
+            commands.extend(
+                SimulatedCommand(when, entity_id, position, reason, tweaks, tilt) for entity_id in self.entities
+            )
+        return commands
+
+    def positions(self, initial_position: int | None = None) -> np.ndarray:
+        """Position of the covers at every step (-1 while unknown)."""
+        values = np.concatenate(([-1 if initial_position is None else initial_position], self.command_positions))
+        return values[np.searchsorted(self.command_steps, np.arange(len(self.track.times)), side="right")]
+
+
+def utc_datetime64(value: datetime) -> np.datetime64:
+    return np.datetime64(value.astimezone(UTC).replace(tzinfo=None), "s")
+
+
+def build_solar_track(
+    location: SimulationLocation, start: date, end: date, step: timedelta = DEFAULT_SIMULATION_STEP
+) -> SolarTrack:
+    """Sun positions for every step from local midnight on start through the end of the local day on end."""
+    zone = ZoneInfo(location.time_zone)
+    days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    midnights = np.array([utc_datetime64(datetime.combine(day, time.min, zone)) for day in days], dtype="datetime64[s]")
+    end_of_range = utc_datetime64(datetime.combine(end + timedelta(days=1), time.min, zone))
+    times = np.arange(midnights[0], end_of_range, np.timedelta64(step), dtype="datetime64[s]")
+    solar_azimuth, solar_elevation = solar_azimuth_and_elevation(times, location.latitude, location.longitude)
+
+    # Same source (and observer elevation) the coordinator uses for sunrise/sunset.
+    astral_location = astral.location.Location(
+        astral.location.LocationInfo("", "", location.time_zone, location.latitude, location.longitude)
+    )
+
+    def _sun_event(event, day: date) -> np.datetime64:
+        try:
+            return utc_datetime64(event(day, local=False))
+        except ValueError:
+            return np.datetime64("NaT", "s")
+
+    return SolarTrack(
+        location=location,
+        step=step,
+        times=times,
+        solar_azimuth=solar_azimuth,
+        solar_elevation=solar_elevation,
+        day_index=np.searchsorted(midnights, times, side="right") - 1,
+        days=days,
+        sunrise=np.array([_sun_event(astral_location.sunrise, day) for day in days], dtype="datetime64[s]"),
+        sunset=np.array([_sun_event(astral_location.sunset, day) for day in days], dtype="datetime64[s]"),
+    )
+
+
+def _resample_history(
+    track: SolarTrack, samples: Sequence[HistorySample], interpret: Any, unknown_value: bool
+) -> np.ndarray:
+    # Holds each state until the next one; steps before the first sample see an unknown state.
+    samples = sorted(samples, key=lambda sample: sample[0])
+    sample_times = np.array([utc_datetime64(when) for when, _ in samples], dtype="datetime64[s]")
+    values = np.array(
+        [unknown_value]
+        + [unknown_value if state in ("unknown", "unavailable") else interpret(state) for _, state in samples]
+    )
+    return values[np.searchsorted(sample_times, track.times, side="right")]
+
+
+def _sensor_predicates(
+    track: SolarTrack, sensor_config: SensorConfiguration, histories: Mapping[str, Sequence[HistorySample]]
+) -> SensorPredicates:
+    predicates = SensorPredicates()
+    if (entity_id := sensor_config.window_sensor_entity) in histories:
+        predicates.window_open = _resample_history(track, histories[entity_id], is_window_state_open, False)
+    if (entity_id := sensor_config.presence_entity) in histories:
+        predicates.presence_detected = _resample_history(
+            track, histories[entity_id], lambda state: is_presence_state_detected(entity_id, state), True
+        )
+    if (entity_id := sensor_config.lux_entity) in histories and sensor_config.lux_threshold is not None:
+        threshold = sensor_config.lux_threshold
+        predicates.lux_above_threshold = _resample_history(
+            track, histories[entity_id], lambda state: is_lux_state_above_threshold(state, threshold), True
+        )
+    if (entity_id := sensor_config.weather_entity) in histories and sensor_config.weather_condition is not None:
+        conditions = sensor_config.weather_condition
+        predicates.sunny = _resample_history(
+            track,
+            histories[entity_id],
+            lambda state: is_weather_state_matched(state, conditions),
+            is_weather_state_matched(None, conditions),
+        )
+    return predicates
+
+
+def _daily_times(track: SolarTrack, value: Any, end_of_day: bool) -> np.ndarray | None:
+    if value is None:
+        return None
+    local_time = parser.parse(str(value), ignoretz=True).time()
+    if end_of_day:
+        local_time = midnight_to_end_of_day(local_time)
+    zone = ZoneInfo(track.location.time_zone)
+    return np.array(
+        [utc_datetime64(datetime.combine(day, local_time, zone)) for day in track.days], dtype="datetime64[s]"
+    )
+
+
+def simulate(
+    options: Mapping[str, Any],
+    track: SolarTrack,
+    histories: Mapping[str, Sequence[HistorySample]] | None = None,
+    initial_position: int | None = None,
+    position_table_resolution: float | None = None,
+) -> SimulationResult:
+    """Replays a config entry's options over the track, returning the cover commands the coordinator would issue."""
+    options = MappingProxyType(dict(options))
+    automation_config = AutomationConfiguration()
+    automation_config.read(options)
+    blind_spot_config = BlindSpotConfiguration()
+    blind_spot_config.read(options)
+    sensor_config = SensorConfiguration()
+    sensor_config.read(options)
+    window_config = WindowConfiguration()
+    window_config.read(options)
+
+    calculated = calculate_sun_tracking_vertical_cover_positions(
+        SunPositions(
+            solar_azimuth=track.solar_azimuth,
+            solar_elevation=track.solar_elevation,
+            sunrise=track.sunrise[track.day_index],
+            sunset=track.sunset[track.day_index],
+            now=track.times,
+        ),
+        automation_config,
+        blind_spot_config,
+        window_config,
+        _sensor_predicates(track, sensor_config, histories or {}),
+        PositionTable(window_config, position_table_resolution) if position_table_resolution is not None else None,
+    )
+    target = calculated.target_position
+    if automation_config.invert:
+        target = 100 - target
+    target_tilt = calculated.target_tilt
+
+    # Start/end times only come from the static options; *_time_entity values aren't known offline.
+    within_range = np.ones(len(track.times), dtype=bool)
+    start_times = _daily_times(track, automation_config.start_time, end_of_day=False)
+    if start_times is not None:
+        within_range &= track.times >= start_times[track.day_index]
+    end_times = _daily_times(track, automation_config.end_time, end_of_day=True)
+    if end_times is not None:
+        within_range &= track.times < end_times[track.day_index]
+
+    # The end-time trigger forces the covers to the after-sunset position at the first step past each end time.
+    forced_steps: set[int] = set()
+    if end_times is not None and automation_config.return_to_default_at_end_time:
+        forced_steps = {
+            int(step) for step in np.searchsorted(track.times, end_times, side="left") if step < len(track.times)
+        }
+    end_time_position = automation_config.before_sunrise_or_after_sunset_cover_position
+    if automation_config.invert:
+        end_time_position = 100 - end_time_position
+    end_time_tilt = round(open_tilt_percentage(automation_config.tilt_range)) if target_tilt is not None else None
+
+    # Between change points the target (and whether we're in range) is constant, so those are the only steps that
+    # need visiting, plus one retry when the time threshold holds a change back.
+    effective = np.where(within_range, target, -1)
+    change_points = np.flatnonzero(np.diff(effective)) + 1
+    if target_tilt is not None:
+        change_points = np.union1d(change_points, np.flatnonzero(np.diff(np.where(within_range, target_tilt, -1))) + 1)
+    visits = sorted({0, *change_points.tolist(), *forced_steps})
+    seconds = track.times.astype(np.int64)
+    # Plain Python values for the visited steps; the loop below is the only per-step Python code.
+    visit_seconds = seconds[visits].tolist()
+    visit_targets = target[visits].tolist()
+    visit_tilts = target_tilt[visits].tolist() if target_tilt is not None else [None] * len(visits)
+    visit_within_range = within_range[visits].tolist()
+    minimum_change_time = int(np.ceil(automation_config.minimum_change_time.total_seconds()))
+    minimum_change_percentage = automation_config.minimum_change_percentage
+    if automation_config.invert:
+        override_positions = {
+            0,
+            100,
+            100 - automation_config.default_cover_position,
+            100 - automation_config.before_sunrise_or_after_sunset_cover_position,
+        }
+    else:
+        override_positions = {
+            0,
+            100,
+            automation_config.default_cover_position,
+            automation_config.before_sunrise_or_after_sunset_cover_position,
+        }
+
+    def _is_already_at_position(position: int | None, target_position: int) -> bool:
+        if position is None:
+            return False
+        if position == target_position:
+            return True
+        if target_position in override_positions:
+            return False
+        return abs(position - target_position) < minimum_change_percentage
+
+    def _is_already_at_tilt(tilt: int | None, target_tilt: int | None) -> bool:
+        if target_tilt is None:
+            return True
+        if tilt is None:
+            return False
+        return tilt == target_tilt or abs(tilt - target_tilt) < minimum_change_percentage
+
+    command_steps: list[int] = []
+    command_positions: list[int] = []
+    command_tilts: list[int | None] = []
+    position, tilt, last_command = initial_position, None, visit_seconds[0] - minimum_change_time
+    for n, step in enumerate(visits):
+        if step in forced_steps:
+            if not _is_already_at_position(position, end_time_position) or not _is_already_at_tilt(tilt, end_time_tilt):
+                command_steps.append(step)
+                command_positions.append(end_time_position)
+                command_tilts.append(end_time_tilt)
+                position, tilt, last_command = end_time_position, end_time_tilt, visit_seconds[n]
+            continue
+        if not visit_within_range[n]:
+            continue
+        target_position = visit_targets[n]
+        target_tilt_position = visit_tilts[n]
+        now = visit_seconds[n]
+        if now - last_command < minimum_change_time:
+            if position == target_position and tilt == target_tilt_position:
+                continue
+            step = int(np.searchsorted(seconds, last_command + minimum_change_time, side="left"))
+            if step >= (visits[n + 1] if n + 1 < len(visits) else len(seconds)):
+                continue
+            now = int(seconds[step])
+        if not _is_already_at_position(position, target_position) or not _is_already_at_tilt(
+            tilt, target_tilt_position
+        ):
+            command_steps.append(step)
+            command_positions.append(target_position)
+            command_tilts.append(target_tilt_position)
+            position, tilt, last_command = target_position, target_tilt_position, now
+
+    steps = np.array(command_steps, dtype=np.int64)
+    return SimulationResult(
+        track=track,
+        calculated=calculated,
+        within_control_time_range=within_range,
+        entities=tuple(automation_config.entities),
+        inverted=automation_config.invert,
+        command_steps=steps,
+        command_positions=np.array(command_positions, dtype=np.int64),
+        command_at_end_time=np.isin(steps, list(forced_steps)),
+        command_tilts=np.array(command_tilts, dtype=np.int64) if target_tilt is not None else None,
+    )
+
+
+def read_history_csv(path: Path) -> dict[str, list[HistorySample]]:
+    """Reads a history export (entity_id, state, last_changed columns) into per-entity samples."""
+    histories: dict[str, list[HistorySample]] = {}
+    with path.open(newline="") as file:
+        for row in csv.DictReader(file):
+            when = datetime.fromisoformat(row["last_changed"])
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=UTC)
+            histories.setdefault(row["entity_id"], []).append((when, row["state"]))
+    return histories
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--options", type=Path, required=True, help="JSON file with the config entry's options")
+    arg_parser.add_argument("--latitude", type=float, required=True)
+    arg_parser.add_argument("--longitude", type=float, required=True)
+    arg_parser.add_argument("--time-zone", required=True)
+    arg_parser.add_argument("--start", type=date.fromisoformat, required=True)
+    arg_parser.add_argument("--end", type=date.fromisoformat, required=True)
+    arg_parser.add_argument("--step-minutes", type=int, default=1)
+    arg_parser.add_argument("--history", type=Path, action="append", default=[], help="history CSV export")
+    arg_parser.add_argument(
+        "--position-table-resolution",
+        type=float,
+        help="interpolate positions from a precomputed table at this resolution (degrees) instead of computing each",
+    )
+    args = arg_parser.parse_args(argv)
+
+    histories: dict[str, list[HistorySample]] = {}
+    for path in args.history:
+        for entity_id, samples in read_history_csv(path).items():
+            histories.setdefault(entity_id, []).extend(samples)
+
+    track = build_solar_track(
+        SimulationLocation(args.latitude, args.longitude, args.time_zone),
+        args.start,
+        args.end,
+        timedelta(minutes=args.step_minutes),
+    )
+    result = simulate(
+        json.loads(args.options.read_text()),
+        track,
+        histories,
+        position_table_resolution=args.position_table_resolution,
+    )
+
+    writer = csv.writer(sys.stdout)
+    # The tilt column is only there for venetian blinds, so roller-cover output stays as it was.
+    tilt = result.command_tilts is not None
+    writer.writerow(["time", "entity_id", "position", *(["tilt"] if tilt else []), "reason", "tweaks"])
+    for command in result.commands():
+        writer.writerow(
+            [
+                command.time.isoformat(),
+                command.entity_id,
+                command.position,
+                *([command.tilt] if tilt else []),
+                command.reason,
+                " ".join(command.tweaks),
+            ]
+        )
+
+
+if __name__ == "__main__":
+    main()
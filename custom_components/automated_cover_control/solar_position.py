@@ -0,0 +1,90 @@
+"""Vectorized solar position, for evaluating many points in time at once.
+
+This is a NumPy port of astral.sun.zenith_and_azimuth (the NOAA algorithm, with refraction), which is what
+Home Assistant's sun.sun azimuth/elevation attributes come from; see test_solar_position.py for the agreement.
+"""
+
+import numpy as np
+
+_SECONDS_PER_DAY = 86400.0
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+
+def _julian_century(timestamps: np.ndarray) -> np.ndarray:
+    seconds = timestamps.astype("datetime64[s]").astype(np.float64)
+    return (seconds / _SECONDS_PER_DAY + _UNIX_EPOCH_JULIAN_DAY - 2451545.0) / 36525.0
+
+
+def _declination_and_equation_of_time(t: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    l0 = (280.46646 + t * (36000.76983 + 0.0003032 * t)) % 360.0
+    m = 357.52911 + t * (35999.05029 - 0.0001537 * t)
+    e = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+
+    mrad = np.radians(m)
+    c = (
+        np.sin(mrad) * (1.914602 - t * (0.004817 + 0.000014 * t))
+        + np.sin(2 * mrad) * (0.019993 - 0.000101 * t)
+        + np.sin(3 * mrad) * 0.000289
+    )
+    omega = np.radians(125.04 - 1934.136 * t)
+    apparent_longitude = np.radians(l0 + c - 0.00569 - 0.00478 * np.sin(omega))
+
+    seconds = 21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))
+    obliquity = np.radians(23.0 + (26.0 + seconds / 60.0) / 60.0 + 0.00256 * np.cos(omega))
+    declination = np.arcsin(np.sin(obliquity) * np.sin(apparent_longitude))
+
+    y = np.tan(obliquity / 2.0) ** 2
+    l0rad = np.radians(l0)
+    equation_of_time = 4.0 * np.degrees(
+        y * np.sin(2.0 * l0rad)
+        - 2.0 * e * np.sin(mrad)
+        + 4.0 * e * y * np.sin(mrad) * np.cos(2.0 * l0rad)
+        - 0.5 * y * y * np.sin(4.0 * l0rad)
+        - 1.25 * e * e * np.sin(2.0 * mrad)
+    )
+    return declination, equation_of_time
+
+
+def _refraction(elevation: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        te = np.tan(np.radians(elevation))
+        correction = np.select(
+            [elevation >= 85.0, elevation > 5.0, elevation > -0.575],
+            [
+                0.0,
+                58.1 / te - 0.07 / te**3 + 0.000086 / te**5,
+                1735.0 + elevation * (-518.2 + elevation * (103.4 + elevation * (-12.79 + elevation * 0.711))),
+            ],
+            -20.774 / te,
+        )
+    return correction / 3600.0
+
+
+def solar_azimuth_and_elevation(
+    timestamps: np.ndarray, latitude: float, longitude: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Azimuth (degrees clockwise from north) and refraction-corrected elevation for UTC datetime64 timestamps."""
+    latitude = min(max(latitude, -89.8), 89.8)
+    t = _julian_century(timestamps)
+    declination, equation_of_time = _declination_and_equation_of_time(t)
+
+    minutes_of_day = (timestamps.astype("datetime64[s]").astype(np.int64) % 86400) / 60.0
+    true_solar_time = (minutes_of_day + equation_of_time + 4.0 * longitude) % 1440.0
+    hour_angle = np.radians(true_solar_time / 4.0 - 180.0)
+
+    lat = np.radians(latitude)
+    cos_zenith = np.clip(
+        np.sin(lat) * np.sin(declination) + np.cos(lat) * np.cos(declination) * np.cos(hour_angle), -1.0, 1.0
+    )
+    zenith = np.arccos(cos_zenith)
+
+    denominator = np.cos(lat) * np.sin(zenith)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_azimuth = np.clip((np.sin(lat) * np.cos(zenith) - np.sin(declination)) / denominator, -1.0, 1.0)
+    azimuth = 180.0 - np.degrees(np.arccos(cos_azimuth))
+    azimuth = np.where(hour_angle > 0.0, -azimuth, azimuth)
+    azimuth = np.where(np.abs(denominator) > 0.001, azimuth, 180.0 if latitude > 0.0 else 0.0)
+    azimuth = np.where(azimuth < 0.0, azimuth + 360.0, azimuth)
+
+    elevation = 90.0 - np.degrees(zenith)
+    return azimuth, elevation + _refraction(elevation)
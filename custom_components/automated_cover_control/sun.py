@@ -1,36 +1,40 @@
-from datetime import datetime, time
+from datetime import UTC, datetime, time, timedelta
 
-import astral
-import pandas as pd
+import astral.location
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.sun import get_astral_location
 from homeassistant.util.dt import get_time_zone
 
-from .config import WindowConfiguration
+from .config import BlindSpotConfiguration, WindowConfiguration
+
+# Resolution of the daily solar-times scan.
+SOLAR_TIMES_STEP = timedelta(minutes=5)
 
 
 class SolarTimeCalculator:
     _hass: HomeAssistant
     _window_config: WindowConfiguration
+    _blind_spot_config: BlindSpotConfiguration
     _location: astral.location.Location
-    _elevation: astral.Elevation
 
-    def __init__(self, hass: HomeAssistant, window_config: WindowConfiguration) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window_config: WindowConfiguration,
+        blind_spot_config: BlindSpotConfiguration | None = None,
+    ) -> None:
         self._hass = hass
         self._window_config = window_config
-        self._location, self._elevation = get_astral_location(self._hass)
+        self._blind_spot_config = blind_spot_config or BlindSpotConfiguration()
+        self._location, _ = get_astral_location(self._hass)
 
-    def _get_times(self) -> pd.DatetimeIndex:
+    def _get_times(self) -> list[datetime]:
         zone = get_time_zone(self._hass.config.time_zone)
-        start_date = datetime.combine(datetime.now(zone), time.min, zone)
-        end_date = datetime.combine(datetime.now(zone), time.max, zone)
-        return pd.date_range(start=start_date, end=end_date, freq="5min", name="time")
-
-    def _get_solar_azimuths(self) -> list:
-        return [self._location.solar_azimuth(t, self._elevation) for t in self._get_times()]
-
-    def _get_solar_elevations(self) -> list:
-        return [self._location.solar_elevation(t, self._elevation) for t in self._get_times()]
+        start_date = datetime.combine(datetime.now(zone), time.min, zone).astimezone(UTC)
+        end_date = datetime.combine(datetime.now(zone), time.max, zone).astimezone(UTC)
+        # Stepping in UTC keeps the steps evenly spaced across DST changes.
+        count = (end_date - start_date) // SOLAR_TIMES_STEP + 1
+        return [(start_date + n * SOLAR_TIMES_STEP).astimezone(zone) for n in range(count)]
 
     def _azi_min_abs(self) -> int:
         return (self._window_config.window_azimuth - self._window_config.fov_left + 360) % 360
@@ -39,23 +43,30 @@ class SolarTimeCalculator:
         return (self._window_config.window_azimuth + self._window_config.fov_right + 360) % 360
 
     def get_solar_start_and_end_times(self):
-        df_today = pd.DataFrame(
-            {
-                "azimuth": self._get_solar_azimuths(),
-                "elevation": self._get_solar_elevations(),
-            }
+        # numpy is only needed once a day, in the executor; keep it out of the integration's import.
+        import numpy as np
+
+        from .solar_position import solar_azimuth_and_elevation
+
+        times = self._get_times()
+        azimuth, elevation = solar_azimuth_and_elevation(
+            np.array([int(t.timestamp()) for t in times], dtype="datetime64[s]"),
+            self._location.latitude,
+            self._location.longitude,
         )
-        solpos = df_today.set_index(self._get_times())
 
-        alpha = solpos["azimuth"]
-        frame = ((alpha - self._azi_min_abs()) % 360 <= (self._azi_max_abs() - self._azi_min_abs()) % 360) & (
-            solpos["elevation"] > 0
+        frame = ((azimuth - self._azi_min_abs()) % 360 <= (self._azi_max_abs() - self._azi_min_abs()) % 360) & (
+            elevation > 0
         )
+        if self._window_config.horizon is not None:
+            frame &= elevation >= self._window_config.horizon.minimum_elevations(azimuth)
+        blind_spots = self._blind_spot_config.index
+        if blind_spots:
+            gamma = (self._window_config.window_azimuth - azimuth + 180) % 360 - 180
+            frame &= ~blind_spots.contains_array(np.where(gamma < 0, 90 - gamma, gamma), elevation)
 
-        if solpos[frame].empty:
+        indices = np.flatnonzero(frame)
+        if len(indices) == 0:
             return None, None
 
-        return (
-            solpos[frame].index[0].to_pydatetime(),
-            solpos[frame].index[-1].to_pydatetime(),
-        )
+        return times[indices[0]], times[indices[-1]]
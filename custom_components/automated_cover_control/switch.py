@@ -1,19 +1,20 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Coroutine
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_ON
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import CONF_ENTITIES, DOMAIN
-from .coordinator import AutomatedCoverControlDataUpdateCoordinator
+from .entity import AutomatedCoverControlEntity
+
+if TYPE_CHECKING:
+    from .coordinator import AutomatedCoverControlDataUpdateCoordinator
 
 
 async def async_setup_entry(
@@ -52,7 +53,7 @@ async def async_setup_entry(
 
 
 class CoordinatorActionSwitch(
-    CoordinatorEntity[AutomatedCoverControlDataUpdateCoordinator],
+    AutomatedCoverControlEntity,
     SwitchEntity,
     RestoreEntity,
 ):
@@ -80,23 +81,13 @@ class CoordinatorActionSwitch(
         self._state: bool | None = None
         self._key = key
         self._attr_translation_key = key
-        self._device_name = f"{self._name} Automated Cover Control"
-        self._switch_name = switch_name
+        self._attr_name = switch_name
         self._attr_device_class = device_class
         self._initial_state = initial_state
         self._attr_unique_id = f"{unique_id}_{key}"
-        self._device_id = unique_id
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-        )
         self._on_turned_on = on_turned_on
         self._on_turned_off = on_turned_off
 
-    @property
-    def name(self):
-        return f"{self._switch_name}"
-
     async def async_turn_on(self, **kwargs: Any) -> None:
         self._attr_is_on = True
         if self._on_turned_on is not None and await self._on_turned_on(
@@ -0,0 +1,50 @@
+"""Slat tilt for venetian blinds: the most open the slats can be while still keeping direct sun out.
+
+Slats of depth d, spaced s apart and tilted by alpha from horizontal, stop sun coming in at the profile angle beta (the
+sun's elevation projected onto the plane perpendicular to the window) once each slat's shadow reaches the next slat
+down: d * |sin(alpha - beta)| >= s * cos(beta). Horizontal slats are the most open, so the tilt is the smallest one,
+outer edge down, that satisfies it; slats that can't block the sun at all are closed.
+
+Tilt positions are 0 for closed (outer edge down); 100 is horizontal for covers that tilt through 90 degrees, and 50 for
+ones that tilt through 180 degrees (where 100 is closed with the outer edge up).
+"""
+
+import math
+from typing import Any
+
+DEFAULT_SLAT_DEPTH = 25.0
+DEFAULT_SLAT_SPACING = 21.0
+DEFAULT_TILT_RANGE = 90
+
+
+def open_tilt_percentage(tilt_range: int) -> float:
+    """Tilt position with the slats horizontal."""
+    return 90 / tilt_range * 100
+
+
+def slat_tilt_percentage(
+    gamma: float, elevation: float, slat_depth: float, slat_spacing: float, tilt_range: int
+) -> float:
+    if abs(gamma) >= 90:
+        return open_tilt_percentage(tilt_range)
+    profile = math.atan(math.tan(math.radians(max(elevation, 0.0))) / math.cos(math.radians(gamma)))
+    reach = slat_spacing / slat_depth * math.cos(profile)
+    if reach > 1:
+        return 0.0
+    # Degrees from closed; 90 is horizontal.
+    angle = 90 + min(0.0, math.degrees(profile - math.asin(reach)))
+    return angle / tilt_range * 100
+
+
+def slat_tilt_percentages(gamma: Any, elevation: Any, slat_depth: float, slat_spacing: float, tilt_range: int) -> Any:
+    """Array version of slat_tilt_percentage(), for the batch calculation."""
+    # numpy isn't needed by the live calculation; keep it out of the integration's import.
+    import numpy as np
+
+    gamma = np.radians(gamma)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profile = np.arctan(np.tan(np.radians(np.maximum(elevation, 0.0))) / np.cos(gamma))
+        reach = slat_spacing / slat_depth * np.cos(profile)
+        angle = 90 + np.minimum(0.0, np.degrees(profile - np.arcsin(np.minimum(reach, 1))))
+    percentage = np.where(reach > 1, 0.0, angle / tilt_range * 100)
+    return np.where(np.abs(gamma) >= math.pi / 2, open_tilt_percentage(tilt_range), percentage)
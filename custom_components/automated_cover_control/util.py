@@ -3,11 +3,14 @@ from dataclasses import asdict
 from datetime import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
 
 
 def get_state_or_none_if_unknown(hass: HomeAssistant, entity_id: str):
-    state = hass.states.get(entity_id)
+    return known_state_or_none(hass.states.get(entity_id))
+
+
+def known_state_or_none(state: State | None) -> str | None:
     if not state or state.state in ["unknown", "unavailable"]:
         return None
     return state.state
@@ -22,6 +22,7 @@ class CoverControlTweaks(enum.StrEnum):
     CLIPPED_TO_MIN = enum.auto()
     CLIPPED_TO_MAX = enum.auto()
     SUN_IN_BLIND_SPOT = enum.auto()
+    SUN_BEHIND_HORIZON = enum.auto()
     SOLAR_ELEVATION_OUT_OF_RANGE = enum.auto()
     AFTER_SUNSET_OR_BEFORE_SUNRISE = enum.auto()
     CLIPPED_TO_0_100_RANGE = enum.auto()
@@ -0,0 +1,140 @@
+import itertools
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_mock_service
+from pytest_homeassistant_custom_component.components.recorder.common import async_wait_recording_done
+
+from custom_components.automated_cover_control.backtest import summarize
+from custom_components.automated_cover_control.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DAYS,
+    ATTR_OPTIONS,
+    CONF_DEFAULT_COVER_POSITION,
+    CONF_DISTANCE_FROM_WINDOW,
+    CONF_ENTITIES,
+    CONF_LUX_ENTITY,
+    CONF_LUX_THRESHOLD,
+    CONF_MINIMUM_CHANGE_PERCENTAGE,
+    CONF_WINDOW_AZIMUTH,
+    CONF_WINDOW_HEIGHT,
+    DOMAIN,
+    SERVICE_BACKTEST,
+)
+from custom_components.automated_cover_control.simulation import (
+    SimulationLocation,
+    build_solar_track,
+    simulate,
+)
+
+LOCATION = SimulationLocation(latitude=37.80, longitude=-122.46, time_zone="America/Los_Angeles")
+DAY = date(2025, 10, 31)
+START = datetime(2025, 10, 31, tzinfo=ZoneInfo(LOCATION.time_zone))
+END = START + timedelta(days=1)
+
+OPTIONS = {
+    CONF_DEFAULT_COVER_POSITION: 100,
+    CONF_DISTANCE_FROM_WINDOW: 0.5,
+    CONF_ENTITIES: ["cover.one", "cover.two"],
+    CONF_LUX_ENTITY: "sensor.lux",
+    CONF_LUX_THRESHOLD: 1000,
+    CONF_WINDOW_AZIMUTH: 180,
+    CONF_WINDOW_HEIGHT: 2.1,
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    # The recorder has to be set up before hass is.
+    yield
+
+
+def test_summarize():
+    track = build_solar_track(LOCATION, DAY, DAY)
+    result = simulate(OPTIONS, track, initial_position=100)
+    summary = summarize(result, START, END, initial_position=100)
+
+    assert summary.covers == 2
+    assert summary.commands == 2 * len(result.command_steps)
+    positions = [100, *result.command_positions.tolist()]
+    assert summary.motor_travel == 2 * sum(abs(b - a) for a, b in itertools.pairwise(positions))
+    assert timedelta(hours=5) < summary.sun_in_window < timedelta(hours=12)
+    # Tracking only lags behind the sun by the time threshold and the minimum change.
+    assert summary.sun_unblocked < summary.sun_in_window / 2
+
+    # Too dark to track the sun all day: the covers stay open, but so does the window.
+    options = dict(OPTIONS, before_sunrise_or_after_sunset_cover_position=100)
+    dark = simulate(options, track, {"sensor.lux": [(START, "10")]}, initial_position=100)
+    summary = summarize(dark, START, END, initial_position=100)
+    assert summary.commands == 0
+    assert summary.motor_travel == 0
+    assert summary.sun_unblocked == summary.sun_in_window
+
+    # Only the part of the simulation inside the period counts.
+    summary = summarize(result, START + timedelta(hours=20), END, initial_position=100)
+    assert summary.sun_in_window == timedelta(0)
+
+
+async def test_backtest_service(recorder_mock, hass: HomeAssistant):
+    async_mock_service(hass, "cover", "set_cover_position")
+    async_mock_service(hass, "cover", "set_cover_tilt_position")
+    entries = []
+    for name in ("foo", "bar"):
+        entry = MockConfigEntry(domain=DOMAIN, data={"name": name}, options=OPTIONS)
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert hass.data[DOMAIN][entry.entry_id].last_update_success
+        entries.append(entry)
+
+    hass.states.async_set("sensor.lux", "5000")
+    hass.states.async_set("cover.one", "open", {"current_position": 100})
+    await async_wait_recording_done(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKTEST,
+        {ATTR_DAYS: 2, ATTR_OPTIONS: {CONF_MINIMUM_CHANGE_PERCENTAGE: 10}},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["days"] == 2
+    assert set(response["entries"]) == {entry.entry_id for entry in entries}
+    summary = response["entries"][entries[0].entry_id]
+    assert set(summary) == {
+        "title",
+        "covers",
+        "commands",
+        "motor_travel",
+        "sun_in_window_minutes",
+        "sun_unblocked_minutes",
+    }
+    assert summary["covers"] == 2
+    assert 0 <= summary["sun_unblocked_minutes"] <= summary["sun_in_window_minutes"] <= 2 * 24 * 60
+    # Same options, same history.
+    assert response["entries"][entries[1].entry_id] | {"title": None} == summary | {"title": None}
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKTEST,
+        {ATTR_CONFIG_ENTRY_ID: entries[1].entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert list(response["entries"]) == [entries[1].entry_id]
+    assert response["days"] == 7
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BACKTEST,
+            {ATTR_CONFIG_ENTRY_ID: "nope"},
+            blocking=True,
+            return_response=True,
+        )
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,164 @@
+import itertools
+import logging
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from homeassistant.core import State
+
+from custom_components.automated_cover_control.batch_calculation import (
+    SensorPredicates,
+    SunPositions,
+    calculate_sun_tracking_vertical_cover_positions,
+)
+from custom_components.automated_cover_control.blind_spots import BlindSpot
+from custom_components.automated_cover_control.calculation import (
+    SunPosition,
+    calculate_sun_tracking_vertical_cover_position,
+)
+from custom_components.automated_cover_control.config import (
+    AutomationConfiguration,
+    BlindSpotConfiguration,
+    SensorConfiguration,
+    WindowConfiguration,
+)
+from custom_components.automated_cover_control.horizon import HorizonProfile
+from custom_components.automated_cover_control.log_context_adapter import (
+    LogContextAdapter,
+)
+from custom_components.automated_cover_control.shading import WindowShading
+from custom_components.automated_cover_control.why import CoverControlTweaks
+
+SUNRISE = datetime.fromisoformat("2025-10-31T08:00:00-08:00")
+SUNSET = datetime.fromisoformat("2025-10-31T19:00:00-08:00")
+
+
+class FakeHass:
+    def __init__(self):
+        self.states = {}
+
+
+def _configs():
+    plain = (AutomationConfiguration(), BlindSpotConfiguration(), WindowConfiguration(window_height=2.1))
+
+    automation_config = AutomationConfiguration()
+    automation_config.default_cover_position = 11
+    automation_config.before_sunrise_or_after_sunset_cover_position = 99
+    automation_config.sunrise_offset = timedelta(minutes=30)
+    automation_config.sunset_offset = timedelta(minutes=-45)
+    automation_config.minimum_cover_position = 20
+    automation_config.maximum_cover_position = 80
+    automation_config.only_force_maximum_when_sun_in_front_of_window = True
+    automation_config.cover_calculation_rounding = 1
+    automation_config.slat_tilt = True
+    automation_config.tilt_range = 180
+    blind_spot_config = BlindSpotConfiguration(
+        enabled=True, left=10, right=40, elevation=30, additional=[BlindSpot(30, 60, 45), BlindSpot(120, 140)]
+    )
+    window_config = WindowConfiguration(
+        window_azimuth=86,
+        window_height=1.67,
+        distance_from_window=0.3,
+        fov_left=70,
+        fov_right=45,
+        min_solar_elevation=5,
+        max_solar_elevation=60,
+        horizon=HorizonProfile([(90, 2.0), (130, 13.0), (150, 40.0), (200, 0.0)]),
+        shading=WindowShading(1.67, 1.2, overhang_depth=0.6, overhang_offset=0.2, fin_depth=0.3, reveal_depth=0.1),
+    )
+    tuned = (automation_config, blind_spot_config, window_config)
+
+    automation_config = AutomationConfiguration()
+    automation_config.minimum_cover_position = 150
+    automation_config.only_force_minimum_when_sun_in_front_of_window = True
+    window_config = WindowConfiguration(window_azimuth=270, window_height=2.0, distance_from_window=1.2)
+    window_config.max_solar_elevation = 40
+    out_of_range = (automation_config, BlindSpotConfiguration(enabled=True, left=100, right=150), window_config)
+
+    return [plain, tuned, out_of_range]
+
+
+@pytest.mark.parametrize(("automation_config", "blind_spot_config", "window_config"), _configs())
+def test_matches_scalar_calculation(automation_config, blind_spot_config, window_config):
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    sensor_config = SensorConfiguration(
+        presence_entity="binary_sensor.presence",
+        window_sensor_entity="binary_sensor.window",
+        weather_entity="weather.home",
+        weather_condition=["sunny"],
+        lux_entity="sensor.lux",
+        lux_threshold=1000,
+    )
+
+    azimuths = np.arange(0.0, 360.0, 17.5)
+    elevations = np.array([-10.0, 0.0, 3.0, 12.5, 29.28, 45.0, 70.0])
+    nows = [SUNRISE - timedelta(minutes=40), SUNRISE + timedelta(hours=3), SUNSET - timedelta(minutes=20)]
+    # All sensors agreeing, plus each one blocking on its own.
+    sensors = [(False, True, True, True), (True, True, True, True), (False, False, True, True)]
+    sensors += [(False, True, False, True), (False, True, True, False)]
+    points = list(itertools.product(azimuths, elevations, nows, sensors))
+
+    batch = calculate_sun_tracking_vertical_cover_positions(
+        SunPositions(
+            solar_azimuth=np.array([point[0] for point in points]),
+            solar_elevation=np.array([point[1] for point in points]),
+            sunrise=np.datetime64(SUNRISE.astimezone(UTC).replace(tzinfo=None)),
+            sunset=np.datetime64(SUNSET.astimezone(UTC).replace(tzinfo=None)),
+            now=np.array([point[2].astimezone(UTC).replace(tzinfo=None) for point in points], dtype="datetime64[us]"),
+        ),
+        automation_config,
+        blind_spot_config,
+        window_config,
+        SensorPredicates(
+            window_open=np.array([point[3][0] for point in points]),
+            presence_detected=np.array([point[3][1] for point in points]),
+            lux_above_threshold=np.array([point[3][2] for point in points]),
+            sunny=np.array([point[3][3] for point in points]),
+        ),
+    )
+
+    hass = FakeHass()
+    for index, (solar_azimuth, solar_elevation, now, (window_open, presence, lux, sunny)) in enumerate(points):
+        hass.states["binary_sensor.window"] = State("binary_sensor.window", "on" if window_open else "off")
+        hass.states["binary_sensor.presence"] = State("binary_sensor.presence", "on" if presence else "off")
+        hass.states["sensor.lux"] = State("sensor.lux", "5000" if lux else "10")
+        hass.states["weather.home"] = State("weather.home", "sunny" if sunny else "cloudy")
+        scalar = calculate_sun_tracking_vertical_cover_position(
+            hass.states,
+            logger,
+            SunPosition(solar_azimuth, solar_elevation, SUNRISE, SUNSET, now),
+            automation_config,
+            blind_spot_config,
+            sensor_config,
+            window_config,
+        )
+        assert batch.target_position[index] == scalar.target_position, points[index]
+        assert batch.reason(index) == scalar.reason, points[index]
+        assert batch.tweaks_at(index) == scalar.tweaks, points[index]
+        assert (None if batch.target_tilt is None else batch.target_tilt[index]) == scalar.target_tilt, points[index]
+        assert (
+            batch.is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk[index]
+            == scalar.is_sun_in_front_of_window_and_not_in_blind_spot_and_not_at_dawn_or_dusk
+        ), points[index]
+
+
+def test_unconfigured_sensors_are_ignored():
+    window_config = WindowConfiguration(window_azimuth=86, window_height=1.67, distance_from_window=0.3)
+    batch = calculate_sun_tracking_vertical_cover_positions(
+        SunPositions(
+            solar_azimuth=np.array([142.5, 142.5]),
+            solar_elevation=np.array([29.28, 29.28]),
+            sunrise=np.datetime64(SUNRISE.astimezone(UTC).replace(tzinfo=None)),
+            sunset=np.datetime64(SUNSET.astimezone(UTC).replace(tzinfo=None)),
+            now=np.array(
+                [(SUNRISE + timedelta(hours=3)).astimezone(UTC).replace(tzinfo=None)] * 2, dtype="datetime64[us]"
+            ),
+        ),
+        AutomationConfiguration(),
+        BlindSpotConfiguration(),
+        window_config,
+        SensorPredicates(window_open=np.array([False, True])),
+    )
+    assert batch.target_position.tolist() == [18, 0]
+    assert batch.tweaks_at(0) == []
+    assert CoverControlTweaks.CLIPPED_TO_0_100_RANGE not in batch.tweaks
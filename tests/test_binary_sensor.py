@@ -26,23 +26,10 @@ OPTIONS = {
     CONF_WINDOW_HEIGHT: 1.0,
 }
 
-STATES_TEMPLATE = {
-    "sun_in_window_start": None,
-    "sun_in_window_end": None,
-    "target_position": None,
-    "reason": None,
-    "tweaks": [],
-    "manual_override": None,
-    "covers_under_manual_control": [],
-    "sun_in_front_of_window": None,
-}
-
 
 async def test_sun_in_front_of_window_sensor(hass: HomeAssistant):
     with patch.object(AutomatedCoverControlDataUpdateCoordinator, "_async_update_data") as mock:
-        mock.return_value = AutomatedCoverControlData(
-            attributes={}, states=dict(STATES_TEMPLATE, sun_in_front_of_window=False)
-        )
+        mock.return_value = AutomatedCoverControlData(sun_in_front_of_window=False)
 
         entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=OPTIONS)
         entry.add_to_hass(hass)
@@ -56,9 +43,7 @@ async def test_sun_in_front_of_window_sensor(hass: HomeAssistant):
         assert state
         assert state.state == "off"
 
-        mock.return_value = AutomatedCoverControlData(
-            attributes={}, states=dict(STATES_TEMPLATE, sun_in_front_of_window=True)
-        )
+        mock.return_value = AutomatedCoverControlData(sun_in_front_of_window=True)
         await coordinator.async_refresh()
 
         state = hass.states.get("binary_sensor.foo_automated_cover_control_sun_in_front_of_window")
@@ -68,9 +53,7 @@ async def test_sun_in_front_of_window_sensor(hass: HomeAssistant):
 
 async def test_manual_override_detected_sensor(hass: HomeAssistant):
     with patch.object(AutomatedCoverControlDataUpdateCoordinator, "_async_update_data") as mock:
-        mock.return_value = AutomatedCoverControlData(
-            attributes={}, states=dict(STATES_TEMPLATE, manual_override=False)
-        )
+        mock.return_value = AutomatedCoverControlData(manual_override=False)
 
         entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=OPTIONS)
         entry.add_to_hass(hass)
@@ -85,14 +68,7 @@ async def test_manual_override_detected_sensor(hass: HomeAssistant):
         assert state.state == "off"
         assert len(state.attributes["manually_controlled"]) == 0
 
-        mock.return_value = AutomatedCoverControlData(
-            attributes={},
-            states=dict(
-                STATES_TEMPLATE,
-                manual_override=True,
-                covers_under_manual_control=["foo"],
-            ),
-        )
+        mock.return_value = AutomatedCoverControlData(manual_override=True, covers_under_manual_control=("foo",))
         await coordinator.async_refresh()
 
         state = hass.states.get("binary_sensor.foo_automated_cover_control_manual_override_detected")
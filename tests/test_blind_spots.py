@@ -0,0 +1,84 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from custom_components.automated_cover_control.blind_spots import BlindSpot, BlindSpotIndex
+from custom_components.automated_cover_control.config import BlindSpotConfiguration
+from custom_components.automated_cover_control.const import (
+    CONF_BLIND_SPOT_ENABLED,
+    CONF_BLIND_SPOT_LEFT,
+    CONF_BLIND_SPOT_RIGHT,
+    CONF_BLIND_SPOTS,
+)
+
+
+def _brute_force(regions: list[BlindSpot], angle: float, elevation: float) -> bool:
+    return any(region.covers(angle) and elevation <= region.ceiling for region in regions)
+
+
+def test_empty_index():
+    index = BlindSpotIndex([])
+    assert not index
+    assert not index.contains(45, 0)
+    assert not index.contains_array([0, 45, 180], 0).any()
+
+
+def test_inclusive_bounds():
+    index = BlindSpotIndex([BlindSpot(10, 20)])
+    assert index.contains(10, 89)
+    assert index.contains(20, 89)
+    assert not index.contains(9.99, 0)
+    assert not index.contains(20.01, 0)
+
+
+def test_overlapping_regions():
+    # A low wall across a wide stretch, with a pillar in the middle of it.
+    index = BlindSpotIndex([BlindSpot(40, 120, 15), BlindSpot(70, 80)])
+    assert index.ceiling(50) == 15
+    assert index.ceiling(75) == math.inf
+    assert index.ceiling(80) == math.inf
+    assert index.ceiling(100) == 15
+    assert index.ceiling(130) == -math.inf
+    assert not index.contains(50, 20)
+    assert index.contains(75, 80)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed: int):
+    rng = random.Random(seed)
+    regions = []
+    for _ in range(rng.randint(1, 12)):
+        left = rng.randint(0, 170)
+        elevation = rng.choice([None, rng.randint(0, 90)])
+        regions.append(BlindSpot(left, rng.randint(left + 1, 180), elevation))
+    index = BlindSpotIndex(regions)
+
+    # Breakpoints themselves, plus random angles in between.
+    angles = [bound for region in regions for bound in (region.left, region.right)]
+    angles += [rng.uniform(0, 180) for _ in range(200)]
+    elevations = [rng.uniform(0, 90) for _ in angles]
+    expected = [_brute_force(regions, angle, elevation) for angle, elevation in zip(angles, elevations, strict=True)]
+    assert [index.contains(angle, elevation) for angle, elevation in zip(angles, elevations, strict=True)] == expected
+    assert index.contains_array(np.array(angles), np.array(elevations)).tolist() == expected
+
+
+def test_read_from_config():
+    config = BlindSpotConfiguration()
+    config.read(
+        {
+            CONF_BLIND_SPOT_ENABLED: True,
+            CONF_BLIND_SPOT_LEFT: 10,
+            CONF_BLIND_SPOT_RIGHT: 20,
+            CONF_BLIND_SPOTS: [{"left": 100, "right": 120, "elevation": 15}, {"left": 150, "right": 160}],
+        }
+    )
+    assert config.regions == (BlindSpot(10, 20), BlindSpot(100, 120, 15), BlindSpot(150, 160))
+    # The index is shared while the regions stay the same.
+    assert config.index is config.index
+    assert config.index.contains(155, 80)
+
+    config.enabled = False
+    assert config.regions == ()
+    assert not config.index
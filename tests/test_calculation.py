@@ -4,6 +4,7 @@ from datetime import UTC, datetime, timedelta
 import pytest
 from homeassistant.core import State
 
+from custom_components.automated_cover_control.blind_spots import BlindSpot
 from custom_components.automated_cover_control.calculation import (
     SunPosition,
     calculate_sun_tracking_vertical_cover_position,
@@ -14,9 +15,12 @@ from custom_components.automated_cover_control.config import (
     SensorConfiguration,
     WindowConfiguration,
 )
+from custom_components.automated_cover_control.horizon import HorizonProfile
 from custom_components.automated_cover_control.log_context_adapter import (
     LogContextAdapter,
 )
+from custom_components.automated_cover_control.shading import WindowShading
+from custom_components.automated_cover_control.tilt import slat_tilt_percentage
 from custom_components.automated_cover_control.why import (
     CoverControlReason,
     CoverControlTweaks,
@@ -68,7 +72,7 @@ def test_normal_calculation():
 
     window_config, sun, expected_position = default_window_and_sun_params_with_expected_cover_percentage()
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -83,7 +87,7 @@ def test_normal_calculation():
     # before sunrise
     sun.now = sun.sunrise - timedelta(hours=1)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -98,7 +102,7 @@ def test_normal_calculation():
     # after sunset
     sun.now = sun.sunset + timedelta(hours=1)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -126,7 +130,7 @@ def test_normal_calculation_with_sun_offsets():
 
     window_config, sun, expected_position = default_window_and_sun_params_with_expected_cover_percentage()
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -141,7 +145,7 @@ def test_normal_calculation_with_sun_offsets():
     # before sunrise but within offset
     sun.now = sun.sunrise - timedelta(minutes=44)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -156,7 +160,7 @@ def test_normal_calculation_with_sun_offsets():
     # before sunrise and before offset
     sun.now = sun.sunrise - timedelta(minutes=46)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -171,7 +175,7 @@ def test_normal_calculation_with_sun_offsets():
     # after sunset but within offset
     sun.now = sun.sunset + timedelta(minutes=29)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -186,7 +190,7 @@ def test_normal_calculation_with_sun_offsets():
     # after sunset and after offset
     sun.now = sun.sunset + timedelta(minutes=31)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -213,7 +217,7 @@ def test_with_min_max_solar_elevation():
     window_config, sun, expected_position = default_window_and_sun_params_with_expected_cover_percentage()
     window_config.min_solar_elevation = sun.solar_elevation + 1
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -228,7 +232,7 @@ def test_with_min_max_solar_elevation():
     window_config, sun, expected_position = default_window_and_sun_params_with_expected_cover_percentage()
     window_config.max_solar_elevation = sun.solar_elevation - 1
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -262,7 +266,7 @@ def test_with_blind_spot():
     sun.solar_elevation = 29.28
 
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -278,7 +282,7 @@ def test_with_blind_spot():
     blind_spot_config.right = 150
     blind_spot_config.elevation = None
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -294,7 +298,7 @@ def test_with_blind_spot():
     blind_spot_config.right = 150
     blind_spot_config.elevation = 20
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -310,7 +314,7 @@ def test_with_blind_spot():
     blind_spot_config.right = 150
     blind_spot_config.elevation = 30
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -323,6 +327,172 @@ def test_with_blind_spot():
     assert cp.tweaks == [CoverControlTweaks.SUN_IN_BLIND_SPOT]
 
 
+def test_with_multiple_blind_spots():
+    hass = FakeHass()
+    logger = LogContextAdapter(logging.getLogger(__name__))
+
+    automation_config = AutomationConfiguration()
+    automation_config.default_cover_position = 11
+    sensor_config = SensorConfiguration()
+
+    blind_spot_config = BlindSpotConfiguration()
+    blind_spot_config.enabled = True
+    blind_spot_config.left = 10
+    blind_spot_config.right = 20
+    blind_spot_config.additional = [BlindSpot(60, 90), BlindSpot(140, 150, 30)]
+
+    window_config, sun, _ = default_window_and_sun_params_with_expected_cover_percentage()
+    sun.solar_azimuth = 142.5  # Results in a gamma of 146.5 with a window azimuth of 86.
+    sun.solar_elevation = 29.28
+
+    cp = calculate_sun_tracking_vertical_cover_position(
+        hass.states,
+        logger,
+        sun,
+        automation_config,
+        blind_spot_config,
+        sensor_config,
+        window_config,
+    )
+    assert cp.target_position == 11
+    assert cp.reason == CoverControlReason.SUN_NOT_IN_FRONT_OF_WINDOW
+    assert cp.tweaks == [CoverControlTweaks.SUN_IN_BLIND_SPOT]
+
+    # Disabling blind spots disables all of them.
+    blind_spot_config.enabled = False
+    cp = calculate_sun_tracking_vertical_cover_position(
+        hass.states,
+        logger,
+        sun,
+        automation_config,
+        blind_spot_config,
+        sensor_config,
+        window_config,
+    )
+    assert cp.reason == CoverControlReason.SUN_IN_FRONT_OF_WINDOW
+    assert cp.tweaks == []
+
+
+def test_with_horizon():
+    hass = FakeHass()
+    logger = LogContextAdapter(logging.getLogger(__name__))
+
+    automation_config = AutomationConfiguration()
+    automation_config.default_cover_position = 11
+    blind_spot_config = BlindSpotConfiguration()
+    sensor_config = SensorConfiguration()
+
+    def _calculate():
+        return calculate_sun_tracking_vertical_cover_position(
+            hass.states,
+            logger,
+            sun,
+            automation_config,
+            blind_spot_config,
+            sensor_config,
+            window_config,
+        )
+
+    # A building to the southeast, up to 35 degrees high; the sun (azimuth 142.5, elevation 29.28) is behind it.
+    window_config, sun, expected_position = default_window_and_sun_params_with_expected_cover_percentage()
+    window_config.horizon = HorizonProfile([(0, 0), (120, 35), (160, 35), (200, 0)])
+    cp = _calculate()
+    assert cp.target_position == 11
+    assert cp.reason == CoverControlReason.SUN_NOT_IN_FRONT_OF_WINDOW
+    assert cp.tweaks == [CoverControlTweaks.SUN_BEHIND_HORIZON]
+    assert cp.predicates["sun_behind_horizon"] is True
+
+    # Once the sun clears it, the horizon makes no difference.
+    window_config.horizon = HorizonProfile([(0, 0), (120, 25), (160, 25), (200, 0)])
+    cp = _calculate()
+    assert cp.target_position == expected_position
+    assert cp.reason == CoverControlReason.SUN_IN_FRONT_OF_WINDOW
+    assert cp.tweaks == []
+
+
+def test_with_shading():
+    hass = FakeHass()
+    logger = LogContextAdapter(logging.getLogger(__name__))
+
+    automation_config = AutomationConfiguration()
+    blind_spot_config = BlindSpotConfiguration()
+    sensor_config = SensorConfiguration()
+
+    def _calculate():
+        return calculate_sun_tracking_vertical_cover_position(
+            hass.states,
+            logger,
+            sun,
+            automation_config,
+            blind_spot_config,
+            sensor_config,
+            window_config,
+        )
+
+    # A shallow overhang well above the window leaves it all sunlit, so the cover comes down as usual.
+    window_config, sun, expected_position = default_window_and_sun_params_with_expected_cover_percentage()
+    window_config.shading = WindowShading(window_config.window_height, overhang_depth=0.2, overhang_offset=0.5)
+    cp = _calculate()
+    assert cp.target_position == expected_position
+    assert cp.reason == CoverControlReason.SUN_IN_FRONT_OF_WINDOW
+
+    # A deep one shades all but the bottom of the window, which the cover wouldn't have come down to anyway.
+    window_config.shading = WindowShading(window_config.window_height, overhang_depth=2.0)
+    cp = _calculate()
+    assert cp.target_position == 100
+    assert cp.reason == CoverControlReason.SUN_IN_FRONT_OF_WINDOW
+
+
+def test_with_slat_tilt():
+    hass = FakeHass()
+    logger = LogContextAdapter(logging.getLogger(__name__))
+
+    automation_config = AutomationConfiguration()
+    automation_config.default_cover_position = 11
+    automation_config.slat_tilt = True
+    blind_spot_config = BlindSpotConfiguration()
+    sensor_config = SensorConfiguration()
+
+    def _calculate():
+        return calculate_sun_tracking_vertical_cover_position(
+            hass.states,
+            logger,
+            sun,
+            automation_config,
+            blind_spot_config,
+            sensor_config,
+            window_config,
+        )
+
+    # The position is worked out as for a roller cover; the slats are tilted as well.
+    window_config, sun, expected_position = default_window_and_sun_params_with_expected_cover_percentage()
+    cp = _calculate()
+    assert cp.target_position == expected_position
+    assert cp.reason == CoverControlReason.SUN_IN_FRONT_OF_WINDOW
+    # The sun's high enough that horizontal slats keep it out.
+    assert cp.target_tilt == 100
+
+    sun.solar_elevation = 10
+    cp = _calculate()
+    assert cp.reason == CoverControlReason.SUN_IN_FRONT_OF_WINDOW
+    assert cp.target_tilt == round(slat_tilt_percentage(-56.5, 10, 25, 21, 90))
+    assert 0 < cp.target_tilt < 100
+    assert cp.predicates["calculated_tilt"] == cp.target_tilt
+
+    # Without the sun to keep out, the slats are left open.
+    sun.solar_azimuth = 300
+    cp = _calculate()
+    assert cp.target_position == 11
+    assert cp.target_tilt == 100
+
+    automation_config.tilt_range = 180
+    cp = _calculate()
+    assert cp.target_tilt == 50
+
+    automation_config.slat_tilt = False
+    assert _calculate().target_tilt is None
+
+
 def test_with_fov():
     hass = FakeHass()
     logger = LogContextAdapter(logging.getLogger(__name__))
@@ -343,7 +513,7 @@ def test_with_fov():
     sun.solar_elevation = 29.28
 
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -358,7 +528,7 @@ def test_with_fov():
     window_config.fov_left = 0
     window_config.fov_right = 56
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -389,7 +559,7 @@ def test_window_sensor():
     sun.now = sun.sunrise + timedelta(hours=5)  # halfway between sunrise and sunset
     hass.states["binary_sensor.window"] = State(entity_id="binary_sensor.window", state=None)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -404,7 +574,7 @@ def test_window_sensor():
     sun.now = sun.sunrise + timedelta(hours=5)  # halfway between sunrise and sunset
     hass.states["binary_sensor.window"] = State(entity_id="binary_sensor.window", state="invalid")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -419,7 +589,7 @@ def test_window_sensor():
     sun.now = sun.sunrise + timedelta(hours=5)  # halfway between sunrise and sunset
     hass.states["binary_sensor.window"] = State(entity_id="binary_sensor.window", state="on")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -434,7 +604,7 @@ def test_window_sensor():
     sun.now = sun.sunrise - timedelta(hours=1)  # before sunrise
     hass.states["binary_sensor.window"] = State(entity_id="binary_sensor.window", state="on")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -449,7 +619,7 @@ def test_window_sensor():
     sun.now = sun.sunset + timedelta(hours=1)  # after sunset
     hass.states["binary_sensor.window"] = State(entity_id="binary_sensor.window", state="on")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -478,7 +648,7 @@ def test_presence():
     sensor_config.presence_entity = "device_tracker.x"
     hass.states["device_tracker.x"] = State(entity_id="device_tracker.x", state=None)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -495,7 +665,7 @@ def test_presence():
     sensor_config.presence_entity = "device_tracker.x"
     hass.states["device_tracker.x"] = State(entity_id="device_tracker.x", state="foo")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -512,7 +682,7 @@ def test_presence():
     sensor_config.presence_entity = "device_tracker.x"
     hass.states["device_tracker.x"] = State(entity_id="device_tracker.x", state="home")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -529,7 +699,7 @@ def test_presence():
     sensor_config.presence_entity = "zone.y"
     hass.states["zone.y"] = State(entity_id="zone.y", state=0)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -546,7 +716,7 @@ def test_presence():
     sensor_config.presence_entity = "zone.y"
     hass.states["zone.y"] = State(entity_id="zone.y", state=5)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -563,7 +733,7 @@ def test_presence():
     sensor_config.presence_entity = "binary_sensor.y"
     hass.states["binary_sensor.y"] = State(entity_id="binary_sensor.y", state="off")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -580,7 +750,7 @@ def test_presence():
     sensor_config.presence_entity = "binary_sensor.y"
     hass.states["binary_sensor.y"] = State(entity_id="binary_sensor.y", state="on")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -598,7 +768,7 @@ def test_presence():
     sensor_config.presence_entity = "bad_domain.foo"
     hass.states["bad_domain.foo"] = State(entity_id="bad_domain.foo", state="bar")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -629,7 +799,7 @@ def test_weather():
     sun.now = sun.sunrise + timedelta(hours=5)  # halfway between sunrise and sunset
     hass.states["weather.z"] = State(entity_id="weather.z", state=None)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -644,7 +814,7 @@ def test_weather():
     sun.now = sun.sunrise + timedelta(hours=5)  # halfway between sunrise and sunset
     hass.states["weather.z"] = State(entity_id="weather.z", state="cloudy")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -659,7 +829,7 @@ def test_weather():
     sun.now = sun.sunrise + timedelta(hours=5)  # halfway between sunrise and sunset
     hass.states["weather.z"] = State(entity_id="weather.z", state="sunny")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -676,7 +846,7 @@ def test_weather():
     sun.now = sun.sunrise + timedelta(hours=5)  # halfway between sunrise and sunset
     hass.states["weather.z"] = State(entity_id="weather.z", state="foo")
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -706,7 +876,7 @@ def test_lux():
 
     hass.states["lux.a"] = State(entity_id="lux.a", state=None)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -720,7 +890,7 @@ def test_lux():
 
     hass.states["lux.a"] = State(entity_id="lux.a", state=0)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -734,7 +904,7 @@ def test_lux():
 
     hass.states["lux.a"] = State(entity_id="lux.a", state=5001)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -750,7 +920,7 @@ def test_lux():
     sensor_config.lux_threshold = None
     hass.states["lux.a"] = State(entity_id="lux.a", state=0)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -779,7 +949,7 @@ def test_min_position():
     automation_config.default_cover_position = 11
     automation_config.before_sunrise_or_after_sunset_cover_position = 99
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -797,7 +967,7 @@ def test_min_position():
     automation_config.minimum_cover_position = 22
     automation_config.only_force_minimum_when_sun_in_front_of_window = False
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -815,7 +985,7 @@ def test_min_position():
     automation_config.minimum_cover_position = 22
     automation_config.only_force_minimum_when_sun_in_front_of_window = True
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -834,7 +1004,7 @@ def test_min_position():
     automation_config.only_force_minimum_when_sun_in_front_of_window = False
     sun.now = sun.sunrise - timedelta(hours=1)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -856,7 +1026,7 @@ def test_min_position():
     automation_config.only_force_minimum_when_sun_in_front_of_window = True
     sun.now = sun.sunrise - timedelta(hours=1)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -885,7 +1055,7 @@ def test_max_position():
     automation_config.default_cover_position = 11
     automation_config.before_sunrise_or_after_sunset_cover_position = 99
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -903,7 +1073,7 @@ def test_max_position():
     automation_config.maximum_cover_position = 10
     automation_config.only_force_maximum_when_sun_in_front_of_window = False
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -921,7 +1091,7 @@ def test_max_position():
     automation_config.maximum_cover_position = 10
     automation_config.only_force_maximum_when_sun_in_front_of_window = True
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -940,7 +1110,7 @@ def test_max_position():
     automation_config.only_force_maximum_when_sun_in_front_of_window = False
     sun.now = sun.sunrise - timedelta(hours=1)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -962,7 +1132,7 @@ def test_max_position():
     automation_config.only_force_maximum_when_sun_in_front_of_window = True
     sun.now = sun.sunrise - timedelta(hours=1)
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -991,7 +1161,7 @@ def test_clipping():
 
     automation_config.before_sunrise_or_after_sunset_cover_position = -155
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -1008,7 +1178,7 @@ def test_clipping():
 
     automation_config.before_sunrise_or_after_sunset_cover_position = 155
     cp = calculate_sun_tracking_vertical_cover_position(
-        hass,
+        hass.states,
         logger,
         sun,
         automation_config,
@@ -1042,7 +1212,7 @@ def test_invalid_sun_position():
         sun.now = sun.now.replace(tzinfo=None)
 
         calculate_sun_tracking_vertical_cover_position(
-            hass,
+            hass.states,
             logger,
             sun,
             automation_config,
@@ -1061,7 +1231,7 @@ def test_invalid_sun_position():
         sun.sunrise = sun.sunrise.replace(tzinfo=None)
 
         calculate_sun_tracking_vertical_cover_position(
-            hass,
+            hass.states,
             logger,
             sun,
             automation_config,
@@ -1080,7 +1250,7 @@ def test_invalid_sun_position():
         sun.sunset = sun.sunset.replace(tzinfo=None)
 
         calculate_sun_tracking_vertical_cover_position(
-            hass,
+            hass.states,
             logger,
             sun,
             automation_config,
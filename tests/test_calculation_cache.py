@@ -0,0 +1,50 @@
+from custom_components.automated_cover_control.calculation import SunTrackingVerticalCoverPosition
+from custom_components.automated_cover_control.calculation_cache import CalculationCache
+from custom_components.automated_cover_control.why import CoverControlReason, CoverControlTweaks
+
+
+def test_positions_within_resolution_share_a_key():
+    cache = CalculationCache(resolution=0.5)
+    assert cache.key(180.1, 30.1, True) == cache.key(179.9, 29.9, True)
+    assert cache.key(180.1, 30.1, True) != cache.key(181.0, 30.1, True)
+    assert cache.key(180.1, 30.1, True) != cache.key(180.1, 30.1, False)
+
+
+def test_hits_and_misses():
+    cache = CalculationCache()
+    key = cache.key(180.0, 30.0, (False, True, True, True), 1)
+    assert cache.get(key) is None
+
+    cache.put(key, SunTrackingVerticalCoverPosition(True, 40, CoverControlReason.SUN_IN_FRONT_OF_WINDOW))
+    result = cache.get(key)
+    assert result.target_position == 40
+    assert result.reason == CoverControlReason.SUN_IN_FRONT_OF_WINDOW
+    assert cache.as_diagnostics() == {"hits": 1, "misses": 1, "size": 1, "max_size": cache.max_size}
+
+
+def test_results_are_copied():
+    cache = CalculationCache()
+    key = cache.key(180.0, 30.0)
+    cache.put(key, SunTrackingVerticalCoverPosition(target_position=40))
+
+    # The coordinator adjusts results in place (inverting them, say); that mustn't stick to the cached result.
+    result = cache.get(key)
+    result.target_position = 60
+    result.tweaks.append(CoverControlTweaks.INVERTED)
+    result = cache.get(key)
+    assert result.target_position == 40
+    assert result.tweaks == []
+
+
+def test_least_recently_used_is_evicted():
+    cache = CalculationCache(max_size=2)
+    first, second, third = (cache.key(azimuth, 30.0) for azimuth in (10.0, 20.0, 30.0))
+    cache.put(first, SunTrackingVerticalCoverPosition(target_position=10))
+    cache.put(second, SunTrackingVerticalCoverPosition(target_position=20))
+    assert cache.get(first) is not None
+
+    cache.put(third, SunTrackingVerticalCoverPosition(target_position=30))
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.get(third) is not None
+    assert cache.as_diagnostics()["size"] == 2
@@ -11,13 +11,17 @@ from custom_components.automated_cover_control.const import (
     CONF_BLIND_SPOT_ENABLED,
     CONF_BLIND_SPOT_LEFT,
     CONF_BLIND_SPOT_RIGHT,
+    CONF_BLIND_SPOTS,
     CONF_DEFAULT_COVER_POSITION,
     CONF_DISTANCE_FROM_WINDOW,
     CONF_END_TIME,
     CONF_END_TIME_ENTITY,
     CONF_ENTITIES,
+    CONF_FIN_DEPTH,
     CONF_FOV_LEFT,
     CONF_FOV_RIGHT,
+    CONF_HORIZON,
+    CONF_HORIZON_FILE,
     CONF_INVERT,
     CONF_LUX_ENTITY,
     CONF_LUX_THRESHOLD,
@@ -34,17 +38,25 @@ from custom_components.automated_cover_control.const import (
     CONF_MINIMUM_COVER_POSITION,
     CONF_ONLY_FORCE_MAXIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW,
     CONF_ONLY_FORCE_MINIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW,
+    CONF_OVERHANG_DEPTH,
+    CONF_OVERHANG_OFFSET,
     CONF_PRESENCE_ENTITY,
     CONF_RETURN_TO_DEFAULT_AT_END_TIME,
+    CONF_REVEAL_DEPTH,
+    CONF_SLAT_DEPTH,
+    CONF_SLAT_SPACING,
+    CONF_SLAT_TILT,
     CONF_START_TIME,
     CONF_START_TIME_ENTITY,
     CONF_SUNRISE_OFFSET,
     CONF_SUNSET_OFFSET,
+    CONF_TILT_RANGE,
     CONF_WEATHER_ENTITY,
     CONF_WEATHER_STATE,
     CONF_WINDOW_AZIMUTH,
     CONF_WINDOW_HEIGHT,
     CONF_WINDOW_SENSOR_ENTITY,
+    CONF_WINDOW_WIDTH,
     DOMAIN,
 )
 
@@ -103,6 +115,66 @@ async def test_option_flow_window(hass: HomeAssistant, return_fake_cover_data) -
         CONF_FOV_LEFT: 90,
         CONF_FOV_RIGHT: 90,
         CONF_BLIND_SPOT_ENABLED: False,
+        CONF_HORIZON: None,
+    }
+    await hass.async_block_till_done()
+
+
+async def test_option_flow_window_with_horizon_file(hass: HomeAssistant, return_fake_cover_data, tmp_path) -> None:
+    options = {
+        CONF_DISTANCE_FROM_WINDOW: 0.1,
+        CONF_ENTITIES: ["cover.foo"],
+        CONF_WINDOW_AZIMUTH: 200.0,
+        CONF_WINDOW_HEIGHT: 1.0,
+    }
+    window = {CONF_DISTANCE_FROM_WINDOW: 0.1, CONF_WINDOW_AZIMUTH: 200.0, CONF_WINDOW_HEIGHT: 1.0}
+    horizon_file = tmp_path / "horizon.csv"
+    horizon_file.write_text("azimuth,elevation\n90,5\n180,25.5\n270,10\n")
+
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {"next_step_id": "window"})
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=window | {CONF_HORIZON_FILE: str(tmp_path / "missing.csv")}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_HORIZON_FILE: "invalid_horizon_file"}
+
+    # The file's points are stored with the options, so the file isn't needed afterwards.
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=window | {CONF_HORIZON_FILE: str(horizon_file)}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_HORIZON_FILE] == str(horizon_file)
+    assert result["data"][CONF_HORIZON] == [[90.0, 5.0], [180.0, 25.5], [270.0, 10.0]]
+    await hass.async_block_till_done()
+
+
+async def test_option_flow_window_with_shading(hass: HomeAssistant, return_fake_cover_data) -> None:
+    options = {
+        CONF_DISTANCE_FROM_WINDOW: 0.1,
+        CONF_ENTITIES: ["cover.foo"],
+        CONF_WINDOW_AZIMUTH: 200.0,
+        CONF_WINDOW_HEIGHT: 1.0,
+    }
+    shading = {CONF_WINDOW_WIDTH: 1.2, CONF_OVERHANG_DEPTH: 0.8, CONF_OVERHANG_OFFSET: 0.3, CONF_REVEAL_DEPTH: 0.15}
+
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {"next_step_id": "window"})
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_DISTANCE_FROM_WINDOW: 0.1, CONF_WINDOW_AZIMUTH: 200.0, CONF_WINDOW_HEIGHT: 1.0} | shading,
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == options | shading | {
+        CONF_BLIND_SPOT_ENABLED: False,
+        CONF_FOV_LEFT: 90.0,
+        CONF_FOV_RIGHT: 90.0,
+        CONF_HORIZON: None,
     }
     await hass.async_block_till_done()
 
@@ -154,6 +226,19 @@ async def test_option_flow_blind_spot(hass: HomeAssistant, return_fake_cover_dat
         user_input={
             CONF_BLIND_SPOT_LEFT: 10,
             CONF_BLIND_SPOT_RIGHT: 20,
+            CONF_BLIND_SPOTS: [{"left": 100}],
+        },
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "blind_spot"
+    assert result["errors"] == {CONF_BLIND_SPOTS: "invalid_blind_spots"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_BLIND_SPOT_LEFT: 10,
+            CONF_BLIND_SPOT_RIGHT: 20,
+            CONF_BLIND_SPOTS: [{"left": 100, "right": 120, "elevation": 15}],
         },
     )
     assert result["type"] is FlowResultType.CREATE_ENTRY
@@ -162,6 +247,7 @@ async def test_option_flow_blind_spot(hass: HomeAssistant, return_fake_cover_dat
         CONF_BLIND_SPOT_ENABLED: True,
         CONF_BLIND_SPOT_LEFT: 10.0,
         CONF_BLIND_SPOT_RIGHT: 20.0,
+        CONF_BLIND_SPOTS: [{"left": 100.0, "right": 120.0, "elevation": 15.0}],
     }
     await hass.async_block_till_done()
 
@@ -201,6 +287,7 @@ async def test_option_flow_cover_position(hass: HomeAssistant, return_fake_cover
         CONF_INVERT: False,
         CONF_ONLY_FORCE_MAXIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW: False,
         CONF_ONLY_FORCE_MINIMUM_WHEN_SUN_IN_FRONT_OF_WINDOW: False,
+        CONF_SLAT_TILT: False,
     }
     await hass.async_block_till_done()
 
@@ -398,7 +485,19 @@ async def test_initial_config_flow(hass: HomeAssistant, return_fake_cover_data)
         CONF_ENTITIES: ["cover.foo"],
         CONF_FOV_LEFT: 90.0,
         CONF_FOV_RIGHT: 90.0,
+        CONF_HORIZON: None,
+        CONF_HORIZON_FILE: None,
+        CONF_WINDOW_WIDTH: None,
+        CONF_OVERHANG_DEPTH: None,
+        CONF_OVERHANG_OFFSET: None,
+        CONF_FIN_DEPTH: None,
+        CONF_REVEAL_DEPTH: None,
+        CONF_BLIND_SPOTS: None,
         CONF_INVERT: False,
+        CONF_SLAT_TILT: False,
+        CONF_SLAT_DEPTH: None,
+        CONF_SLAT_SPACING: None,
+        CONF_TILT_RANGE: None,
         CONF_LUX_ENTITY: None,
         CONF_LUX_THRESHOLD: 1000.0,
         CONF_MANUAL_OVERRIDE_DETECTION_THRESHOLD: None,
@@ -567,7 +666,19 @@ async def test_initial_config_flow_with_blind_spot(hass: HomeAssistant, return_f
         CONF_ENTITIES: ["cover.foo"],
         CONF_FOV_LEFT: 30.0,
         CONF_FOV_RIGHT: 90.0,
+        CONF_HORIZON: None,
+        CONF_HORIZON_FILE: None,
+        CONF_WINDOW_WIDTH: None,
+        CONF_OVERHANG_DEPTH: None,
+        CONF_OVERHANG_OFFSET: None,
+        CONF_FIN_DEPTH: None,
+        CONF_REVEAL_DEPTH: None,
+        CONF_BLIND_SPOTS: None,
         CONF_INVERT: False,
+        CONF_SLAT_TILT: False,
+        CONF_SLAT_DEPTH: None,
+        CONF_SLAT_SPACING: None,
+        CONF_TILT_RANGE: None,
         CONF_LUX_ENTITY: "sensor.lux",
         CONF_LUX_THRESHOLD: 10000.0,
         CONF_MANUAL_OVERRIDE_DETECTION_THRESHOLD: 33,
@@ -1,19 +1,29 @@
 import logging
 from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
 
 import time_machine
 from homeassistant.components import button, cover, demo, sun, switch
-from homeassistant.components.cover import ATTR_POSITION
-from homeassistant.const import ATTR_ENTITY_ID, SERVICE_SET_COVER_POSITION, SERVICE_TURN_OFF, SERVICE_TURN_ON
-from homeassistant.core import HomeAssistant
+from homeassistant.components.cover import ATTR_POSITION, ATTR_TILT_POSITION
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    EVENT_CALL_SERVICE,
+    SERVICE_SET_COVER_POSITION,
+    SERVICE_SET_COVER_TILT_POSITION,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+)
+from homeassistant.core import Event, HomeAssistant, State
 from homeassistant.helpers.template import state_attr
 from homeassistant.setup import async_setup_component
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_capture_events,
     async_fire_time_changed,
 )
 from pytest_unordered import unordered
 
+from custom_components.automated_cover_control import coordinator as coordinator_module
 from custom_components.automated_cover_control.const import (
     CONF_BEFORE_SUNRISE_OR_AFTER_SUNSET_COVER_POSITION,
     CONF_CALC_ROUNDING,
@@ -22,14 +32,19 @@ from custom_components.automated_cover_control.const import (
     CONF_END_TIME,
     CONF_ENTITIES,
     CONF_INVERT,
+    CONF_LUX_ENTITY,
+    CONF_LUX_THRESHOLD,
     CONF_MANUAL_OVERRIDE_DURATION,
     CONF_MINIMUM_CHANGE_TIME,
     CONF_RETURN_TO_DEFAULT_AT_END_TIME,
+    CONF_SLAT_TILT,
     CONF_START_TIME,
+    CONF_START_TIME_ENTITY,
     CONF_WINDOW_AZIMUTH,
     CONF_WINDOW_HEIGHT,
     DOMAIN,
 )
+from custom_components.automated_cover_control.refresh_inputs import capture_refresh_inputs
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -958,6 +973,43 @@ async def test_with_long_time_threshold(hass: HomeAssistant):
     assert hass.states.get("binary_sensor.foo_automated_cover_control_sun_in_front_of_window").state == "on"
 
 
+async def test_covers_held_by_time_threshold_are_rechecked_when_it_expires(hass: HomeAssistant):
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # Sun in front of window.
+    options = DEFAULT_OPTIONS | {CONF_MINIMUM_CHANGE_TIME: {"minutes": 30}}
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+
+    # The cover was just moved.
+    await hass.services.async_call(
+        cover.DOMAIN,
+        SERVICE_SET_COVER_POSITION,
+        {ATTR_ENTITY_ID: TEST_COVER, ATTR_POSITION: 80},
+        blocking=True,
+    )
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    last_updated = hass.states.get(TEST_COVER).last_updated
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.data.per_cover_reasons == {TEST_COVER: "time_threshold_disallowed"}
+
+    # Even with no dependent entity change worth a refresh, the cover moves once the threshold has passed.
+    with patch.object(coordinator_module.PredicateGraph, "update", return_value=False):
+        await tm_advance_to(hass, tm, last_updated + timedelta(minutes=30, seconds=10))
+    assert coordinator.refresh_stats.triggers["time_threshold"] == 1
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    assert state_attr(hass, TEST_COVER, "current_position") == coordinator.data.target_position
+
+    traveller.stop()
+
+
 async def test_switch_off(hass: HomeAssistant):
     # San Francisco, CA
     # sunrise: 2025-10-26 07:29:00 local  sunset: 2025-10-26 18:17:00 local
@@ -1048,3 +1100,375 @@ async def test_switch_off(hass: HomeAssistant):
 
     await tm_tick_manually(hass, tm, timedelta(seconds=10))
     assert state_attr(hass, TEST_COVER, "current_position") == 100
+
+
+async def test_manual_override_without_refresh(hass: HomeAssistant):
+    # San Francisco, CA
+    # sunrise: 2025-10-26 07:29:00 local  sunset: 2025-10-26 18:17:00 local
+    #          2025-10-26 14:29:00 UTC            2025-10-27 01:17:00 UTC
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # Sun in front of window.
+    options = DEFAULT_OPTIONS
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Let the cover reach its target.
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    assert state_attr(hass, TEST_COVER, "current_position") == 30
+    assert hass.states.get("binary_sensor.foo_automated_cover_control_manual_override_detected").state == "off"
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    old_state = hass.states.get(TEST_COVER)
+    new_state = State(TEST_COVER, "open", {"current_position": 70}, last_updated=tm_as_datetime(tm))
+    with patch.object(coordinator, "async_refresh", wraps=coordinator.async_refresh) as refresh:
+        # A position matching the last target is not an override, and nothing gets published.
+        await coordinator.async_cover_entity_state_change(
+            Event("state_changed", {"entity_id": TEST_COVER, "old_state": old_state, "new_state": old_state})
+        )
+        await hass.async_block_till_done()
+        assert hass.states.get("binary_sensor.foo_automated_cover_control_manual_override_detected").state == "off"
+
+        # A manual move is published without recalculating anything.
+        await coordinator.async_cover_entity_state_change(
+            Event("state_changed", {"entity_id": TEST_COVER, "old_state": old_state, "new_state": new_state})
+        )
+        await hass.async_block_till_done()
+        assert refresh.call_count == 0
+
+    assert hass.states.get("binary_sensor.foo_automated_cover_control_manual_override_detected").state == "on"
+    assert hass.states.get("sensor.foo_automated_cover_control_state").state == "under_manual_control"
+    assert state_attr(hass, "sensor.foo_automated_cover_control_state", "per_cover_reasons") == {
+        TEST_COVER: "under_manual_control"
+    }
+    assert hass.states.get("sensor.foo_automated_cover_control_target_cover_position").state == "30"
+
+    # Both the refresh and the override are in the decision trace, most recent first.
+    traces = coordinator.decision_traces.as_diagnostics()
+    assert traces[0]["trigger"] == "cover_event"
+    assert traces[0]["covers"] == {TEST_COVER: "under_manual_control"}
+    # (Later refreshes reuse the calculation, so look for the one that did it.)
+    refresh = next(trace for trace in traces if "calculation" in trace["stages_ms"])
+    assert refresh["inputs"]["cache_hit"] is False
+    assert refresh["reason"] == "sun_in_front_of_window"
+    assert refresh["predicates"]["sun_in_front_of_window"] is True
+    assert refresh["inputs"]["solar_elevation"] is not None
+    assert refresh["duration_ms"] >= 0
+    assert {"config", "cover_checks"} <= set(refresh["stages_ms"])
+
+    # The two cover events handled above are counted, even though neither refreshed.
+    stats = coordinator.refresh_stats.as_diagnostics()
+    assert stats["refreshes_by_trigger"]["cover_event"] == 2
+    assert stats["refreshes_by_trigger"]["switch"] >= 1
+    assert stats["total_ms"]["count"] == sum(stats["refreshes_by_trigger"].values())
+    assert stats["stages_ms"]["calculation"]["p95"] <= stats["stages_ms"]["calculation"]["max"]
+    assert stats["sources"][TEST_COVER]["total"] >= 2
+    assert stats["commands"][TEST_COVER]["total"] >= 1
+    assert stats["refreshes"]["total"] == stats["total_ms"]["count"]
+
+
+async def test_simultaneous_cover_events_are_handled_together(hass: HomeAssistant):
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # Sun in front of window.
+    other_cover = "cover.hall_window"
+    options = {**DEFAULT_OPTIONS, CONF_ENTITIES: [TEST_COVER, other_cover]}
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Let the covers reach their target.
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    assert state_attr(hass, TEST_COVER, "current_position") == 30
+    assert state_attr(hass, other_cover, "current_position") == 30
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    cover_events = coordinator.refresh_stats.triggers["cover_event"]
+
+    # Both covers are moved by hand at once; neither override may be lost, and they're handled in one pass.
+    with patch.object(coordinator, "async_set_updated_data", wraps=coordinator.async_set_updated_data) as publish:
+        hass.states.async_set(TEST_COVER, "open", {"current_position": 70})
+        hass.states.async_set(other_cover, "open", {"current_position": 60})
+        await hass.async_block_till_done()
+        assert publish.call_count == 1
+
+    assert coordinator.refresh_stats.triggers["cover_event"] == cover_events + 1
+    assert state_attr(
+        hass, "binary_sensor.foo_automated_cover_control_manual_override_detected", "manually_controlled"
+    ) == unordered([TEST_COVER, other_cover])
+    assert hass.states.get("sensor.foo_automated_cover_control_state").state == "under_manual_control"
+    trace = coordinator.decision_traces.as_diagnostics()[0]
+    assert trace["covers"] == {TEST_COVER: "under_manual_control", other_cover: "under_manual_control"}
+    assert trace["inputs"] == {TEST_COVER: 70, other_cover: 60}
+
+    traveller.stop()
+
+
+async def test_simultaneous_cover_events_are_restored_in_one_call(hass: HomeAssistant):
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # Sun in front of window.
+    other_cover = "cover.hall_window"
+    options = {**DEFAULT_OPTIONS, CONF_ENTITIES: [TEST_COVER, other_cover]}
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Let the covers reach their target.
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    assert state_attr(hass, TEST_COVER, "current_position") == 30
+    assert state_attr(hass, other_cover, "current_position") == 30
+
+    # Without override detection, covers that move are put back; both of them with the same call.
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    await coordinator.async_disable_detection_of_manual_override(False)
+    calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+    hass.states.async_set(TEST_COVER, "open", {"current_position": 70})
+    hass.states.async_set(other_cover, "open", {"current_position": 60})
+    await hass.async_block_till_done()
+
+    assert [
+        (call.data["service"], call.data["service_data"]) for call in calls if call.data["domain"] == cover.DOMAIN
+    ] == [(SERVICE_SET_COVER_POSITION, {ATTR_ENTITY_ID: [TEST_COVER, other_cover], ATTR_POSITION: 30})]
+
+    traveller.stop()
+
+
+async def test_control_window_from_entity_is_cached_until_it_changes(hass: HomeAssistant):
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # 12:04 local, sun in front of window.
+    start_entity = "input_datetime.start"
+    options = DEFAULT_OPTIONS | {CONF_START_TIME_ENTITY: start_entity}
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+    hass.states.async_set(start_entity, "13:00:00")  # Local
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert hass.states.get("sensor.foo_automated_cover_control_state").state == "outside_control_time_range"
+
+    # Later refreshes on the same day reuse the resolved window.
+    with patch.object(coordinator_module.parser, "parse", wraps=coordinator_module.parser.parse) as parse:
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        assert parse.call_count == 0
+
+        # Until the start entity changes.
+        hass.states.async_set(start_entity, "12:00:00")
+        await hass.async_block_till_done()
+        await coordinator.async_refresh()
+        assert parse.call_count == 1
+
+    assert hass.states.get("sensor.foo_automated_cover_control_state").state == "sun_in_front_of_window"
+
+    # A new day resolves the window again, against that day's date.
+    tm.shift(timedelta(days=1))
+    inputs = capture_refresh_inputs(hass, coordinator.get_refresh_input_entities())
+    assert start_entity in inputs.states
+    assert coordinator._get_control_window(inputs).start == datetime.fromisoformat("2025-10-27T12:00:00-07:00")
+
+    traveller.stop()
+
+
+async def test_repeated_refresh_reuses_cached_calculation(hass: HomeAssistant):
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # Sun in front of window.
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=DEFAULT_OPTIONS)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Let the cover reach its target, and check it's there.
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    assert state_attr(hass, TEST_COVER, "current_position") == 30
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    await coordinator.async_refresh()
+    assert coordinator.data.per_cover_reasons == {TEST_COVER: "already_at_target"}
+
+    # The sun hasn't moved and nothing else has changed, so neither the calculation nor the cover checks run again.
+    hits = coordinator.calculation_cache.hits
+    with (
+        patch.object(
+            coordinator_module,
+            "calculate_sun_tracking_vertical_cover_position",
+            wraps=coordinator_module.calculate_sun_tracking_vertical_cover_position,
+        ) as calculate,
+        patch.object(
+            coordinator, "_get_reason_to_leave_cover_alone", wraps=coordinator._get_reason_to_leave_cover_alone
+        ) as cover_checks,
+    ):
+        await coordinator.async_refresh()
+        assert calculate.call_count == 0
+        assert cover_checks.call_count == 0
+
+        # A moved cover is checked again, though the calculation is still reused.
+        hass.states.async_set(TEST_COVER, "open", {"current_position": 70})
+        await hass.async_block_till_done()
+        await coordinator.async_refresh()
+        assert calculate.call_count == 0
+        assert cover_checks.call_count >= 1
+
+    assert coordinator.calculation_cache.hits == hits + 2
+    assert coordinator.data.target_position == 30
+    assert coordinator.decision_traces.as_diagnostics()[0]["inputs"]["cache_hit"] is True
+
+    traveller.stop()
+
+
+async def test_dependent_entity_change_refreshes_only_when_its_predicate_changes(hass: HomeAssistant):
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # Sun in front of window.
+    lux_entity = "sensor.lux"
+    options = DEFAULT_OPTIONS | {CONF_LUX_ENTITY: lux_entity, CONF_LUX_THRESHOLD: 1000}
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+    hass.states.async_set(lux_entity, "2000")
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    assert hass.states.get("sensor.foo_automated_cover_control_state").state == "sun_in_front_of_window"
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    with patch.object(coordinator, "async_refresh", wraps=coordinator.async_refresh) as refresh:
+        # Still above the threshold, so nothing downstream can change.
+        hass.states.async_set(lux_entity, "3000")
+        await hass.async_block_till_done()
+        assert refresh.call_count == 0
+        assert coordinator.predicates.unchanged == 1
+
+        # Dropping below it does.
+        hass.states.async_set(lux_entity, "500")
+        await hass.async_block_till_done()
+        assert refresh.call_count == 1
+
+    assert hass.states.get("sensor.foo_automated_cover_control_state").state == "lux_below_threshold"
+    assert coordinator.predicates.as_diagnostics()["values"]["lux_above_threshold"] is False
+
+    traveller.stop()
+
+
+async def test_slat_tilt_is_sent_with_positions_in_one_call_per_command(hass: HomeAssistant):
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # Sun in front of window.
+    hall_cover = "cover.hall_window"  # Doesn't tilt.
+    options = DEFAULT_OPTIONS | {CONF_ENTITIES: [TEST_COVER, hall_cover], CONF_SLAT_TILT: True}
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+    calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    target_tilt = coordinator.data.target_tilt
+    assert target_tilt is not None
+
+    # Both covers get their position in one call; only the one that tilts gets the tilt.
+    cover_calls = [
+        (call.data["service"], call.data["service_data"]) for call in calls if call.data["domain"] == cover.DOMAIN
+    ]
+    # Setup refreshes more than once before the covers get going, so the same calls can come up again.
+    distinct_calls = [call for n, call in enumerate(cover_calls) if call not in cover_calls[:n]]
+    # The tilt goes second, as moving the cover can reset the slats.
+    assert distinct_calls == [
+        (SERVICE_SET_COVER_POSITION, {ATTR_ENTITY_ID: [TEST_COVER, hall_cover], ATTR_POSITION: 30}),
+        (SERVICE_SET_COVER_TILT_POSITION, {ATTR_ENTITY_ID: [TEST_COVER], ATTR_TILT_POSITION: target_tilt}),
+    ]
+
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    assert state_attr(hass, TEST_COVER, "current_position") == 30
+    assert state_attr(hass, TEST_COVER, "current_tilt_position") == target_tilt
+    assert state_attr(hass, hall_cover, "current_position") == 30
+
+    # Once they're all there, there's nothing more to send.
+    calls.clear()
+    await coordinator.async_refresh()
+    assert coordinator.data.per_cover_reasons == {TEST_COVER: "already_at_target", hall_cover: "already_at_target"}
+    assert not [call for call in calls if call.data["domain"] == cover.DOMAIN]
+
+    traveller.stop()
+
+
+async def test_manual_tilt_change_is_an_override(hass: HomeAssistant):
+    now = datetime.fromisoformat("2025-10-26T19:04:00Z")  # Sun in front of window.
+    options = DEFAULT_OPTIONS | {CONF_SLAT_TILT: True}
+    traveller = time_machine.travel(now)
+    tm = traveller.start()
+
+    # Set up test harness.
+    await setup_home_assistant_test(hass)
+    calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+
+    # Set up automated cover control.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    target_tilt = coordinator.data.target_tilt
+
+    # Let the cover reach its target; moving and tilting it counts as one command.
+    await tm_tick_manually(hass, tm, timedelta(seconds=10))
+    assert state_attr(hass, TEST_COVER, "current_position") == 30
+    assert state_attr(hass, TEST_COVER, "current_tilt_position") == target_tilt
+    assert hass.states.get("binary_sensor.foo_automated_cover_control_manual_override_detected").state == "off"
+    moves = [call for call in calls if call.data["service"] == SERVICE_SET_COVER_POSITION]
+    assert len(moves) < len([call for call in calls if call.data["domain"] == cover.DOMAIN])
+    assert coordinator.refresh_stats.as_diagnostics()["commands"][TEST_COVER]["total"] == len(moves)
+
+    # Only the slats are turned by hand; they're left where they were put.
+    manual_tilt = 0 if target_tilt > 50 else 100
+    await hass.services.async_call(
+        cover.DOMAIN,
+        SERVICE_SET_COVER_TILT_POSITION,
+        {ATTR_ENTITY_ID: TEST_COVER, ATTR_TILT_POSITION: manual_tilt},
+        blocking=True,
+    )
+    await tm_tick_manually(hass, tm, timedelta(seconds=20))
+    assert state_attr(hass, TEST_COVER, "current_tilt_position") == manual_tilt
+    assert state_attr(hass, TEST_COVER, "current_position") == 30
+    assert hass.states.get("binary_sensor.foo_automated_cover_control_manual_override_detected").state == "on"
+    assert coordinator.data.per_cover_reasons == {TEST_COVER: "under_manual_control"}
+
+    traveller.stop()
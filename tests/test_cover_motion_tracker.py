@@ -0,0 +1,116 @@
+import logging
+from datetime import UTC, datetime, timedelta
+
+from homeassistant.core import State
+
+from custom_components.automated_cover_control.cover_motion_tracker import (
+    CoverMotionTracker,
+)
+from custom_components.automated_cover_control.log_context_adapter import (
+    LogContextAdapter,
+)
+
+
+def cover_state(state: str, position: int) -> State:
+    return State(entity_id="cover.foo", state=state, attributes={"current_position": position})
+
+
+def test_exact_position_reached():
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    tracker = CoverMotionTracker(logger)
+    now = datetime.fromisoformat("2025-10-26T14:00:00Z")
+
+    tracker.start("cover.foo", 50, now)
+    assert len(tracker) == 1
+    assert tracker.target_position("cover.foo") == 50
+
+    assert tracker.handle_state_change("cover.foo", cover_state("opening", 30), now)
+    assert len(tracker) == 1
+    assert tracker.handle_state_change("cover.foo", cover_state("open", 50), now)
+    assert len(tracker) == 0
+
+    # Not tracked anymore, so the change isn't swallowed.
+    assert not tracker.handle_state_change("cover.foo", cover_state("open", 50), now)
+
+
+def test_position_within_tolerance():
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    tracker = CoverMotionTracker(logger, tolerance=1)
+    now = datetime.fromisoformat("2025-10-26T14:00:00Z")
+
+    tracker.start("cover.foo", 50, now)
+
+    # Still moving, so a nearby position doesn't count.
+    assert tracker.handle_state_change("cover.foo", cover_state("opening", 49), now)
+    assert len(tracker) == 1
+
+    # Stopped one off from the target.
+    assert tracker.handle_state_change("cover.foo", cover_state("open", 49), now)
+    assert len(tracker) == 0
+
+    tracker.start("cover.foo", 50, now)
+    assert tracker.handle_state_change("cover.foo", cover_state("open", 47), now)
+    assert len(tracker) == 1
+
+
+def test_tilt_reached():
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    tracker = CoverMotionTracker(logger)
+    now = datetime.fromisoformat("2025-10-26T14:00:00Z")
+
+    tracker.start("cover.foo", 50, now, target_tilt=40)
+
+    # At the position, but the slats are still turning.
+    tilting = State("cover.foo", "open", {"current_position": 50, "current_tilt_position": 70})
+    assert tracker.handle_state_change("cover.foo", tilting, now)
+    assert len(tracker) == 1
+    assert not tracker.is_settled(tilting, 50, 40)
+
+    tilted = State("cover.foo", "open", {"current_position": 50, "current_tilt_position": 41})
+    assert tracker.is_settled(tilted, 50, 40)
+    assert tracker.handle_state_change("cover.foo", tilted, now)
+    assert len(tracker) == 0
+
+
+def test_deadline():
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    tracker = CoverMotionTracker(logger, timeout=timedelta(minutes=3))
+    now = datetime.fromisoformat("2025-10-26T14:00:00Z")
+
+    tracker.start("cover.foo", 50, now)
+    tracker.start("cover.bar", 20, now + timedelta(minutes=1))
+    assert tracker.next_deadline() == now + timedelta(minutes=3)
+
+    # Past the deadline, state changes are no longer swallowed.
+    assert not tracker.handle_state_change("cover.foo", cover_state("open", 49), now + timedelta(minutes=4))
+    assert len(tracker) == 1
+    assert tracker.next_deadline() == now + timedelta(minutes=4)
+
+
+def test_expire():
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    tracker = CoverMotionTracker(logger, timeout=timedelta(minutes=3))
+    now = datetime.now(tz=UTC)
+
+    tracker.start("cover.foo", 50, now)
+    tracker.start("cover.bar", 20, now + timedelta(minutes=2), target_tilt=40)
+
+    assert tracker.expire(now + timedelta(minutes=1)) == {}
+    assert tracker.expire(now + timedelta(minutes=4)) == {"cover.foo": (50, None)}
+    assert len(tracker) == 1
+    assert tracker.expire(now + timedelta(minutes=6)) == {"cover.bar": (20, 40)}
+    assert len(tracker) == 0
+    assert tracker.next_deadline() is None
+
+
+def test_retain():
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    tracker = CoverMotionTracker(logger)
+
+    tracker.start("cover.foo", 50)
+    tracker.start("cover.bar", 20)
+    tracker.retain(["cover.bar", "cover.baz"])
+
+    assert len(tracker) == 1
+    assert tracker.target_position("cover.foo") is None
+    assert tracker.target_position("cover.bar") == 20
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from custom_components.automated_cover_control.decision_trace import (
+    COMMANDED,
+    DecisionTrace,
+    DecisionTraceBuffer,
+)
+from custom_components.automated_cover_control.why import (
+    CoverControlReason,
+    CoverControlTweaks,
+)
+
+
+def test_as_dict():
+    started = datetime.fromisoformat("2025-10-26T19:04:00Z")
+    trace = DecisionTrace(
+        started=started,
+        trigger="refresh",
+        inputs={"solar_elevation": 12.34567, "sunrise": started},
+        predicates={"window_open": False, "calculated_percentage": np.float64(41.0), "sunny": np.bool_(True)},
+        reason=CoverControlReason.SUN_IN_FRONT_OF_WINDOW,
+        target_position=41,
+        tweaks=[CoverControlTweaks.CLIPPED_TO_MIN],
+        covers={"cover.foo": COMMANDED, "cover.bar": CoverControlReason.ALREADY_AT_TARGET},
+        duration_ms=1.5,
+        stages_ms={"calculation": 0.25},
+    )
+    assert trace.as_dict() == {
+        "started": "2025-10-26T19:04:00+00:00",
+        "trigger": "refresh",
+        "inputs": {"solar_elevation": 12.346, "sunrise": "2025-10-26T19:04:00+00:00"},
+        "predicates": {"window_open": False, "calculated_percentage": 41.0, "sunny": True},
+        "reason": "sun_in_front_of_window",
+        "target_position": 41,
+        "tweaks": ["clipped_to_min"],
+        "covers": {"cover.foo": "commanded", "cover.bar": "already_at_target"},
+        "duration_ms": 1.5,
+        "stages_ms": {"calculation": 0.25},
+        "error": None,
+    }
+
+
+def test_buffer_is_bounded():
+    started = datetime.fromisoformat("2025-10-26T19:04:00Z")
+    traces = DecisionTraceBuffer(size=3)
+    for minute in range(5):
+        traces.record(DecisionTrace(started=started + timedelta(minutes=minute), trigger="refresh"))
+
+    assert len(traces) == 3
+    assert [trace.started.minute for trace in traces] == [6, 7, 8]
+    # Most recent first.
+    assert [trace["started"] for trace in traces.as_diagnostics()] == [
+        "2025-10-26T19:08:00+00:00",
+        "2025-10-26T19:07:00+00:00",
+        "2025-10-26T19:06:00+00:00",
+    ]
@@ -36,3 +36,11 @@ async def test_get_diagnostics(hass: HomeAssistant, hass_client: ClientSessionGe
     assert diag["title"] == "Automated Cover Control"
     assert diag["config_data"] == {"name": "foo"}
     assert diag["config_options"] == OPTIONS
+    assert set(diag["config"]) == {"automation", "blind_spot", "sensor", "window", "manual_override"}
+    assert diag["config"]["window"]["window_azimuth"] == "200.0"
+    assert diag["coordinator"]["suppressed_state_writes"] >= 0
+    # _async_update_data is mocked out, so nothing has been timed or traced.
+    assert diag["coordinator"]["refresh_stats"]["refreshes_by_trigger"] == {}
+    assert diag["coordinator"]["decision_trace"] == []
+    assert diag["coordinator"]["calculation_cache"]["hits"] == 0
+    assert diag["coordinator"]["predicates"]["unchanged"] == 0
@@ -0,0 +1,71 @@
+import pytest
+
+from custom_components.automated_cover_control.config import WindowConfiguration
+from custom_components.automated_cover_control.const import CONF_HORIZON
+from custom_components.automated_cover_control.horizon import HorizonProfile, parse_horizon, read_horizon_file
+
+PVGIS_HORIZON = """Latitude (decimal degrees):\t37.800
+Longitude (decimal degrees):\t-122.460
+Horizon height (degrees):\tcalculated
+
+A\tH_hor\tA_sun(w)\tH_sun(w)\tA_sun(s)\tH_sun(s)
+-180.0\t1.9\t-180.0\t0.0\t-180.0\t0.0
+-90.0\t12.2\t-53.6\t0.0\t-119.5\t0.0
+0.0\t3.4\t0.0\t28.8\t0.0\t75.6
+90.0\t0.8\t53.6\t0.0\t119.5\t0.0
+
+A: Azimuth (0 = S, 90 = W, -90 = E) (degree)
+H_hor: Horizon height (degree)
+"""
+
+
+def test_parse_csv():
+    assert parse_horizon("azimuth,elevation\n0,5\n90;10\n180\t20.5\n") == [(0.0, 5.0), (90.0, 10.0), (180.0, 20.5)]
+
+
+def test_parse_pvgis():
+    # PVGIS measures azimuth from south, east negative.
+    assert parse_horizon(PVGIS_HORIZON) == [(0.0, 1.9), (90.0, 12.2), (180.0, 3.4), (270.0, 0.8)]
+
+
+def test_parse_pvgis_user_horizon(tmp_path):
+    # One elevation per line, equally spaced clockwise from north.
+    path = tmp_path / "horizon.txt"
+    path.write_text("5\n10\n20\n0\n")
+    assert read_horizon_file(path) == [(0.0, 5.0), (90.0, 10.0), (180.0, 20.0), (270.0, 0.0)]
+
+
+@pytest.mark.parametrize("text", ["", "azimuth,elevation\n", "0,95\n"])
+def test_parse_invalid(text):
+    with pytest.raises(ValueError):
+        parse_horizon(text)
+
+
+def test_profile_lookup():
+    profile = HorizonProfile([(0, 5), (90, 10), (180, 20), (270, 0)])
+    assert len(profile.elevations) == 360
+    # Bins are interpolated at their centres, wrapping around north.
+    assert profile.minimum_elevation(45.0) == pytest.approx(7.53, abs=0.01)
+    assert profile.minimum_elevation(359.9) == profile.minimum_elevation(-0.1)
+    assert profile.minimum_elevation(359.9) == pytest.approx(4.97, abs=0.01)
+    assert profile.is_sun_hidden(180.0, 19.0)
+    assert not profile.is_sun_hidden(180.0, 21.0)
+    assert profile.minimum_elevations([45.0, 359.9, 720.5]).tolist() == [
+        profile.minimum_elevation(azimuth) for azimuth in (45.0, 359.9, 720.5)
+    ]
+
+
+def test_configuration_rebuilds_profile_only_when_it_changes():
+    window = WindowConfiguration()
+    options = {CONF_HORIZON: [[0, 5], [180, 20]]}
+    window.read(options)
+    profile = window.horizon
+    assert profile.minimum_elevation(180.0) == pytest.approx(19.96, abs=0.01)
+
+    window.read(options)
+    assert window.horizon is profile
+
+    window.read({CONF_HORIZON: [[0, 5], [180, 30]]})
+    assert window.horizon is not profile
+    window.read({})
+    assert window.horizon is None
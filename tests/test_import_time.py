@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PACKAGE = "custom_components.automated_cover_control"
+
+# Only needed by the simulator/backtest, or once a day in the executor; importing the integration mustn't load them.
+DEFERRED_MODULES = {
+    "numpy",
+    "pandas",
+    f"{PACKAGE}.backtest",
+    f"{PACKAGE}.batch_calculation",
+    f"{PACKAGE}.position_table",
+    f"{PACKAGE}.simulation",
+    f"{PACKAGE}.solar_position",
+}
+
+# Generous; the integration's own modules take a few tens of milliseconds on a desktop.
+MAX_OWN_IMPORT_TIME_US = 250_000
+
+
+def _import_times() -> dict[str, int]:
+    # python -X importtime reports "import time: self [us] | cumulative | imported package" on stderr.
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parents[1],
+        env={**os.environ, "PYTHONPATH": str(Path(__file__).parents[1])},
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(self_time)
+    return times
+
+
+def test_import_time():
+    times = _import_times()
+    assert PACKAGE in times
+    assert DEFERRED_MODULES.isdisjoint(times)
+    assert sum(t for module, t in times.items() if module.startswith(PACKAGE)) < MAX_OWN_IMPORT_TIME_US
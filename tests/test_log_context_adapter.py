@@ -0,0 +1,43 @@
+import logging
+from unittest.mock import MagicMock, patch
+
+from custom_components.automated_cover_control.log_context_adapter import (
+    LazyLogArg,
+    LogContextAdapter,
+)
+
+
+def test_prefix(caplog):
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    logger.set_config_name("foo")
+
+    with caplog.at_level(logging.DEBUG, logger=__name__):
+        logger.debug("hello %s", "world")
+    assert caplog.messages == ["[foo] hello world"]
+
+
+def test_suppressed_messages_are_not_processed(caplog):
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    logger.set_config_name("foo")
+    expensive = MagicMock(return_value="expensive")
+
+    with caplog.at_level(logging.INFO, logger=__name__), patch.object(logger, "process") as process:
+        logger.debug("value: %s", LazyLogArg(expensive))
+    process.assert_not_called()
+    expensive.assert_not_called()
+
+    with caplog.at_level(logging.DEBUG, logger=__name__):
+        logger.debug("value: %s", LazyLogArg(expensive))
+    expensive.assert_called()
+    assert caplog.messages == ["[foo] value: expensive"]
+
+
+def test_records_point_at_the_caller(caplog):
+    logger = LogContextAdapter(logging.getLogger(__name__))
+
+    with caplog.at_level(logging.DEBUG, logger=__name__):
+        logger.debug("debug")
+        logger.info("info")
+    assert [(record.filename, record.funcName) for record in caplog.records] == [
+        ("test_log_context_adapter.py", "test_records_point_at_the_caller"),
+    ] * 2
@@ -150,6 +150,35 @@ def test_manual_overrides_detection_threshold():
     assert manager.is_cover_manual("cover.foo")
 
 
+def test_manual_overrides_tilt():
+    logger = LogContextAdapter(logging.getLogger(__name__))
+    manager = ManualOverrideManager(logger)
+    manager.update_config({CONF_MANUAL_OVERRIDE_DETECTION_THRESHOLD: 5})
+    manager.enable_detection()
+
+    # Only the slats were turned; without a target tilt, that goes unnoticed.
+    state = State(
+        entity_id="cover.foo",
+        state="open",
+        last_updated=datetime.now(),
+        attributes={"current_position": 22, "current_tilt_position": 80},
+    )
+    manager.handle_state_change("cover.foo", state, 22)
+    assert not manager.is_any_cover_under_manual_control()
+
+    # Within the threshold of the target tilt.
+    manager.handle_state_change("cover.foo", state, 22, 77)
+    assert not manager.is_any_cover_under_manual_control()
+
+    manager.handle_state_change("cover.foo", state, 22, 40)
+    assert manager.is_cover_manual("cover.foo")
+
+    # Covers that don't report a tilt are only checked by position.
+    state = State(entity_id="cover.bar", state="open", last_updated=datetime.now(), attributes={"current_position": 22})
+    manager.handle_state_change("cover.bar", state, 22, 40)
+    assert not manager.is_cover_manual("cover.bar")
+
+
 def test_manual_overrides_rearm_disabled():
     logger = LogContextAdapter(logging.getLogger(__name__))
     manager = ManualOverrideManager(logger)
@@ -0,0 +1,71 @@
+import gc
+import logging
+import tracemalloc
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_mock_service
+
+import custom_components.automated_cover_control
+from custom_components.automated_cover_control.const import (
+    CONF_DEFAULT_COVER_POSITION,
+    CONF_DISTANCE_FROM_WINDOW,
+    CONF_ENTITIES,
+    CONF_WINDOW_AZIMUTH,
+    CONF_WINDOW_HEIGHT,
+    DOMAIN,
+)
+
+ENTRY_COUNT = 200
+# Per-entry budgets, in bytes: everything (mostly Home Assistant's registries and state machine) and just the
+# allocations made by this integration's own code. Both leave some headroom over what's measured today.
+TOTAL_BUDGET_PER_ENTRY = 256 * 1024
+INTEGRATION_BUDGET_PER_ENTRY = 32 * 1024
+
+OPTIONS = {
+    CONF_DEFAULT_COVER_POSITION: 100,
+    CONF_DISTANCE_FROM_WINDOW: 0.1,
+    CONF_ENTITIES: ["cover.foo"],
+    CONF_WINDOW_AZIMUTH: 200,
+    CONF_WINDOW_HEIGHT: 1.0,
+}
+
+
+async def test_memory_per_entry(hass: HomeAssistant, caplog):
+    # Captured debug records would otherwise dominate the measurement.
+    caplog.set_level(logging.WARNING)
+    # Entries are measured as they are in steady state, after a successful refresh that commanded their cover.
+    async_mock_service(hass, "cover", "set_cover_position")
+    async_mock_service(hass, "cover", "set_cover_tilt_position")
+    # Warm up with one entry first, so imports and one-off platform setup aren't counted against every entry.
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "warmup"}, options=OPTIONS)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id].last_update_success
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for n in range(ENTRY_COUNT):
+            entry = MockConfigEntry(domain=DOMAIN, data={"name": f"window {n}"}, options=OPTIONS)
+            entry.add_to_hass(hass)
+            await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    def per_entry(snapshot_filter: list[tracemalloc.Filter]) -> float:
+        diff = after.filter_traces(snapshot_filter).compare_to(before.filter_traces(snapshot_filter), "filename")
+        return sum(stat.size_diff for stat in diff) / ENTRY_COUNT
+
+    coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in hass.config_entries.async_entries(DOMAIN)]
+    assert len(coordinators) == ENTRY_COUNT + 1
+    assert all(coordinator.last_update_success for coordinator in coordinators)
+
+    package = tracemalloc.Filter(True, str(Path(custom_components.automated_cover_control.__file__).parent / "*"))
+    assert per_entry([]) < TOTAL_BUDGET_PER_ENTRY
+    assert per_entry([package]) < INTEGRATION_BUDGET_PER_ENTRY
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from custom_components.automated_cover_control.config import WindowConfiguration
+from custom_components.automated_cover_control.position_table import PositionTable
+from custom_components.automated_cover_control.shading import WindowShading
+
+WINDOW = WindowConfiguration(window_height=2.0, distance_from_window=0.5)
+
+
+def _exact(gamma, elevation):
+    height = np.clip(0.5 / np.cos(np.radians(gamma)) * np.tan(np.radians(elevation)), 0, 2.0)
+    return height / 2.0 * 100
+
+
+@pytest.mark.parametrize(("resolution", "tolerance"), [(0.1, 0.01), (0.5, 0.1)])
+def test_close_to_formula(resolution, tolerance):
+    table = PositionTable(WINDOW, resolution)
+    rng = np.random.default_rng(0)
+    gamma = rng.uniform(-85, 85, 10_000)
+    elevation = rng.uniform(0, 89, 10_000)
+
+    error = np.abs(table.percentages(gamma, elevation) - _exact(gamma, elevation))
+    # Interpolation is least accurate where the cover reaches the top of the window, and the formula has a kink.
+    assert np.percentile(error, 99) < tolerance
+    assert error.max() < 20 * tolerance
+
+
+def test_grid_points_are_exact():
+    table = PositionTable(WINDOW, 0.5)
+    assert table.percentage(30.0, 20.0) == pytest.approx(_exact(30.0, 20.0), rel=1e-6)
+    assert table.percentage(0.0, 0.0) == 0.0
+    assert table.percentage(-10.0, 89.5) == 100.0
+
+
+def test_scalar_matches_array():
+    table = PositionTable(WINDOW)
+    gamma = np.array([-89.9, -42.3, 0.0, 0.26, 17.77, 60.01, 90.0])
+    elevation = np.array([0.0, 12.34, 45.0, 3.3, 29.28, 5.05, 10.0])
+    assert table.percentages(gamma, elevation).tolist() == [
+        table.percentage(g, e) for g, e in zip(gamma.tolist(), elevation.tolist(), strict=True)
+    ]
+
+
+def test_out_of_range():
+    table = PositionTable(WINDOW)
+    # Below the horizon, the cover's fully down; behind the window, there's nothing to track.
+    assert table.percentage(10.0, -5.0) == 0.0
+    assert table.percentages(np.array([120.0, -150.0]), np.array([30.0, 30.0])).tolist() == [0.0, 0.0]
+
+
+def test_includes_shading():
+    window = WindowConfiguration(window_height=2.0, distance_from_window=0.5)
+    window.shading = WindowShading(2.0, overhang_depth=1.0, overhang_offset=0.5)
+    table = PositionTable(window, 0.5)
+    # Away from the point where the overhang lets the cover open, the table follows the shaded calculation.
+    for gamma, elevation in [(0.0, 10.0), (30.0, 20.0), (0.0, 60.0), (-20.0, 80.0)]:
+        expected = window.shading.percentage(gamma, elevation, _exact(gamma, elevation))
+        assert table.percentage(gamma, elevation) == pytest.approx(expected, rel=1e-5)
+
+
+def test_size():
+    assert PositionTable(WINDOW, 0.5).nbytes == 361 * 181 * 4
+    with pytest.raises(ValueError):
+        PositionTable(WindowConfiguration())
@@ -0,0 +1,47 @@
+from homeassistant.core import State
+
+from custom_components.automated_cover_control.predicate_graph import PredicateGraph
+
+
+def _graph() -> tuple[PredicateGraph, list[str]]:
+    evaluated = []
+
+    def _above(states):
+        evaluated.append("above")
+        return float(states["sensor.lux"].state) > 1000
+
+    def _open(states):
+        evaluated.append("open")
+        return states["binary_sensor.window"].state == "on"
+
+    graph = PredicateGraph()
+    graph.add("lux_above_threshold", ["sensor.lux"], _above)
+    graph.add("window_open", ["binary_sensor.window", None], _open)
+    return graph, evaluated
+
+
+def test_change_reevaluates_only_its_dependents():
+    graph, evaluated = _graph()
+    graph.evaluate_all(
+        {"sensor.lux": State("sensor.lux", "2000"), "binary_sensor.window": State("binary_sensor.window", "off")}
+    )
+    evaluated.clear()
+
+    assert not graph.update("sensor.lux", {"sensor.lux": State("sensor.lux", "3000")})
+    assert evaluated == ["above"]
+    assert graph.unchanged == 1
+
+    assert graph.update("sensor.lux", {"sensor.lux": State("sensor.lux", "500")})
+    assert graph.as_diagnostics()["values"] == {"lux_above_threshold": False, "window_open": False}
+    assert graph.unchanged == 1
+
+
+def test_unknown_inputs_and_unevaluated_predicates_count_as_changes():
+    graph, _ = _graph()
+    assert graph.update("sensor.other", {})
+    assert graph.update("binary_sensor.window", {"binary_sensor.window": State("binary_sensor.window", "off")})
+    assert not graph.update("binary_sensor.window", {"binary_sensor.window": State("binary_sensor.window", "off")})
+    assert graph.as_diagnostics()["inputs"] == {
+        "sensor.lux": ["lux_above_threshold"],
+        "binary_sensor.window": ["window_open"],
+    }
@@ -0,0 +1,35 @@
+from datetime import UTC, datetime
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.automated_cover_control.refresh_inputs import capture_refresh_inputs
+
+NOW = datetime.fromisoformat("2025-10-26T19:04:00Z")
+
+
+async def test_capture_refresh_inputs(hass: HomeAssistant):
+    hass.states.async_set("sun.sun", "above_horizon", {"azimuth": 130.0, "elevation": 25.0})
+    hass.states.async_set("cover.foo", "open", {"current_position": 30})
+
+    inputs = capture_refresh_inputs(hass, ["sun.sun", "cover.foo", "cover.missing"], NOW)
+
+    assert inputs.now == NOW
+    assert inputs.solar_azimuth == 130.0
+    assert inputs.solar_elevation == 25.0
+    assert inputs.attribute("cover.foo", "current_position") == 30
+    assert inputs.attribute("cover.missing", "current_position") is None
+    assert "cover.missing" not in inputs.states
+
+    # Later changes don't leak into a snapshot that's already been taken.
+    hass.states.async_set("cover.foo", "open", {"current_position": 70})
+    assert inputs.attribute("cover.foo", "current_position") == 30
+    with pytest.raises(TypeError):
+        inputs.states["cover.foo"] = hass.states.get("cover.foo")
+
+
+async def test_capture_refresh_inputs_defaults_to_now(hass: HomeAssistant):
+    before = datetime.now(tz=UTC)
+    inputs = capture_refresh_inputs(hass, [])
+    assert before <= inputs.now <= datetime.now(tz=UTC)
+    assert inputs.solar_azimuth is None
@@ -0,0 +1,97 @@
+from custom_components.automated_cover_control.refresh_stats import (
+    EventRate,
+    RefreshStats,
+    RefreshTrigger,
+    StageTimer,
+)
+
+
+def test_stage_timer_accumulates():
+    timer = StageTimer()
+    with timer.stage("cover_checks"):
+        pass
+    with timer.stage("cover_checks"):
+        pass
+    with timer.stage("calculation"):
+        pass
+
+    assert set(timer.durations_ms) == {"cover_checks", "calculation"}
+    assert timer.elapsed_ms() >= sum(timer.durations_ms.values())
+
+
+def test_percentiles():
+    stats = RefreshStats(window=100)
+    for duration in range(1, 201):
+        timer = StageTimer()
+        timer.durations_ms["calculation"] = float(duration)
+        stats.record(RefreshTrigger.DEPENDENT_ENTITY if duration % 2 else RefreshTrigger.SWITCH, timer)
+
+    diag = stats.as_diagnostics()
+    assert diag["refreshes_by_trigger"] == {"dependent_entity": 100, "switch": 100}
+    # Only the most recent 100 samples count.
+    assert diag["stages_ms"]["calculation"] == {"count": 100, "p50": 151.0, "p95": 196.0, "max": 200.0}
+    assert diag["total_ms"]["count"] == 100
+
+
+def test_empty():
+    diag = RefreshStats().as_diagnostics()
+    assert diag["refreshes_by_trigger"] == {}
+    assert diag["total_ms"] == {"count": 0, "p50": None, "p95": None, "max": None}
+    assert diag["stages_ms"] == {}
+    assert diag["refreshes"]["total"] == 0
+    assert diag["sources"] == {}
+    assert diag["commands"] == {}
+
+
+def test_event_rate_windows():
+    rate = EventRate()
+    start = 1_000_020.0  # On a minute boundary.
+    for minute in range(90):
+        rate.add(start + minute * 60)
+    rate.add(start + 89 * 60 + 30)
+
+    assert rate.as_diagnostics(start + 89 * 60 + 45) == {
+        "total": 91,
+        "last_5m": 6,
+        "per_minute_5m": 1.2,
+        "last_1h": 61,
+        "per_minute_1h": 1.017,
+    }
+    # Old buckets are dropped, not just excluded.
+    assert rate.as_diagnostics(start + 200 * 60) == {
+        "total": 91,
+        "last_5m": 0,
+        "per_minute_5m": 0.0,
+        "last_1h": 0,
+        "per_minute_1h": 0.0,
+    }
+    assert len(rate._buckets) == 0
+
+
+def test_sources_and_commands():
+    stats = RefreshStats()
+    for _ in range(3):
+        stats.record_source("sensor.lux")
+    stats.record_source("sun.sun")
+    stats.record_command("cover.foo")
+    stats.record_without_command()
+
+    diag = stats.as_diagnostics()
+    assert list(diag["sources"]) == ["sensor.lux", "sun.sun"]
+    assert diag["sources"]["sensor.lux"]["last_5m"] == 3
+    assert diag["commands"]["cover.foo"]["total"] == 1
+    assert diag["refreshes_without_command"]["total"] == 1
+
+
+def test_retain():
+    stats = RefreshStats()
+    for entity_id in ["sun.sun", "sensor.lux", "cover.foo"]:
+        stats.record_source(entity_id)
+    for entity_id in ["cover.foo", "cover.bar"]:
+        stats.record_command(entity_id)
+
+    stats.retain(["sun.sun", "cover.foo"], ["cover.foo"])
+
+    diag = stats.as_diagnostics()
+    assert list(diag["sources"]) == ["sun.sun", "cover.foo"]
+    assert list(diag["commands"]) == ["cover.foo"]
@@ -1,4 +1,7 @@
+from dataclasses import replace
+
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.automated_cover_control.const import (
@@ -46,3 +49,71 @@ async def test_sensors(hass: HomeAssistant, return_fake_cover_data):
     assert state
     assert state.state == "sun_not_in_front_of_window"
     assert state.attributes["tweaks"] == ["after_sunset_or_before_sunrise"]
+    assert "config" not in state.attributes
+
+    # Diagnostic sensors are disabled by default.
+    assert hass.states.get("sensor.foo_automated_cover_control_refresh_duration") is None
+    entity = er.async_get(hass).async_get("sensor.foo_automated_cover_control_refresh_count")
+    assert entity
+    assert entity.disabled_by == er.RegistryEntryDisabler.INTEGRATION
+
+
+async def test_diagnostic_sensors(hass: HomeAssistant, return_fake_cover_data):
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=OPTIONS)
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    for key in ["refresh_duration", "refresh_count"]:
+        registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            f"{entry.entry_id}_{key}",
+            config_entry=entry,
+            suggested_object_id=f"foo_automated_cover_control_{key}",
+        )
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    count = coordinator.refresh_stats.triggers.total()
+    state = hass.states.get("sensor.foo_automated_cover_control_refresh_count")
+    assert state
+    assert state.state == str(count)
+    assert sum(state.attributes[str(trigger)] for trigger in coordinator.refresh_stats.triggers) == count
+
+    state = hass.states.get("sensor.foo_automated_cover_control_refresh_duration")
+    assert state
+    assert state.attributes["unit_of_measurement"] == "ms"
+    assert state.attributes["samples"] == count
+
+
+async def test_unchanged_data_skips_state_writes(hass: HomeAssistant, return_fake_cover_data):
+    entry = MockConfigEntry(domain=DOMAIN, data={"name": "foo"}, options=OPTIONS)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    suppressed = coordinator.suppressed_state_writes
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    # Every entity is skipped.
+    listeners = coordinator.suppressed_state_writes - suppressed
+    assert listeners >= 6
+
+    target = hass.states.get("sensor.foo_automated_cover_control_target_cover_position")
+    state = hass.states.get("sensor.foo_automated_cover_control_state")
+
+    return_fake_cover_data.return_value = replace(return_fake_cover_data.return_value, target_position=67)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    # Only the target position sensor is written.
+    assert coordinator.suppressed_state_writes == suppressed + 2 * listeners - 1
+    assert hass.states.get("sensor.foo_automated_cover_control_target_cover_position").state == "67"
+    assert (
+        hass.states.get("sensor.foo_automated_cover_control_target_cover_position").last_reported > target.last_reported
+    )
+    assert hass.states.get("sensor.foo_automated_cover_control_state").last_reported == state.last_reported
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from custom_components.automated_cover_control.config import WindowConfiguration
+from custom_components.automated_cover_control.const import (
+    CONF_FIN_DEPTH,
+    CONF_OVERHANG_DEPTH,
+    CONF_OVERHANG_OFFSET,
+    CONF_WINDOW_HEIGHT,
+    CONF_WINDOW_WIDTH,
+)
+from custom_components.automated_cover_control.shading import WindowShading
+
+
+def test_overhang():
+    shading = WindowShading(2.0, overhang_depth=1.0, overhang_offset=0.5)
+    # Facing the sun at 45 degrees, the shadow drops 1 m from the overhang: 0.5 m into the window.
+    assert shading.sunlit_fraction(0, 45) == pytest.approx(0.75)
+    # At an angle, the same elevation casts a steeper shadow.
+    assert shading.sunlit_fraction(60, 45) == pytest.approx(1 - (2 - 0.5) / 2)
+    # Low sun gets in under the overhang; high sun is blocked altogether.
+    assert shading.sunlit_fraction(0, 20) == 1.0
+    assert shading.sunlit_fraction(0, 80) == 0.0
+
+
+def test_fins_and_reveal():
+    shading = WindowShading(2.0, window_width=1.0, fin_depth=0.2, reveal_depth=0.1)
+    # The reveal's top shades 0.1 m at 45 degrees, and its sides are overshadowed by the fins.
+    assert shading.sunlit_fraction(0, 45) == pytest.approx(0.95)
+    assert shading.sunlit_fraction(45, 0) == pytest.approx(0.8)
+    assert shading.sunlit_fraction(-45, 0) == pytest.approx(0.8)
+    assert shading.sunlit_fraction(80, 0) == 0.0
+    # Without a width, there are no sides to shade.
+    assert WindowShading(2.0, fin_depth=0.2).sunlit_fraction(45, 0) == 1.0
+
+
+def test_behind_window():
+    shading = WindowShading(2.0, overhang_depth=1.0)
+    assert shading.sunlit_fraction(90, 30) == 0.0
+    assert shading.sunlit_fraction(-120, 30) == 0.0
+    assert shading.percentage(120, 30, 0.0) == 0.0
+
+
+def test_percentage():
+    shading = WindowShading(2.0, overhang_depth=1.0, overhang_offset=0.5)
+    # The bottom 75% of the window is sunlit: the cover only stays open if it would have come down below that anyway.
+    assert shading.percentage(0, 45, 50.0) == 50.0
+    assert shading.percentage(0, 45, 75.0) == 100.0
+    assert shading.percentage(0, 80, 0.0) == 100.0
+    assert WindowShading(2.0, window_width=1.0, fin_depth=1.0).percentage(60, 10, 10.0) == 100.0
+
+
+def test_scalar_matches_array():
+    shading = WindowShading(1.67, window_width=1.2, overhang_depth=0.6, overhang_offset=0.2, fin_depth=0.3)
+    rng = np.random.default_rng(0)
+    gamma = rng.uniform(-120, 120, 1000)
+    elevation = rng.uniform(-5, 89, 1000)
+    percentage = rng.uniform(0, 100, 1000)
+    assert shading.percentages(gamma, elevation, percentage).tolist() == [
+        shading.percentage(g, e, p)
+        for g, e, p in zip(gamma.tolist(), elevation.tolist(), percentage.tolist(), strict=True)
+    ]
+
+
+def test_read_from_config():
+    config = WindowConfiguration()
+    config.read({CONF_WINDOW_HEIGHT: 2.0})
+    assert config.shading is None
+
+    options = {CONF_WINDOW_HEIGHT: 2.0, CONF_WINDOW_WIDTH: 1.0, CONF_OVERHANG_DEPTH: 1.0, CONF_OVERHANG_OFFSET: 0.5}
+    config.read(options)
+    shading = config.shading
+    assert shading.sunlit_fraction(0, 45) == pytest.approx(0.75)
+    # Only rebuilt when the geometry changes.
+    config.read(options)
+    assert config.shading is shading
+    config.read(options | {CONF_FIN_DEPTH: 0.5})
+    assert config.shading is not shading
+    assert config.shading.sunlit_fraction(45, 0) == pytest.approx(0.5)
+
+    with pytest.raises(ValueError):
+        WindowShading(0.0, overhang_depth=1.0)
@@ -0,0 +1,221 @@
+import itertools
+import json
+import logging
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from astral import Observer
+from astral.sun import azimuth, elevation
+
+from custom_components.automated_cover_control.calculation import (
+    SunPosition,
+    calculate_sun_tracking_vertical_cover_position,
+)
+from custom_components.automated_cover_control.config import (
+    AutomationConfiguration,
+    BlindSpotConfiguration,
+    SensorConfiguration,
+    WindowConfiguration,
+)
+from custom_components.automated_cover_control.log_context_adapter import (
+    LogContextAdapter,
+)
+from custom_components.automated_cover_control.simulation import (
+    SimulationLocation,
+    build_solar_track,
+    main,
+    simulate,
+)
+from custom_components.automated_cover_control.why import (
+    CoverControlReason,
+    CoverControlTweaks,
+)
+
+LOCATION = SimulationLocation(latitude=37.80, longitude=-122.46, time_zone="America/Los_Angeles")
+ZONE = ZoneInfo(LOCATION.time_zone)
+DAY = date(2025, 10, 31)
+
+OPTIONS = {
+    "entities": ["cover.one", "cover.two"],
+    "window_azimuth": 180,
+    "window_height": 2.1,
+    "distance_from_window": 0.5,
+    "default_cover_position": 100,
+    "before_sunrise_or_after_sunset_cover_position": 0,
+    "start_time": "08:00:00",
+    "end_time": "18:00:00",
+    "return_to_default_at_end_time": True,
+    "minimum_change_percentage": 5,
+}
+
+
+class FakeHass:
+    def __init__(self):
+        self.states = {}
+
+
+def _local(hour, minute=0):
+    return datetime(DAY.year, DAY.month, DAY.day, hour, minute, tzinfo=ZONE)
+
+
+def test_simulate_day():
+    track = build_solar_track(LOCATION, DAY, DAY)
+    assert len(track.times) == 24 * 60
+    result = simulate(OPTIONS, track)
+    commands = result.commands()
+
+    # Every cover gets the same commands.
+    assert [c.entity_id for c in commands[:4]] == ["cover.one", "cover.two", "cover.one", "cover.two"]
+    assert commands[0].time == commands[1].time
+    one = [c for c in commands if c.entity_id == "cover.one"]
+    assert len(one) == len(result.command_steps)
+
+    # Control starts at the start time and ends with the return to default at the end time.
+    assert one[0].time == _local(8)
+    assert one[-1].time == _local(18)
+    assert one[-1].position == 0
+    assert one[-1].reason == CoverControlReason.END_TIME_REACHED
+    assert all(_local(8) <= c.time <= _local(18) for c in one)
+
+    # Commands respect the time threshold and the minimum change.
+    for previous, current in itertools.pairwise(one[:-1]):
+        assert current.time - previous.time >= timedelta(minutes=2)
+        assert abs(current.position - previous.position) >= 5 or current.position in (0, 100)
+
+    # Each command matches what the live calculation would have come up with at that moment.
+    automation_config, blind_spot_config = AutomationConfiguration(), BlindSpotConfiguration()
+    sensor_config, window_config = SensorConfiguration(), WindowConfiguration()
+    for config in (automation_config, blind_spot_config, sensor_config, window_config):
+        config.read(OPTIONS)
+    observer = Observer(LOCATION.latitude, LOCATION.longitude)
+    sunrise = track.sunrise[0].astype(datetime).replace(tzinfo=UTC)
+    sunset = track.sunset[0].astype(datetime).replace(tzinfo=UTC)
+    for command in one[:-1]:
+        expected = calculate_sun_tracking_vertical_cover_position(
+            FakeHass().states,
+            LogContextAdapter(logging.getLogger(__name__)),
+            SunPosition(
+                azimuth(observer, command.time), elevation(observer, command.time), sunrise, sunset, command.time
+            ),
+            automation_config,
+            blind_spot_config,
+            sensor_config,
+            window_config,
+        )
+        assert command.position == expected.target_position
+        assert command.reason == expected.reason
+        assert list(command.tweaks) == expected.tweaks
+
+    positions = result.positions()
+    assert positions[0] == -1
+    assert positions[-1] == 0
+    assert set(np.unique(positions[result.command_steps])) == {c.position for c in one}
+
+
+def test_simulate_with_history_and_invert():
+    track = build_solar_track(LOCATION, DAY, DAY)
+    options = dict(OPTIONS, invert=True, window_sensor_entity="binary_sensor.window")
+    histories = {
+        "binary_sensor.window": [
+            (_local(12), "on"),
+            (_local(13), "off"),
+        ]
+    }
+    first_position = simulate(options, track, histories).command_positions[0]
+    result = simulate(options, track, histories, initial_position=first_position)
+    one = [c for c in result.commands() if c.entity_id == "cover.one"]
+
+    # Already in place at the start time, so the first command comes later.
+    assert one[0].time > _local(8)
+    assert all(CoverControlTweaks.INVERTED in c.tweaks for c in one)
+
+    window_open = [c for c in one if c.reason == CoverControlReason.WINDOW_OPEN]
+    assert len(window_open) == 1
+    assert window_open[0].time == _local(12)
+    assert window_open[0].position == 0
+    assert one[-1].reason == CoverControlReason.END_TIME_REACHED
+    assert one[-1].position == 100
+
+
+def test_main(tmp_path, capsys):
+    options = tmp_path / "options.json"
+    options.write_text(json.dumps(dict(OPTIONS, window_sensor_entity="binary_sensor.window")))
+    history = tmp_path / "history.csv"
+    history.write_text(
+        "entity_id,state,last_changed\n"
+        "binary_sensor.window,on,2025-10-31T19:00:00.000Z\n"
+        "binary_sensor.window,off,2025-10-31T20:00:00.000Z\n"
+    )
+    main(
+        [
+            "--options",
+            str(options),
+            "--latitude",
+            "37.8",
+            "--longitude",
+            "-122.46",
+            "--time-zone",
+            "America/Los_Angeles",
+            "--start",
+            "2025-10-31",
+            "--end",
+            "2025-10-31",
+            "--history",
+            str(history),
+        ]
+    )
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "time,entity_id,position,reason,tweaks"
+    assert "2025-10-31T19:00:00+00:00,cover.one,100,window_open," in lines
+    assert lines[-1] == "2025-11-01T01:00:00+00:00,cover.two,0,end_time_reached,"
+
+
+def test_simulate_with_position_table():
+    track = build_solar_track(LOCATION, DAY, DAY)
+    exact = simulate(OPTIONS, track)
+    tabulated = simulate(OPTIONS, track, position_table_resolution=0.1)
+
+    # Interpolating from a fine table rarely lands on a different whole percentage, and never far from it.
+    difference = np.abs(tabulated.calculated.target_position - exact.calculated.target_position)
+    assert difference.max() <= 1
+    assert np.count_nonzero(difference) < len(difference) // 100
+
+
+def test_simulate_with_slat_tilt():
+    track = build_solar_track(LOCATION, DAY, DAY)
+    assert simulate(OPTIONS, track).command_tilts is None
+
+    options = dict(OPTIONS, slat_tilt=True)
+    result = simulate(options, track)
+    one = [c for c in result.commands() if c.entity_id == "cover.one"]
+
+    # The slats follow the sun, and are opened again at the end time.
+    assert len({c.tilt for c in one}) > 2
+    assert one[-1].reason == CoverControlReason.END_TIME_REACHED
+    assert one[-1].tilt == 100
+
+    # A change of tilt alone is enough for a command, so there are more of them than for a roller cover.
+    assert len(one) > len(simulate(OPTIONS, track).command_steps)
+
+    automation_config, blind_spot_config = AutomationConfiguration(), BlindSpotConfiguration()
+    sensor_config, window_config = SensorConfiguration(), WindowConfiguration()
+    for config in (automation_config, blind_spot_config, sensor_config, window_config):
+        config.read(options)
+    observer = Observer(LOCATION.latitude, LOCATION.longitude)
+    sunrise = track.sunrise[0].astype(datetime).replace(tzinfo=UTC)
+    sunset = track.sunset[0].astype(datetime).replace(tzinfo=UTC)
+    for command in one[:-1]:
+        expected = calculate_sun_tracking_vertical_cover_position(
+            FakeHass().states,
+            LogContextAdapter(logging.getLogger(__name__)),
+            SunPosition(
+                azimuth(observer, command.time), elevation(observer, command.time), sunrise, sunset, command.time
+            ),
+            automation_config,
+            blind_spot_config,
+            sensor_config,
+            window_config,
+        )
+        assert command.position == expected.target_position
+        assert command.tilt == expected.target_tilt
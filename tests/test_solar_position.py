@@ -0,0 +1,26 @@
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+from astral import Observer
+from astral.sun import azimuth, elevation
+
+from custom_components.automated_cover_control.solar_position import solar_azimuth_and_elevation
+
+
+@pytest.mark.parametrize(
+    ("latitude", "longitude"),
+    [(37.80, -122.46), (52.37, 4.89), (-33.87, 151.21), (69.65, 18.96)],
+)
+def test_matches_astral(latitude, longitude):
+    # Every 97 minutes over a year, so the samples walk through all times of day.
+    times = np.arange(
+        np.datetime64("2025-01-01T00:00"), np.datetime64("2026-01-01T00:00"), np.timedelta64(97, "m")
+    ).astype("datetime64[s]")
+    solar_azimuth, solar_elevation = solar_azimuth_and_elevation(times, latitude, longitude)
+
+    observer = Observer(latitude, longitude)
+    for index in range(0, len(times), 7):
+        when = times[index].astype(datetime).replace(tzinfo=UTC)
+        assert solar_azimuth[index] == pytest.approx(azimuth(observer, when), abs=1e-6)
+        assert solar_elevation[index] == pytest.approx(elevation(observer, when), abs=1e-6)
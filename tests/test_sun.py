@@ -2,7 +2,9 @@ from datetime import datetime
 
 from dateutil import tz
 
-from custom_components.automated_cover_control.config import WindowConfiguration
+from custom_components.automated_cover_control.blind_spots import BlindSpot
+from custom_components.automated_cover_control.config import BlindSpotConfiguration, WindowConfiguration
+from custom_components.automated_cover_control.horizon import HorizonProfile
 from custom_components.automated_cover_control.sun import SolarTimeCalculator
 
 
@@ -30,3 +32,31 @@ def test_solar_time_calculator():
     assert start.date() == datetime.now(zone).date()
     assert end.date() == datetime.now(zone).date()
     assert end > start
+
+
+def test_solar_times_honour_horizon():
+    hass = FakeHass()
+    window = WindowConfiguration()
+    window.window_azimuth = 180
+
+    start, end = SolarTimeCalculator(hass, window).get_solar_start_and_end_times()
+
+    # Hills to the east and west, 20 degrees high, so the sun shows up later and disappears earlier.
+    window.horizon = HorizonProfile([(0, 20), (180, 0)])
+    shaded_start, shaded_end = SolarTimeCalculator(hass, window).get_solar_start_and_end_times()
+    assert shaded_start > start
+    assert shaded_end < end
+
+
+def test_solar_times_honour_blind_spots():
+    hass = FakeHass()
+    window = WindowConfiguration()
+    window.window_azimuth = 180
+
+    start, end = SolarTimeCalculator(hass, window).get_solar_start_and_end_times()
+
+    # Walls along both edges of the window (gamma 60 to 90 on the east side, -60 to -90 on the west).
+    blind_spots = BlindSpotConfiguration(enabled=True, left=60, right=90, additional=[BlindSpot(150, 180)])
+    shaded_start, shaded_end = SolarTimeCalculator(hass, window, blind_spots).get_solar_start_and_end_times()
+    assert shaded_start > start
+    assert shaded_end < end
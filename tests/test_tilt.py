@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+import pytest
+
+from custom_components.automated_cover_control.config import AutomationConfiguration
+from custom_components.automated_cover_control.const import (
+    CONF_SLAT_DEPTH,
+    CONF_SLAT_SPACING,
+    CONF_SLAT_TILT,
+    CONF_TILT_RANGE,
+)
+from custom_components.automated_cover_control.tilt import (
+    open_tilt_percentage,
+    slat_tilt_percentage,
+    slat_tilt_percentages,
+)
+
+
+def _sun_gets_through(slat_angle: float, profile: float, depth: float, spacing: float) -> bool:
+    # Traces rays back out towards the sun from points just inside the slats, between two of them.
+    alpha, beta = math.radians(slat_angle), math.radians(profile)
+    half = depth / 2 * np.array([math.cos(alpha), math.sin(alpha)])
+    towards_sun = np.array([math.cos(beta), math.sin(beta)])
+    for y in np.linspace(-spacing, 2 * spacing, 601):
+        start = np.array([-depth, y])
+        hit = False
+        for n in range(-3, 5):
+            centre = np.array([0.0, n * spacing])
+            # Solve start + t * towards_sun == centre + u * half, for t > 0 and |u| <= 1.
+            matrix = np.column_stack((towards_sun, -half))
+            if abs(np.linalg.det(matrix)) < 1e-12:
+                continue
+            t, u = np.linalg.solve(matrix, centre - start)
+            if t > 0 and abs(u) <= 1:
+                hit = True
+                break
+        if not hit and 0 <= y <= spacing:
+            return True
+    return False
+
+
+def _slat_angle(percentage: float, tilt_range: int = 90) -> float:
+    # Degrees from horizontal, negative with the outer edge down.
+    return percentage * tilt_range / 100 - 90
+
+
+@pytest.mark.parametrize("profile", [0.0, 10.0, 25.0, 40.0])
+@pytest.mark.parametrize(("depth", "spacing"), [(25.0, 21.0), (50.0, 42.0), (80.0, 40.0)])
+def test_blocks_sun_and_is_most_open(profile, depth, spacing):
+    percentage = slat_tilt_percentage(0, profile, depth, spacing, 90)
+    angle = _slat_angle(percentage)
+    assert not _sun_gets_through(angle - 0.1, profile, depth, spacing)
+    if percentage < 100:
+        # Any more open, and the sun gets in.
+        assert _sun_gets_through(angle + 2, profile, depth, spacing)
+
+
+def test_high_sun_leaves_slats_open():
+    assert slat_tilt_percentage(0, 60, 25, 21, 90) == 100
+    assert slat_tilt_percentage(0, 60, 25, 21, 180) == 50
+    assert open_tilt_percentage(90) == 100
+    assert open_tilt_percentage(180) == 50
+
+
+def test_profile_angle():
+    # At an angle to the window, the sun's shadow is steeper, so the slats can be more open.
+    assert slat_tilt_percentage(60, 20, 25, 21, 90) > slat_tilt_percentage(0, 20, 25, 21, 90)
+    assert slat_tilt_percentage(-60, 20, 25, 21, 90) == slat_tilt_percentage(60, 20, 25, 21, 90)
+
+
+def test_slats_too_far_apart_close():
+    assert slat_tilt_percentage(0, 5, 25, 30, 90) == 0.0
+
+
+def test_scalar_matches_array():
+    rng = np.random.default_rng(0)
+    gamma = rng.uniform(-120, 120, 1000)
+    elevation = rng.uniform(-5, 89, 1000)
+    for depth, spacing, tilt_range in [(25, 21, 90), (50, 55, 180)]:
+        expected = [
+            slat_tilt_percentage(g, e, depth, spacing, tilt_range)
+            for g, e in zip(gamma.tolist(), elevation.tolist(), strict=True)
+        ]
+        assert slat_tilt_percentages(gamma, elevation, depth, spacing, tilt_range) == pytest.approx(expected)
+
+
+def test_read_from_config():
+    config = AutomationConfiguration()
+    config.read({})
+    assert not config.slat_tilt
+    config.read({CONF_SLAT_TILT: True, CONF_SLAT_DEPTH: 50, CONF_SLAT_SPACING: 42, CONF_TILT_RANGE: "180"})
+    assert config.slat_tilt
+    assert (config.slat_depth, config.slat_spacing, config.tilt_range) == (50, 42, 180)
+    # The initial config flow stores unset options as None.
+    config.read({CONF_SLAT_TILT: True, CONF_SLAT_DEPTH: None, CONF_SLAT_SPACING: None, CONF_TILT_RANGE: None})
+    assert (config.slat_depth, config.slat_spacing, config.tilt_range) == (25, 21, 90)